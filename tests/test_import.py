@@ -1,2 +1,87 @@
+import os
+import subprocess
+import sys
+
+
 def test_import():
-    import utool
\ No newline at end of file
+    import utool
+
+
+# The only submodules ``import utool; utool.get_argflag(...)`` may load in
+# lazy mode. Anything else means a heavy import crept into the lazy path.
+LAZY_IMPORT_BUDGET = set([
+    'util_arg', 'util_inject', 'util_logging', 'util_type',
+])
+
+
+def _run_import_probe(eager):
+    code = '\n'.join([
+        'import sys, time',
+        'start = time.perf_counter()',
+        'import utool',
+        'utool.get_argflag("--nonexistent-flag")',
+        'print(time.perf_counter() - start)',
+        'print(int("pandas" in sys.modules))',
+        'print(" ".join(sorted(name.split(".")[1] for name in sys.modules',
+        '                      if name.startswith("utool.util_"))))',
+    ])
+    env = os.environ.copy()
+    env['UTOOL_EAGER'] = '1' if eager else '0'
+    out = subprocess.check_output([sys.executable, '-c', code], env=env)
+    seconds, has_pandas, submods = out.decode('utf8').strip().split('\n')[-3:]
+    return float(seconds), bool(int(has_pandas)), set(submods.split())
+
+
+def test_lazy_import_time_budget():
+    """
+    Checks that the lazy mode only loads the submodules in
+    LAZY_IMPORT_BUDGET and is faster than the eager mode. Run with
+    ``pytest tests/test_import.py -s`` to see the timings.
+    """
+    if sys.version_info < (3, 7):
+        return
+    lazy, has_pandas, lazy_submods = _run_import_probe(eager=False)
+    assert not has_pandas
+    assert lazy_submods <= LAZY_IMPORT_BUDGET, sorted(
+        lazy_submods - LAZY_IMPORT_BUDGET)
+    eager, _, eager_submods = _run_import_probe(eager=True)
+    print('import utool: lazy=%.3fs (%d submodules) eager=%.3fs (%d submodules)' % (
+        lazy, len(lazy_submods), eager, len(eager_submods)))
+    # loose on purpose, the eager import is many times slower
+    assert lazy < eager
+
+
+def _star_import_names(eager):
+    code = '\n'.join([
+        'ns = {}',
+        'exec("from utool import *", ns)',
+        'print("\\n".join(sorted(ns)))',
+    ])
+    env = os.environ.copy()
+    env['UTOOL_EAGER'] = '1' if eager else '0'
+    out = subprocess.check_output([sys.executable, '-c', code], env=env)
+    return set(out.decode('utf8').split())
+
+
+def test_lazy_star_import_matches_eager():
+    if sys.version_info < (3, 7):
+        return
+    lazy_names = _star_import_names(eager=False)
+    eager_names = _star_import_names(eager=True)
+    # import_execstr is a leftover local of the eager import
+    assert lazy_names == eager_names - set(['import_execstr'])
+
+
+def test_lazy_attributes_match_eager():
+    import utool
+    if not getattr(utool, '__LAZY__', False):
+        return
+    from utool._internal.lazy_attr_table import LAZY_ATTR_TABLE
+    for submodname, attrs in LAZY_ATTR_TABLE.items():
+        submod = getattr(utool, submodname)
+        for attr in attrs[0:5]:
+            assert getattr(utool, attr) is getattr(submod, attr)
+    assert 'get_argflag' in dir(utool)
+    assert not hasattr(utool, 'this_attribute_does_not_exist')
+    # names that are not in the table fall back to the eager import
+    assert callable(utool.reload_subs)
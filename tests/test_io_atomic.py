@@ -0,0 +1,118 @@
+"""
+Concurrency stress tests for the atomic writers and locks in util_io.
+Writers and readers run in separate processes that share one directory.
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+
+
+NUM_WRITERS = 4
+NUM_READERS = 4
+NUM_WRITES = 30
+NUM_INCREMENTS = 25
+# Big enough that a non-atomic write is observable half way through
+PAYLOAD_LEN = 2 ** 16
+
+
+def _make_payload(writer, step):
+    return {'writer': writer, 'step': step,
+            'payload': [writer * step] * PAYLOAD_LEN}
+
+
+def _check_payload(data):
+    expected = _make_payload(data['writer'], data['step'])
+    return data == expected
+
+
+def _writer(fpath, writer, save_func_name):
+    import utool as ut
+    save_func = getattr(ut, save_func_name)
+    for step in range(NUM_WRITES):
+        save_func(fpath, _make_payload(writer, step), verbose=False,
+                  atomic=True)
+
+
+def _reader(fpath, load_func_name, stop_fpath, result_queue):
+    import utool as ut
+    load_func = getattr(ut, load_func_name)
+    num_reads = 0
+    errors = []
+    while not os.path.exists(stop_fpath):
+        try:
+            data = load_func(fpath, verbose=False)
+        except Exception as ex:
+            errors.append(repr(ex))
+        else:
+            num_reads += 1
+            if not _check_payload(data):
+                errors.append('inconsistent payload')
+    result_queue.put((num_reads, errors))
+
+
+def _incrementer(fpath):
+    import utool as ut
+    for _ in range(NUM_INCREMENTS):
+        with ut.lock_file(fpath):
+            count = ut.load_cPkl(fpath, verbose=False)
+            ut.save_cPkl(fpath, count + 1, verbose=False, atomic=True,
+                         lock=True)
+
+
+def _run_writers_and_readers(ext, save_func_name, load_func_name):
+    dpath = tempfile.mkdtemp()
+    fpath = os.path.join(dpath, 'shared' + ext)
+    stop_fpath = os.path.join(dpath, 'stop')
+    _writer(fpath, 0, save_func_name)
+    result_queue = multiprocessing.Queue()
+    readers = [
+        multiprocessing.Process(target=_reader, args=(
+            fpath, load_func_name, stop_fpath, result_queue))
+        for _ in range(NUM_READERS)
+    ]
+    writers = [
+        multiprocessing.Process(target=_writer, args=(
+            fpath, writer, save_func_name))
+        for writer in range(1, NUM_WRITERS + 1)
+    ]
+    for proc in readers + writers:
+        proc.start()
+    for proc in writers:
+        proc.join()
+        assert proc.exitcode == 0
+    # give every reader a chance to see the final state
+    time.sleep(0.1)
+    open(stop_fpath, 'w').close()
+    results = [result_queue.get(timeout=60) for _ in readers]
+    for proc in readers:
+        proc.join()
+    total_reads = sum(num_reads for num_reads, _ in results)
+    errors = [err for _, errs in results for err in errs]
+    assert not errors, errors[0:5]
+    assert total_reads > 0
+    # no temporary files are left behind
+    assert sorted(os.listdir(dpath)) == sorted(['shared' + ext, 'stop'])
+
+
+def test_atomic_cPkl_concurrent_readers():
+    _run_writers_and_readers('.pkl', 'save_cPkl', 'load_cPkl')
+
+
+def test_atomic_json_concurrent_readers():
+    _run_writers_and_readers('.json', 'save_json', 'load_json')
+
+
+def test_locked_read_modify_write():
+    import utool as ut
+    dpath = tempfile.mkdtemp()
+    fpath = os.path.join(dpath, 'counter.pkl')
+    ut.save_cPkl(fpath, 0, verbose=False)
+    procs = [multiprocessing.Process(target=_incrementer, args=(fpath,))
+             for _ in range(NUM_WRITERS)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+        assert proc.exitcode == 0
+    assert ut.load_cPkl(fpath, verbose=False) == NUM_WRITERS * NUM_INCREMENTS
@@ -10,6 +10,7 @@ pip install git+https://github.com/Erotemic/utool.git@next
 """
 # Utool is released under the Apache License Version 2.0
 
+import os
 import sys
 
 __version__ = '2.1.7'
@@ -106,9 +107,79 @@ IMPORT_TUPLES = [
     ]
 
 
+# In lazy mode ``ut.<name>`` imports only the submodule that owns <name> on
+# first access, using the table in _internal/lazy_attr_table.py. Names missing
+# from the table (e.g. reload_subs) trigger the full eager import. Set
+# UTOOL_EAGER=1 or pass --utool-eager to import every submodule up front.
+__LAZY__ = (
+    sys.version_info >= (3, 7) and
+    os.environ.get('UTOOL_EAGER', '0') in ('', '0') and
+    not any(flag in sys.argv for flag in [
+        '--utool-eager', '--nodyn', '--dyn', '--dump-utool-init',
+        '--print-utool-init', '--update-utool-init',
+        '--update-utool-lazy-table'])
+)
+
 DOELSE = False
 
-if __DYNAMIC__:
+if __LAZY__:
+    from utool._internal.lazy_attr_table import LAZY_ATTR_TABLE as _LAZY_ATTR_TABLE
+    _LAZY_SUBMODULES = set([tup[0] for tup in IMPORT_TUPLES])
+    _LAZY_ATTR_OWNERS = {
+        attr: submodname
+        for submodname, attrs in _LAZY_ATTR_TABLE.items()
+        for attr in attrs
+    }
+    _LAZY_STATE = {'loaded': False}
+    # ``from utool import *`` exports the same names as in eager mode. The
+    # reload helpers are defined by the eager import.
+    __all__ = sorted(
+        set(attr for attr in _LAZY_ATTR_OWNERS if not attr.startswith('_')) |
+        set(name for name in _LAZY_SUBMODULES if not name.startswith('_')) |
+        set(['DOELSE', 'IMPORT_TUPLES', 'print', 'profile', 'rrr', 'rrrr',
+             'reload_subs', 'reassign_submodule_attributes']))
+
+    def _load_eagerly():
+        """ Does the same imports as the default (eager) mode """
+        if not _LAZY_STATE['loaded']:
+            _LAZY_STATE['loaded'] = True
+            from utool._internal import util_importer
+            import_execstr = util_importer.dynamic_import(__name__, IMPORT_TUPLES)
+            exec(import_execstr, globals())
+
+    def __getattr__(name):
+        import importlib
+        import importlib.util
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError('module %r has no attribute %r' % (__name__, name))
+        if name in _LAZY_SUBMODULES:
+            return importlib.import_module(__name__ + '.' + name)
+        submodname = _LAZY_ATTR_OWNERS.get(name, None)
+        if submodname is not None:
+            submod = importlib.import_module(__name__ + '.' + submodname)
+            if not hasattr(submod, name):
+                try:
+                    # subpackage member (e.g. _internal.util_importer)
+                    importlib.import_module(submod.__name__ + '.' + name)
+                except ImportError:
+                    # the table is stale
+                    pass
+            if hasattr(submod, name):
+                value = getattr(submod, name)
+                globals()[name] = value
+                return value
+        if importlib.util.find_spec(__name__ + '.' + name) is not None:
+            # unlisted submodule (e.g. ``from utool import Printable``)
+            return importlib.import_module(__name__ + '.' + name)
+        if not _LAZY_STATE['loaded']:
+            _load_eagerly()
+            if name in globals():
+                return globals()[name]
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_ATTR_OWNERS) | _LAZY_SUBMODULES)
+elif __DYNAMIC__:
     # TODO: import all utool external prereqs. Then the imports will not import
     # anything that has already in a toplevel namespace
     # COMMENTED OUT FOR FROZEN __INIT__
@@ -184,11 +255,14 @@ if DOELSE:
     from utool.util_alg import (FOOT_PER_MILE, HAVE_NUMPY, HAVE_SCIPY,
                                 KM_PER_MILE, MM_PER_INCH, PHI, PHI_A, PHI_B,
                                 TAU, absdiff, almost_allsame, almost_eq,
-                                apply_grouping, bayes_rule, choose,
+                                apply_grouping, apply_grouping_numpy,
+                                bayes_rule, choose,
                                 colwise_diag_idxs, compare_groups, cumsum,
                                 defaultdict, deg_to_rad, diagonalized_iter,
-                                edit_distance, enumerate_primes,
+                                edit_distance, edit_distance_matrix,
+                                edit_distance_pairs, enumerate_primes,
                                 euclidean_dist, expensive_task_gen, factors,
+                                farthest_point_subset,
                                 fibonacci, fibonacci_approx,
                                 fibonacci_iterative, fibonacci_recursive,
                                 find_group_consistencies,
@@ -198,11 +272,14 @@ if DOELSE:
                                 get_nth_prime_bruteforce, get_phi,
                                 get_phi_ratio1, get_prime_index,
                                 greedy_max_inden_setcover, group_indices,
-                                grouping_delta, grouping_delta_stats,
+                                group_indices_numpy, grouping_delta,
+                                grouping_delta_stats,
                                 iapply_grouping, inbounds, is_prime, item_hist,
+                                iter_edit_distance_blocks,
                                 knapsack, knapsack_greedy, knapsack_ilp,
                                 knapsack_iterative, knapsack_iterative_int,
-                                knapsack_iterative_numpy, knapsack_recursive,
+                                knapsack_iterative_numpy,
+                                knapsack_iterative_packed, knapsack_recursive,
                                 longest_common_substring,
                                 max_size_max_distance_subset,
                                 maximin_distance_subset1d,
@@ -213,7 +290,11 @@ if DOELSE:
                                 rad_to_deg, safe_div, safe_pdist, self_prodx,
                                 setcover_greedy, setcover_ilp, solve_boolexpr,
                                 square_pdist, standardize_boolexpr,
-                                triangular_number, ungroup, ungroup_gen,
+                                time_edit_distance_engines,
+                                time_grouping_engines, time_knapsack_engines,
+                                time_maximin_engines,
+                                triangular_number,
+                                ungroup, ungroup_gen,
                                 ungroup_unique, unixtime_hourdiff,
                                 upper_diag_self_prodx, xywh_to_tlbr,)
     from utool.util_aliases import (OrderedDict, combinations, ddict, icomb,
@@ -233,7 +314,7 @@ if DOELSE:
                                 get_varargs, get_verbflag, make_argparse2,
                                 parse_arglist_hack, parse_cfgstr_list,
                                 parse_dict_from_argv, reset_argrecord,
-                                switch_sanataize,)
+                                reset_argv_index, switch_sanataize,)
     from utool.util_assert import (assert_all_eq, assert_all_in,
                                    assert_all_not_None, assert_almost_eq,
                                    assert_eq, assert_eq_len, assert_inbounds,
@@ -255,21 +336,26 @@ if DOELSE:
                                     print_auto_docstr,
                                     remove_codeblock_syntax_sentinals,
                                     write_modscript_alias,)
-    from utool.util_cache import (Cachable, CacheMissException, Cacher,
+    from utool.util_cache import (CacheDirManager, Cachable,
+                                  CacheMissException, CacheStats, Cacher,
                                   GlobalShelfContext, KeyedDefaultDict,
                                   LRUDict, LazyDict, LazyList, ShelfCacher,
-                                  USE_CACHE, VERBOSE_CACHE, cached_func,
-                                  cachestr_repr, chain, consensed_cfgstr,
-                                  delete_global_cache, from_json,
+                                  SizedLRUDict, USE_CACHE, VERBOSE_CACHE,
+                                  cached_func, cachestr_repr, chain,
+                                  consensed_cfgstr, delete_global_cache,
+                                  from_json, get_cache_dir_manager,
                                   get_cfgstr_from_args, get_default_appname,
                                   get_func_result_cachekey,
                                   get_global_cache_dir, get_global_shelf_fpath,
                                   get_lru_cache, global_cache_dump,
                                   global_cache_read, global_cache_write,
                                   load_cache, make_utool_json_encoder,
-                                  save_cache, shelf_open, text_dict_read,
-                                  text_dict_write, time_different_diskstores,
-                                  to_json, tryload_cache, tryload_cache_list,
+                                  register_cache_backend,
+                                  remove_cache_dir_manager, save_cache,
+                                  shelf_open, text_dict_read, text_dict_write,
+                                  time_cache_backends, time_cfgstr_from_args,
+                                  time_different_diskstores, to_json,
+                                  tryload_cache, tryload_cache_list,
                                   tryload_cache_list_with_compute,
                                   view_global_cache_dir,)
     from utool.util_cplat import (COMPUTER_NAME, DARWIN, EXIT_FAILURE,
@@ -536,19 +622,21 @@ if DOELSE:
                                   translate_graph, translate_graph_to_origin,
                                   traverse_path, weighted_diamter,)
     from utool.util_hash import (ALPHABET, ALPHABET_16, ALPHABET_27,
-                                 ALPHABET_41, BIGBASE, DictProxyType, HASH_LEN,
-                                 HASH_LEN2, SEP_BYTE, SEP_STR, augment_uuid, b,
-                                 combine_hashes, combine_uuids,
-                                 convert_bytes_to_bigbase,
+                                 ALPHABET_41, BIGBASE, DictProxyType,
+                                 FileHashIndex, HASH_LEN, HASH_LEN2, SEP_BYTE,
+                                 SEP_STR, augment_uuid, augment_uuids, b,
+                                 combine_hashes, combine_uuid_groups,
+                                 combine_uuids, convert_bytes_to_bigbase,
                                  convert_hexstr_to_bigbase, digest_data,
                                  freeze_hash_bytes, get_file_hash,
-                                 get_file_uuid, get_zero_uuid, hash_data,
-                                 hashable_to_uuid, hashid_arr, hashstr,
-                                 hashstr27, hashstr_arr, hashstr_arr27,
-                                 hashstr_md5, hashstr_sha1, image_uuid,
-                                 make_hash, random_nonce, random_uuid,
-                                 stringlike, write_hash_file,
-                                 write_hash_file_for_path,)
+                                 get_file_hashes, get_file_uuid,
+                                 get_file_uuids, get_zero_uuid, hash_data,
+                                 hashable_to_uuid, hashable_to_uuids,
+                                 hashid_arr, hashstr, hashstr27, hashstr_arr,
+                                 hashstr_arr27, hashstr_md5, hashstr_sha1,
+                                 image_uuid, make_hash, random_nonce,
+                                 random_uuid, stringlike, time_bulk_uuids,
+                                 write_hash_file, write_hash_file_for_path,)
     from utool.util_import import (check_module_installed,
                                    get_modpath_from_modname, import_modname,
                                    import_module_from_fpath, import_star,
@@ -569,12 +657,14 @@ if DOELSE:
                                    make_module_write_func, memprof, noinject,
                                    reload_module,
                                    split_python_text_into_lines,)
-    from utool.util_io import (HAS_H5PY, HAS_NUMPY, HAVE_LOCKFILE, load_cPkl,
-                               load_data, load_hdf5, load_json, load_numpy,
-                               load_pytables, load_text, lock_and_load_cPkl,
-                               lock_and_save_cPkl, read_from, read_lines_from,
-                               readfrom, save_cPkl, save_data, save_hdf5,
-                               save_json, save_numpy, save_pytables, save_text,
+    from utool.util_io import (HAS_H5PY, HAS_NUMPY, HAVE_LOCKFILE, MappedText,
+                               atomic_fpath, atomic_open, iter_line_chunks,
+                               iter_lines, load_cPkl, load_data, load_hdf5,
+                               load_json, load_numpy, load_pytables, load_text,
+                               lock_and_load_cPkl, lock_and_save_cPkl,
+                               lock_file, read_from, read_lines_from, readfrom,
+                               save_cPkl, save_data, save_hdf5, save_json,
+                               save_numpy, save_pytables, save_text,
                                try_decode, write_to, writeto,)
     from utool.util_iter import (and_iters, ensure_iterable,
                                  evaluate_generator, ichunk_slices, ichunks,
@@ -710,9 +800,10 @@ if DOELSE:
                                   random_indexes, random_sample, sample_domain,
                                   shuffle, spaced_indexes, spaced_items,
                                   tiled_range,)
-    from utool.util_path import (ChdirContext, IMG_EXTENSIONS, PRINT_CALLER,
-                                 ancestor_paths, assert_exists, assertpath,
-                                 augpath, basename_noext, checkpath, copy,
+    from utool.util_path import (ChdirContext, CopyResult, IMG_EXTENSIONS,
+                                 PRINT_CALLER, ancestor_paths, assert_exists,
+                                 assertpath, augpath, basename_noext,
+                                 bulk_copy, checkpath, copy,
                                  copy_all, copy_files_to, copy_list,
                                  copy_single, delete, dirsplit,
                                  ensure_crossplat_path, ensure_ext,
@@ -745,10 +836,11 @@ if DOELSE:
                                  remove_existing_fpaths, remove_file,
                                  remove_file_list, remove_files_in_dir,
                                  remove_fpaths, sanitize_filename,
-                                 search_candidate_paths, search_in_dirs, sed,
-                                 sedfile, splitdrive, symlink, tail, testgrep,
-                                 touch, truepath, truepath_relative,
-                                 unexpanduser, unixjoin, win_shortcut,)
+                                 scandir_walk, search_candidate_paths,
+                                 search_in_dirs, sed, sedfile, splitdrive,
+                                 symlink, tail, testgrep, time_walkers, touch,
+                                 truepath, truepath_relative, unexpanduser,
+                                 unixjoin, walk_fpaths, win_shortcut,)
     from utool.util_print import (Indenter, NO_INDENT, colorprint, cprint,
                                   dictprint, horiz_print, printNOTQUIET,
                                   printVERBOSE, printWARN, print_code,
@@ -775,10 +867,12 @@ if DOELSE:
                                     ibeis_user_profile, sed_projects,
                                     setup_repo,)
     from utool.util_parallel import (KillableProcess, KillableThread, bgfunc,
-                                     buffered_generator, generate2,
-                                     get_default_numprocs,
+                                     buffered_generator, buffered_map,
+                                     generate2,
+                                     get_default_numprocs, get_shared_pool,
                                      get_sys_thread_limit, in_main_process,
                                      init_worker, set_num_procs,
+                                     shutdown_shared_pools,
                                      spawn_background_daemon_thread,
                                      spawn_background_process,
                                      spawn_background_thread,)
@@ -856,7 +950,7 @@ if DOELSE:
                                   parse_package_for_version, parse_readme,
                                   presetup, presetup_commands, read_license,
                                   setup_chmod, setuptools_setup,)
-    from utool.util_set import (OrderedSet, oset,)
+    from utool.util_set import (OrderedSet, oset, time_ordered_sets,)
     from utool.util_regex import (REGEX_C_COMMENT, REGEX_ESCSTR, REGEX_FLOAT,
                                   REGEX_INT, REGEX_LATEX_COMMENT,
                                   REGEX_NONGREEDY, REGEX_RVAL, REGEX_STR,
@@ -0,0 +1,1812 @@
+# -*- coding: utf-8 -*-
+"""
+AUTOGENERATED by util_importer.write_lazy_attr_table. Do not edit.
+
+Maps each submodule to the package attributes it provides.
+
+Regenerate with:
+    python -c "import utool" --update-utool-lazy-table
+"""
+LAZY_ATTR_TABLE = {
+    '_internal': [
+        'util_importer',
+    ],
+    'util_alg': [
+        'FOOT_PER_MILE',
+        'HAVE_NUMPY',
+        'HAVE_SCIPY',
+        'KM_PER_MILE',
+        'MM_PER_INCH',
+        'PHI',
+        'PHI_A',
+        'PHI_B',
+        'TAU',
+        'absdiff',
+        'almost_allsame',
+        'almost_eq',
+        'apply_grouping',
+        'apply_grouping_numpy',
+        'bayes_rule',
+        'choose',
+        'colwise_diag_idxs',
+        'compare_groups',
+        'cumsum',
+        'defaultdict',
+        'deg_to_rad',
+        'diagonalized_iter',
+        'edit_distance',
+        'edit_distance_matrix',
+        'edit_distance_pairs',
+        'enumerate_primes',
+        'euclidean_dist',
+        'expensive_task_gen',
+        'factors',
+        'farthest_point_subset',
+        'fibonacci',
+        'fibonacci_approx',
+        'fibonacci_iterative',
+        'fibonacci_recursive',
+        'find_group_consistencies',
+        'find_group_differences',
+        'flatten_membership_mapping',
+        'generate_primes',
+        'get_nth_bell_number',
+        'get_nth_prime',
+        'get_nth_prime_bruteforce',
+        'get_phi',
+        'get_phi_ratio1',
+        'get_prime_index',
+        'greedy_max_inden_setcover',
+        'group_indices',
+        'group_indices_numpy',
+        'grouping_delta',
+        'grouping_delta_stats',
+        'iapply_grouping',
+        'inbounds',
+        'is_prime',
+        'item_hist',
+        'iter_edit_distance_blocks',
+        'knapsack',
+        'knapsack_greedy',
+        'knapsack_ilp',
+        'knapsack_iterative',
+        'knapsack_iterative_int',
+        'knapsack_iterative_numpy',
+        'knapsack_iterative_packed',
+        'knapsack_recursive',
+        'longest_common_substring',
+        'max_size_max_distance_subset',
+        'maximin_distance_subset1d',
+        'maximum_distance_subset',
+        'negative_minclamp_inplace',
+        'norm_zero_one',
+        'normalize',
+        'num_partitions',
+        'number_of_decimals',
+        'prod',
+        'product_nonsame',
+        'product_nonsame_self',
+        'rad_to_deg',
+        'safe_div',
+        'safe_pdist',
+        'self_prodx',
+        'setcover_greedy',
+        'setcover_ilp',
+        'solve_boolexpr',
+        'square_pdist',
+        'standardize_boolexpr',
+        'time_edit_distance_engines',
+        'time_grouping_engines',
+        'time_knapsack_engines',
+        'time_maximin_engines',
+        'triangular_number',
+        'ungroup',
+        'ungroup_gen',
+        'ungroup_unique',
+        'unicode_literals',
+        'unixtime_hourdiff',
+        'upper_diag_self_prodx',
+        'xywh_to_tlbr',
+    ],
+    'util_aliases': [
+        'OrderedDict',
+        'combinations',
+        'ddict',
+        'icomb',
+        'iprod',
+        'namedtuple',
+        'odict',
+        'partial',
+        'product',
+    ],
+    'util_arg': [
+        'ArgumentParser2',
+        'DEBUG',
+        'DEBUG2',
+        'NOT_QUIET',
+        'NO_ASSERTS',
+        'QUIET',
+        'REPORT',
+        'SAFE',
+        'SILENT',
+        'STRICT',
+        'SUPER_STRICT',
+        'TRACE',
+        'USE_ASSERT',
+        'VERBOSE',
+        'VERBOSE_ARGPARSE',
+        'VERYVERBOSE',
+        'argflag',
+        'argparse_dict',
+        'argv_flag_dec',
+        'argv_flag_dec_true',
+        'argval',
+        'aug_sysargv',
+        'autogen_argparse2',
+        'autogen_argparse_block',
+        'get_arg',
+        'get_arg_dict',
+        'get_argflag',
+        'get_argv_tail',
+        'get_argval',
+        'get_cmdline_varargs',
+        'get_dict_vals_from_commandline',
+        'get_flag',
+        'get_fpath_args',
+        'get_module_verbosity_flags',
+        'get_varargs',
+        'get_verbflag',
+        'make_argparse2',
+        'os',
+        'parse_arglist_hack',
+        'parse_cfgstr_list',
+        'parse_dict_from_argv',
+        'reset_argrecord',
+        'reset_argv_index',
+        'switch_sanataize',
+        'sys',
+    ],
+    'util_assert': [
+        'assert_all_eq',
+        'assert_all_in',
+        'assert_all_not_None',
+        'assert_almost_eq',
+        'assert_eq',
+        'assert_eq_len',
+        'assert_inbounds',
+        'assert_lessthan',
+        'assert_lists_eq',
+        'assert_raises',
+        'assert_same_len',
+        'assert_scalar_list',
+        'assert_unflat_level',
+        'assert_unique',
+        'get_first_None_position',
+        'lists_eq',
+    ],
+    'util_autogen': [
+        'PythonStatement',
+        'auto_docstr',
+        'autofix_codeblock',
+        'deque',
+        'dump_autogen_code',
+        'find_modname_in_pythonpath',
+        'is_modname_in_pythonpath',
+        'load_func_from_module',
+        'make_args_docstr',
+        'make_cmdline_docstr',
+        'make_default_docstr',
+        'make_default_module_maintest',
+        'make_docstr_block',
+        'make_example_docstr',
+        'make_returns_or_yeilds_docstr',
+        'makeinit',
+        'print_auto_docstr',
+        'remove_codeblock_syntax_sentinals',
+        'write_modscript_alias',
+    ],
+    'util_cache': [
+        'Cachable',
+        'CacheDirManager',
+        'CacheMissException',
+        'CacheStats',
+        'Cacher',
+        'GlobalShelfContext',
+        'KeyedDefaultDict',
+        'LRUDict',
+        'LazyDict',
+        'LazyList',
+        'ShelfCacher',
+        'SizedLRUDict',
+        'USE_CACHE',
+        'VERBOSE_CACHE',
+        'cached_func',
+        'cachestr_repr',
+        'chain',
+        'consensed_cfgstr',
+        'delete_global_cache',
+        'from_json',
+        'get_cache_dir_manager',
+        'get_cfgstr_from_args',
+        'get_default_appname',
+        'get_func_result_cachekey',
+        'get_global_cache_dir',
+        'get_global_shelf_fpath',
+        'get_lru_cache',
+        'global_cache_dump',
+        'global_cache_read',
+        'global_cache_write',
+        'load_cache',
+        'make_utool_json_encoder',
+        'register_cache_backend',
+        'remove_cache_dir_manager',
+        'save_cache',
+        'shelf_open',
+        'text_dict_read',
+        'text_dict_write',
+        'time_cache_backends',
+        'time_cfgstr_from_args',
+        'time_different_diskstores',
+        'to_json',
+        'tryload_cache',
+        'tryload_cache_list',
+        'tryload_cache_list_with_compute',
+        'view_global_cache_dir',
+    ],
+    'util_cplat': [
+        'COMPUTER_NAME',
+        'DARWIN',
+        'EXIT_FAILURE',
+        'EXIT_SUCCESS',
+        'HAVE_PATHLIB',
+        'LIB_DICT',
+        'LIB_EXT_LIST',
+        'LINUX',
+        'OS_TYPE',
+        'PYLIB_DICT',
+        'UNIX',
+        'WIN32',
+        'assert_installed_debian',
+        'change_term_title',
+        'check_installed_debian',
+        'chmod',
+        'chmod_add_executable',
+        'cmd',
+        'cmd2',
+        'editfile',
+        'ensure_app_cache_dir',
+        'ensure_app_resource_dir',
+        'get_app_cache_dir',
+        'get_app_resource_dir',
+        'get_computer_name',
+        'get_dir_diskspaces',
+        'get_disk_space',
+        'get_dynamic_lib_globstrs',
+        'get_dynlib_dependencies',
+        'get_dynlib_exports',
+        'get_file_info',
+        'get_file_nBytes',
+        'get_file_nBytes_str',
+        'get_flops',
+        'get_free_diskbytes',
+        'get_install_dirs',
+        'get_lib_ext',
+        'get_path_dirs',
+        'get_plat_specifier',
+        'get_pylib_ext',
+        'get_python_dynlib',
+        'get_resource_dir',
+        'get_system_python_library',
+        'get_total_diskbytes',
+        'get_user_name',
+        'geteditor',
+        'getroot',
+        'in_pyinstaller_package',
+        'ipython_paste',
+        'is64bit_python',
+        'is_file_executable',
+        'is_file_writable',
+        'ls_libs',
+        'pip_install',
+        'platform_cache_dir',
+        'print_dir_diskspace',
+        'print_path',
+        'print_system_users',
+        'python_executable',
+        'quote_single_command',
+        'run_realtime_process',
+        'search_env_paths',
+        'send_keyboard_input',
+        'set_process_title',
+        'shell',
+        'spawn_delayed_ipython_paste',
+        'startfile',
+        'truepath',
+        'unixpath',
+        'unload_module',
+        'vd',
+        'view_directory',
+        'view_file_in_directory',
+    ],
+    'util_class': [
+        'HashComparable',
+        'HashComparable2',
+        'HashComparableMetaclass',
+        'KwargsWrapper',
+        'Mapping',
+        'QUIET_CLASS',
+        'ReloadingMetaclass',
+        'VERBOSE_CLASS',
+        'autogen_explicit_injectable_metaclass',
+        'autogen_import_list',
+        'compare_instance',
+        'decorate_class_method',
+        'decorate_postinject',
+        'get_classname',
+        'get_comparison_methods',
+        'get_comparison_operators',
+        'get_funcglobals',
+        'get_funcname',
+        'get_injected_modules',
+        'get_method_func',
+        'inject_all_external_modules',
+        'inject_func_as_method',
+        'inject_func_as_property',
+        'inject_func_as_unbound_method',
+        'inject_instance',
+        'makeForwardingMetaclass',
+        'make_class_method_decorator',
+        'make_class_postinject_decorator',
+        'postinject_instance',
+        'reload_class',
+        'reload_class_methods',
+        'reload_injected_modules',
+        'reloadable_class',
+        'reloading_meta_metaclass_factory',
+        'remove_private_obfuscation',
+        'test_reloading_metaclass',
+    ],
+    'util_const': [
+        'NoParam',
+    ],
+    'util_csv': [
+        'CSV',
+        'make_csv_table',
+        'make_standard_csv',
+        'numpy_to_csv',
+        'read_csv',
+    ],
+    'util_config': [
+        'get_default_global_config',
+        'get_default_repo_config',
+        'read_repo_config',
+        'write_default_repo_config',
+    ],
+    'util_dbg': [
+        'COLORED_EXCEPTIONS',
+        'EmbedOnException',
+        'FORCE_TB',
+        'RAISE_ALL',
+        'TB',
+        'breakpoint',
+        'debug_exception',
+        'debug_hstack',
+        'debug_list',
+        'debug_npstack',
+        'debug_vstack',
+        'embed',
+        'embed2',
+        'embed_on_exception_context',
+        'eoxc',
+        'execstr_attr_list',
+        'execstr_dict',
+        'execstr_func',
+        'execstr_parent_locals',
+        'explore_module',
+        'explore_stack',
+        'fix_embed_globals',
+        'fmtlocals',
+        'formatex',
+        'get_caller_lineno',
+        'get_caller_modname',
+        'get_caller_name',
+        'get_caller_prefix',
+        'get_current_stack_depth',
+        'get_localvar_from_stack',
+        'get_parent_frame',
+        'get_reprs',
+        'get_stack_frame',
+        'get_var_from_stack',
+        'get_varname_from_locals',
+        'get_varname_from_stack',
+        'get_varstr',
+        'get_varval_from_locals',
+        'haveIPython',
+        'import_testdata',
+        'inIPython',
+        'in_jupyter_notebook',
+        'ipython_execstr',
+        'is_valid_varname',
+        'load_testdata',
+        'module_functions',
+        'parse_locals_keylist',
+        'print_frame',
+        'print_keys',
+        'print_traceback',
+        'printex',
+        'printvar',
+        'printvar2',
+        'public_attributes',
+        'qflag',
+        'quasiquote',
+        'quit',
+        'quitflag',
+        'save_testdata',
+        'search_stack_for_localvar',
+        'search_stack_for_var',
+        'split',
+        'super_print',
+        'varname_regex',
+    ],
+    'util_dev': [
+        'ClassAttrDictProxy',
+        'ColumnLists',
+        'DEVELOPER_MODE',
+        'DictLike_old',
+        'ENABLE_MEMTRACK',
+        'INDEXABLE_TYPES',
+        'InteractiveIter',
+        'InteractivePrompt',
+        'LIVE_INTERACTIVE_ITER',
+        'MemoryTracker',
+        'NamedPartial',
+        'NiceRepr',
+        'PriorityQueue',
+        'STAT_KEY_ORDER',
+        'Shortlist',
+        'USER_MODE',
+        'are_you_sure',
+        'autopep8_diff',
+        'compile_cython',
+        'copy_text_to_clipboard',
+        'delayed_retry_gen',
+        'dev_ipython_copypaster',
+        'disable_garbage_collection',
+        'enable_garbage_collection',
+        'ensure_str_list',
+        'ensureqt',
+        'exec_argparse_funckw',
+        'exec_funckw',
+        'execstr_funckw',
+        'extract_timeit_setup',
+        'find_exe',
+        'fix_super_reload',
+        'focusvim',
+        'garbage_collect',
+        'get_clipboard',
+        'get_cython_exe',
+        'get_dev_paste_code',
+        'get_jagged_stats',
+        'get_nonconflicting_path_old',
+        'get_nonconflicting_string',
+        'get_object_base',
+        'get_object_nbytes',
+        'get_object_size_str',
+        'get_overlaps',
+        'get_partial_func_name',
+        'get_setdiff_info',
+        'get_setdiff_items',
+        'get_statdict',
+        'get_stats',
+        'get_stats_str',
+        'get_submodules_from_dpath',
+        'grace_period',
+        'init_catch_ctrl_c',
+        'input_timeout',
+        'instancelist',
+        'inverable_group_multi_list',
+        'inverable_unique_two_lists',
+        'ipcopydev',
+        'is_developer',
+        'iup',
+        'make_at_least_n_items_valid',
+        'make_call_graph',
+        'make_object_graph',
+        'memory_dump',
+        'numpy_list_num_bits',
+        'overrideable_partial',
+        'pandas_reorder',
+        'print_object_size',
+        'print_object_size_tree',
+        'pylab_qt4',
+        'report_memsize',
+        'reset_catch_ctrl_c',
+        'search_module',
+        'search_utool',
+        'set_clipboard',
+        'set_overlap_items',
+        'set_overlaps',
+        'stats_dict',
+        'strip_line_comments',
+        'super2',
+        'timeit_compare',
+        'timeit_grid',
+        'tuples_to_unique_scalars',
+        'uninvert_unique_two_lists',
+        'user_cmdline_prompt',
+    ],
+    'util_decor': [
+        'IGNORE_TRACEBACK',
+        'NOINDENT_DECOR',
+        'ONEX_REPORT_INPUT',
+        'PROFILING',
+        'SIG_PRESERVE',
+        'UNIQUE_NUMPY',
+        'accepts_numpy',
+        'accepts_scalar_input',
+        'accepts_scalar_input2',
+        'accepts_scalar_input_vector_output',
+        'apply_docstr',
+        'classproperty',
+        'debug_function_exceptions',
+        'dummy_args_decor',
+        'getter_1to1',
+        'getter_1toM',
+        'ignores_exc_tb',
+        'indent_func',
+        'interested',
+        'lazyfunc',
+        'memoize',
+        'memoize_nonzero',
+        'memoize_single',
+        'memoize_zero',
+        'on_exception_report_input',
+        'preserve_sig',
+        'show_return_value',
+        'test_ignore_exec_traceback',
+        'time_func',
+        'tracefunc',
+        'tracefunc_xml',
+    ],
+    'util_dict': [
+        'AutoDict',
+        'AutoOrderedDict',
+        'AutoVivification',
+        'DefaultValueDict',
+        'DictLike',
+        'OrderedAutoVivification',
+        'all_dict_combinations',
+        'all_dict_combinations_lbls',
+        'all_dict_combinations_ordered',
+        'assert_keys_are_subset',
+        'augdict',
+        'build_conflict_dict',
+        'count_dict_vals',
+        'delete_dict_keys',
+        'delete_keys',
+        'depth_atleast',
+        'dict_accum',
+        'dict_assign',
+        'dict_filter_nones',
+        'dict_find_keys',
+        'dict_find_other_sameval_keys',
+        'dict_hist',
+        'dict_hist_cumsum',
+        'dict_intersection',
+        'dict_isect',
+        'dict_isect_combine',
+        'dict_keysubset',
+        'dict_set_column',
+        'dict_setdiff',
+        'dict_stack',
+        'dict_stack2',
+        'dict_subset',
+        'dict_take',
+        'dict_take_asnametup',
+        'dict_take_column',
+        'dict_take_gen',
+        'dict_take_list',
+        'dict_take_pop',
+        'dict_to_keyvals',
+        'dict_union',
+        'dict_union2',
+        'dict_union3',
+        'dict_union_combine',
+        'dict_update_newkeys',
+        'dict_where_len0',
+        'dictinfo',
+        'dzip',
+        'flatten_dict_items',
+        'flatten_dict_vals',
+        'get_dict_column',
+        'get_dict_hashid',
+        'group_items',
+        'group_pairs',
+        'groupby_attr',
+        'groupby_tags',
+        'hashdict',
+        'hierarchical_group_items',
+        'hierarchical_map_vals',
+        'hmap_vals',
+        'iflatten_dict_values',
+        'invert_dict',
+        'is_dicteq',
+        'iter_all_dict_combinations_ordered',
+        'iteritems_sorted',
+        'keys_sorted_by_value',
+        'map_dict_keys',
+        'map_dict_vals',
+        'map_keys',
+        'map_vals',
+        'merge_dicts',
+        'move_odict_item',
+        'order_dict_by',
+        'range_hist',
+        'sort_dict',
+        'update_dict',
+        'update_existing',
+    ],
+    'util_func': [
+        'compose_functions',
+        'identity',
+    ],
+    'util_grabdata': [
+        'BadZipfile',
+        'HASH_DICT',
+        'TESTIMG_URL_DICT',
+        'TIMEOUT',
+        'archive_files',
+        'clean_dropbox_link',
+        'clear_test_img_cache',
+        'download_url',
+        'experiment_download_multiple_urls',
+        'geo_locate',
+        'get_file_local_hash',
+        'get_prefered_browser',
+        'get_valid_test_imgkeys',
+        'grab_file_remote_hash',
+        'grab_file_url',
+        'grab_s3_contents',
+        'grab_selenium_chromedriver',
+        'grab_selenium_driver',
+        'grab_test_imgpath',
+        'grab_zipped_url',
+        'list_remote',
+        'open_url_in_browser',
+        'read_s3_contents',
+        'rsync',
+        's3_dict_encode_to_str',
+        's3_str_decode_to_dict',
+        'scp_pull',
+        'split_archive_ext',
+        'unarchive_file',
+        'untar_file',
+        'unzip_file',
+        'url_read',
+        'url_read_text',
+    ],
+    'util_gridsearch': [
+        'CountstrParser',
+        'DimensionBasis',
+        'GridSearch',
+        'INTERNAL_CFGKEYS',
+        'NAMEVARSEP',
+        'Nesting',
+        'ParamInfo',
+        'ParamInfoBool',
+        'ParamInfoList',
+        'constrain_cfgdict_list',
+        'customize_base_cfg',
+        'get_cfg_lbl',
+        'get_cfgdict_lbl_list_subset',
+        'get_cfgdict_list_subset',
+        'get_nonvaried_cfg_lbls',
+        'get_varied_cfg_lbls',
+        'grid_search_generator',
+        'gridsearch_timer',
+        'interact_gridsearch_result_images',
+        'lookup_base_cfg_list',
+        'make_cfglbls',
+        'make_constrained_cfg_and_lbl_list',
+        'noexpand_parse_cfgstrs',
+        'parse_argv_cfg',
+        'parse_cfgstr3',
+        'parse_cfgstr_list2',
+        'parse_cfgstr_name_options',
+        'parse_nestings',
+        'parse_nestings2',
+        'partition_varied_cfg_list',
+        'recombine_nestings',
+        'testdata_grid_search',
+    ],
+    'util_git': [
+        'Repo',
+        'RepoManager',
+        'git_sequence_editor_squash',
+        'isdir',
+        'std_build_command',
+    ],
+    'util_latex': [
+        'compile_latex_text',
+        'compress_pdf',
+        'convert_pdf_to_image',
+        'ensure_colvec',
+        'ensure_rowvec',
+        'escape_latex',
+        'find_ghostscript_exe',
+        'get_latex_figure_str',
+        'get_latex_figure_str2',
+        'is_substr',
+        'latex_get_stats',
+        'latex_multicolumn',
+        'latex_multirow',
+        'latex_newcommand',
+        'latex_sanitize_command_name',
+        'latex_scalar',
+        'long_substr',
+        'make_full_document',
+        'make_score_tabular',
+        'make_stats_tabular',
+        'render_latex',
+        'render_latex_text',
+        'replace_all',
+        'tabular_join',
+    ],
+    'util_graph': [
+        'all_multi_paths',
+        'approx_min_num_components',
+        'bfs_conditional',
+        'bfs_multi_edges',
+        'color_nodes',
+        'dag_longest_path',
+        'dfs_conditional',
+        'dict_depth',
+        'edges_to_adjacency_list',
+        'get_allkeys',
+        'get_graph_bounding_box',
+        'get_levels',
+        'graph_info',
+        'greedy_mincost_diameter_augment',
+        'longest_levels',
+        'mincost_diameter_augment',
+        'nx_all_nodes_between',
+        'nx_all_simple_edge_paths',
+        'nx_common_ancestors',
+        'nx_common_descendants',
+        'nx_contracted_nodes',
+        'nx_dag_node_rank',
+        'nx_delete_None_edge_attr',
+        'nx_delete_None_node_attr',
+        'nx_delete_edge_attr',
+        'nx_delete_node_attr',
+        'nx_edges',
+        'nx_edges_between',
+        'nx_ensure_agraph_color',
+        'nx_from_adj_dict',
+        'nx_from_matrix',
+        'nx_from_node_edge',
+        'nx_gen_edge_attrs',
+        'nx_gen_edge_values',
+        'nx_gen_node_attrs',
+        'nx_gen_node_values',
+        'nx_get_default_edge_attributes',
+        'nx_get_default_node_attributes',
+        'nx_make_adj_matrix',
+        'nx_mincut_edges_weighted',
+        'nx_minimum_weight_component',
+        'nx_node_dict',
+        'nx_set_default_edge_attributes',
+        'nx_set_default_node_attributes',
+        'nx_sink_nodes',
+        'nx_source_nodes',
+        'nx_to_adj_dict',
+        'nx_topsort_nodes',
+        'nx_topsort_rank',
+        'nx_transitive_reduction',
+        'paths_to_root',
+        'reverse_path',
+        'reverse_path_edges',
+        'shortest_levels',
+        'simplify_graph',
+        'stack_graphs',
+        'subgraph_from_edges',
+        'testdata_graph',
+        'translate_graph',
+        'translate_graph_to_origin',
+        'traverse_path',
+        'weighted_diamter',
+    ],
+    'util_hash': [
+        'ALPHABET',
+        'ALPHABET_16',
+        'ALPHABET_27',
+        'ALPHABET_41',
+        'BIGBASE',
+        'DictProxyType',
+        'FileHashIndex',
+        'HASH_LEN',
+        'HASH_LEN2',
+        'SEP_BYTE',
+        'SEP_STR',
+        'augment_uuid',
+        'augment_uuids',
+        'b',
+        'combine_hashes',
+        'combine_uuid_groups',
+        'combine_uuids',
+        'convert_bytes_to_bigbase',
+        'convert_hexstr_to_bigbase',
+        'digest_data',
+        'freeze_hash_bytes',
+        'get_file_hash',
+        'get_file_hashes',
+        'get_file_uuid',
+        'get_file_uuids',
+        'get_zero_uuid',
+        'hash_data',
+        'hashable_to_uuid',
+        'hashable_to_uuids',
+        'hashid_arr',
+        'hashstr',
+        'hashstr27',
+        'hashstr_arr',
+        'hashstr_arr27',
+        'hashstr_md5',
+        'hashstr_sha1',
+        'image_uuid',
+        'make_hash',
+        'random_nonce',
+        'random_uuid',
+        'stringlike',
+        'time_bulk_uuids',
+        'write_hash_file',
+        'write_hash_file_for_path',
+    ],
+    'util_import': [
+        'check_module_installed',
+        'get_modpath_from_modname',
+        'import_modname',
+        'import_module_from_fpath',
+        'import_star',
+        'import_star_execstr',
+        'package_contents',
+        'possible_import_patterns',
+        'tryimport',
+    ],
+    'util_inject': [
+        'ARGV_DEBUG_FLAGS',
+        'DEBUG_PRINT',
+        'DEBUG_PRINT_N',
+        'DEBUG_SLOW_IMPORT',
+        'DUMMYPROF_FUNC',
+        'EXIT_ON_INJECT_MODNAME',
+        'PRINT_INJECT_ORDER',
+        'PROFILE_FUNC',
+        'PROF_FUNC_PAT_LIST',
+        'PROF_MOD_PAT_LIST',
+        'TIMERPROF_FUNC',
+        'argv',
+        'colored_pygments_excepthook',
+        'inject',
+        'inject2',
+        'inject_colored_exceptions',
+        'inject_print_functions',
+        'inject_python_code',
+        'inject_python_code2',
+        'make_module_print_func',
+        'make_module_profile_func',
+        'make_module_reload_func',
+        'make_module_write_func',
+        'memprof',
+        'noinject',
+        'reload_module',
+        'split_python_text_into_lines',
+    ],
+    'util_io': [
+        'HAS_NUMPY',
+        'HAVE_LOCKFILE',
+        'MappedText',
+        'atomic_fpath',
+        'atomic_open',
+        'iter_line_chunks',
+        'iter_lines',
+        'load_cPkl',
+        'load_data',
+        'load_hdf5',
+        'load_json',
+        'load_numpy',
+        'load_pytables',
+        'load_text',
+        'lock_and_load_cPkl',
+        'lock_and_save_cPkl',
+        'lock_file',
+        'read_from',
+        'read_lines_from',
+        'readfrom',
+        'save_cPkl',
+        'save_data',
+        'save_hdf5',
+        'save_json',
+        'save_numpy',
+        'save_pytables',
+        'save_text',
+        'try_decode',
+        'write_to',
+        'writeto',
+    ],
+    'util_iter': [
+        'and_iters',
+        'ensure_iterable',
+        'evaluate_generator',
+        'ichunk_slices',
+        'ichunks',
+        'ichunks_cycle',
+        'ichunks_list',
+        'ichunks_noborder',
+        'ichunks_replicate',
+        'ifilter_Nones',
+        'ifilter_items',
+        'ifilterfalse_items',
+        'iflatten',
+        'iget_list_column',
+        'iget_list_column_slice',
+        'interleave',
+        'isiterable',
+        'isscalar',
+        'itake_column',
+        'iter_compress',
+        'iter_multichunks',
+        'iter_window',
+        'itertwo',
+        'next_counter',
+        'random_combinations',
+        'random_product',
+        'wrap_iterable',
+    ],
+    'util_inspect': [
+        'BaronWraper',
+        'KWReg',
+        'LIB_PATH',
+        'VERBOSE_INSPECT',
+        'VERYVERB_INSPECT',
+        'argparse_funckw',
+        'check_module_usage',
+        'check_static_member_vars',
+        'dummy_func',
+        'exec_func_doctest',
+        'exec_func_src',
+        'exec_func_src2',
+        'exec_func_src3',
+        'execstr_func_doctest',
+        'filter_valid_kwargs',
+        'find_funcs_called_with_kwargs',
+        'get_argnames',
+        'get_dev_hints',
+        'get_docstr',
+        'get_func_argspec',
+        'get_func_docblocks',
+        'get_func_kwargs',
+        'get_func_modname',
+        'get_func_sourcecode',
+        'get_funcdoc',
+        'get_funcfpath',
+        'get_funckw',
+        'get_funcnames_from_modpath',
+        'get_instance_attrnames',
+        'get_internal_call_graph',
+        'get_kwargs',
+        'get_kwdefaults',
+        'get_kwdefaults2',
+        'get_module_from_class',
+        'get_module_owned_functions',
+        'get_object_methods',
+        'get_unbound_args',
+        'help_members',
+        'infer_arg_types_and_descriptions',
+        'infer_function_info',
+        'inherit_kwargs',
+        'is_bateries_included',
+        'is_defined_by_module',
+        'is_defined_by_module2',
+        'is_valid_python',
+        'iter_module_doctestable',
+        'list_class_funcnames',
+        'list_global_funcnames',
+        'lookup_attribute_chain',
+        'parse_func_kwarg_keys',
+        'parse_function_names',
+        'parse_import_names',
+        'parse_kwarg_keys',
+        'parse_project_imports',
+        'parse_return_type',
+        'prettyprint_parsetree',
+        'recursive_parse_kwargs',
+        'set_funcdoc',
+        'set_funcname',
+        'six_get_argspect',
+        'special_parse_process_python_code',
+        'zzz_profiled_is_no',
+        'zzz_profiled_is_yes',
+    ],
+    'util_ipynb': [
+        'IPYNBCell',
+        'code_cell',
+        'export_notebook',
+        'format_cells',
+        'make_autogen_str',
+        'make_notebook',
+        'markdown_cell',
+        'normalize_cells',
+        'repr_single_for_md',
+        'run_ipython_notebook',
+    ],
+    'util_logging': [
+        'CustomStreamHandler',
+        'LOGGING_VERBOSE',
+        'PRINT_ALL_CALLERS',
+        'add_logging_handler',
+        'debug_logging_iostreams',
+        'ensure_logging',
+        'get_current_log_fpath',
+        'get_current_log_text',
+        'get_log_fpath',
+        'get_logging_dir',
+        'get_shelves_dir',
+        'get_utool_logger',
+        'is_logging',
+        'logdir_cacheid',
+        'start_logging',
+        'stop_logging',
+        'testlogprog',
+    ],
+    'util_list': [
+        'accumulate',
+        'alloc_lists',
+        'alloc_nones',
+        'allsame',
+        'and_lists',
+        'argmax',
+        'argmin',
+        'argsort',
+        'argsort2',
+        'aslist',
+        'broadcast_zip',
+        'bzip',
+        'ceil',
+        'compress',
+        'debug_consec_list',
+        'debug_duplicate_items',
+        'delete_items_by_index',
+        'delete_list_items',
+        'depth',
+        'depth_profile',
+        'duplicates_exist',
+        'emap',
+        'ensure_list_size',
+        'equal',
+        'estarmap',
+        'ezip',
+        'filter_Nones',
+        'filter_items',
+        'filter_startswith',
+        'filterfalse_items',
+        'find_duplicate_items',
+        'find_list_indexes',
+        'find_nonconsec_values',
+        'flag_None_items',
+        'flag_not_None_items',
+        'flag_percentile_parts',
+        'flag_unique_items',
+        'flat_unique',
+        'flatten',
+        'floor',
+        'get_dirty_items',
+        'get_list_column',
+        'get_list_column_slice',
+        'group_consecutives',
+        'group_consecutives_numpy',
+        'iflag_unique_items',
+        'index_complement',
+        'index_to_boolmask',
+        'insert_values',
+        'intersect_ordered',
+        'invertible_flatten1',
+        'invertible_flatten2',
+        'invertible_flatten2_numpy',
+        'invertible_total_flatten',
+        'is_subset',
+        'is_subset_of_any',
+        'is_superset',
+        'isdisjoint',
+        'isect',
+        'isect_indices',
+        'isetdiff_flags',
+        'issorted',
+        'issubset',
+        'issuperset',
+        'isunique',
+        'length_hint',
+        'listT',
+        'list_alignment',
+        'list_all_eq_to',
+        'list_argmax',
+        'list_argmaxima',
+        'list_argsort',
+        'list_compress',
+        'list_compresstake',
+        'list_cover',
+        'list_deep_types',
+        'list_depth',
+        'list_getattr',
+        'list_intersection',
+        'list_inverse_take',
+        'list_isdisjoint',
+        'list_issubset',
+        'list_issuperset',
+        'list_replace',
+        'list_reshape',
+        'list_roll',
+        'list_set_equal',
+        'list_strip',
+        'list_take',
+        'list_transpose',
+        'list_type',
+        'list_type_profile',
+        'list_union',
+        'list_where',
+        'list_zipcompress',
+        'list_zipflatten',
+        'list_ziptake',
+        'listclip',
+        'listfind',
+        'lmap',
+        'lstarmap',
+        'lzip',
+        'make_index_lookup',
+        'make_sortby_func',
+        'maplen',
+        'multi_replace',
+        'none_take',
+        'not_list',
+        'or_lists',
+        'partial_imap_1to1',
+        'partial_order',
+        'print_duplicate_map',
+        'priority_argsort',
+        'priority_sort',
+        'rebase_labels',
+        'recursive_replace',
+        'replace_nones',
+        'safe_listget',
+        'safe_slice',
+        'safeapply',
+        'safelen',
+        'sample_lists',
+        'sample_zip',
+        'scalar_input_map',
+        'search_list',
+        'setdiff',
+        'setdiff_flags',
+        'setdiff_ordered',
+        'setintersect',
+        'setintersect_ordered',
+        'snapped_slice',
+        'sortedby',
+        'sortedby2',
+        'strided_sample',
+        'take',
+        'take_around_percentile',
+        'take_column',
+        'take_complement',
+        'take_percentile',
+        'take_percentile_parts',
+        'total_flatten',
+        'total_unflatten',
+        'type_profile',
+        'type_profile2',
+        'type_sequence_factory',
+        'unflat_map',
+        'unflat_take',
+        'unflat_unique_rowid_map',
+        'unflat_vecmap',
+        'unflatten1',
+        'unflatten2',
+        'union',
+        'union_ordered',
+        'unique',
+        'unique_flags',
+        'unique_indices',
+        'unique_inverse',
+        'unique_ordered',
+        'unique_unordered',
+        'unpack_iterables',
+        'where',
+        'where_not_None',
+        'xor_lists',
+        'zipcompress',
+        'zipflat',
+        'ziptake',
+    ],
+    'util_num': [
+        'float_to_decimal',
+        'get_sys_maxfloat',
+        'get_sys_maxint',
+        'get_sys_minint',
+        'int_comma_str',
+        'num2_sigfig',
+        'num_fmt',
+        'order_of_magnitude_ceil',
+        'sigfig_str',
+    ],
+    'util_numpy': [
+        'deterministic_sample',
+        'deterministic_shuffle',
+        'ensure_rng',
+        'index_of',
+        'intersect2d',
+        'make_incrementer',
+        'npfind',
+        'quantum_random',
+        'random_indexes',
+        'random_sample',
+        'sample_domain',
+        'shuffle',
+        'spaced_indexes',
+        'spaced_items',
+        'tiled_range',
+    ],
+    'util_path': [
+        'ChdirContext',
+        'CopyResult',
+        'IMG_EXTENSIONS',
+        'PRINT_CALLER',
+        'ancestor_paths',
+        'assert_exists',
+        'assertpath',
+        'augpath',
+        'basename_noext',
+        'bulk_copy',
+        'checkpath',
+        'copy',
+        'copy_all',
+        'copy_files_to',
+        'copy_list',
+        'copy_single',
+        'delete',
+        'dirsplit',
+        'ensure_crossplat_path',
+        'ensure_ext',
+        'ensure_mingw_drive',
+        'ensure_native_path',
+        'ensure_unixslash',
+        'ensuredir',
+        'ensurefile',
+        'ensurepath',
+        'existing_commonprefix',
+        'existing_subpath',
+        'expand_win32_shortname',
+        'extend_regex',
+        'file_bytes',
+        'file_megabytes',
+        'find_lib_fpath',
+        'fnames_to_fpaths',
+        'fpath_has_ext',
+        'fpath_has_imgext',
+        'fpaths_to_fnames',
+        'get_modname_from_modpath',
+        'get_modpath',
+        'get_module_dir',
+        'get_module_subdir_list',
+        'get_nonconflicting_path',
+        'get_path_type',
+        'get_relative_modpath',
+        'get_standard_exclude_dnames',
+        'get_standard_include_patterns',
+        'get_win32_short_path_name',
+        'glob',
+        'glob_python_modules',
+        'grep',
+        'grepfile',
+        'greplines',
+        'iglob',
+        'is_module_dir',
+        'is_private_module',
+        'is_python_module',
+        'isfile',
+        'islink',
+        'ismount',
+        'list_images',
+        'longest_existing_path',
+        'ls',
+        'ls_dirs',
+        'ls_images',
+        'ls_moduledirs',
+        'ls_modulefiles',
+        'make_grep_resultstr',
+        'matching_fpaths',
+        'move',
+        'move_list',
+        'newcd',
+        'non_existing_path',
+        'num_images_in_dir',
+        'path_ndir_split',
+        'pathsplit_full',
+        'platform_path',
+        'relpath_unix',
+        'remove_broken_links',
+        'remove_dirs',
+        'remove_existing_fpaths',
+        'remove_file',
+        'remove_file_list',
+        'remove_files_in_dir',
+        'remove_fpaths',
+        'sanitize_filename',
+        'scandir_walk',
+        'search_candidate_paths',
+        'search_in_dirs',
+        'sed',
+        'sedfile',
+        'splitdrive',
+        'symlink',
+        'tail',
+        'testgrep',
+        'time_walkers',
+        'touch',
+        'truepath_relative',
+        'unexpanduser',
+        'unixjoin',
+        'walk_fpaths',
+        'win_shortcut',
+    ],
+    'util_print': [
+        'Indenter',
+        'NO_INDENT',
+        'colorprint',
+        'cprint',
+        'dictprint',
+        'horiz_print',
+        'printNOTQUIET',
+        'printVERBOSE',
+        'printWARN',
+        'print_code',
+        'print_dict',
+        'print_difftext',
+        'print_filesize',
+        'print_list',
+        'print_locals',
+        'print_python_code',
+        'printdict',
+        'printif',
+        'printshape',
+    ],
+    'util_progress': [
+        'AGGROFLUSH',
+        'DEBUG_FREQ_ADJUST',
+        'FORCE_ALL_PROGRESS',
+        'NO_PROGRESS',
+        'PROGGRESS_BACKSPACE',
+        'ProgChunks',
+        'ProgIter',
+        'ProgPartial',
+        'ProgressIter',
+        'VALID_PROGRESS_TYPES',
+        'get_num_chunks',
+        'log_progress',
+        'progiter',
+        'progress_str',
+        'test_progress',
+    ],
+    'util_profile': [
+        'Profiler',
+        'cStringIO',
+        'clean_line_profile_text',
+        'clean_lprof_file',
+        'dump_profile_text',
+        'fix_rawprofile_blocks',
+        'get_block_id',
+        'get_block_totaltime',
+        'get_profile_text',
+        'get_summary',
+        'make_profiler',
+        'parse_rawprofile_blocks',
+        'parse_timemap_from_blocks',
+    ],
+    'util_project': [
+        'GrepResult',
+        'SetupRepo',
+        'UserProfile',
+        'ensure_text',
+        'ensure_user_profile',
+        'glob_projects',
+        'grep_projects',
+        'ibeis_user_profile',
+        'sed_projects',
+        'setup_repo',
+    ],
+    'util_parallel': [
+        'KillableProcess',
+        'KillableThread',
+        'bgfunc',
+        'buffered_generator',
+        'buffered_map',
+        'generate2',
+        'get_default_numprocs',
+        'get_shared_pool',
+        'get_sys_thread_limit',
+        'in_main_process',
+        'init_worker',
+        'set_num_procs',
+        'shutdown_shared_pools',
+        'spawn_background_daemon_thread',
+        'spawn_background_process',
+        'spawn_background_thread',
+    ],
+    'util_resources': [
+        'available_memory',
+        'current_memory_usage',
+        'get_matching_process_ids',
+        'get_memstats_str',
+        'get_python_datastructure_sizes',
+        'get_resource_limits',
+        'get_resource_usage_str',
+        'memstats',
+        'num_cpus',
+        'num_unused_cpus',
+        'peak_memory',
+        'print_resource_usage',
+        'time_in_systemmode',
+        'time_in_usermode',
+        'time_str2',
+        'total_memory',
+        'used_memory',
+    ],
+    'util_str': [
+        'BACKSLASH',
+        'DOUBLE_QUOTE',
+        'ENABLE_COLORS',
+        'NEWLINE',
+        'NO_TRUNCATE',
+        'SINGLE_QUOTE',
+        'TAUFMTSTR',
+        'TAUSTR',
+        'TRIPLE_DOUBLE_QUOTE',
+        'TRIPLE_SINGLE_QUOTE',
+        'align',
+        'align_lines',
+        'autoformat_pep8',
+        'autopep8_format',
+        'bbox_str',
+        'bubbletext',
+        'byte_str',
+        'byte_str2',
+        'chr_range',
+        'closet_words',
+        'codeblock',
+        'color_diff_text',
+        'color_text',
+        'conj_phrase',
+        'countdown_flag',
+        'dict_itemstr_list',
+        'dict_str',
+        'difftext',
+        'doctest_code_line',
+        'doctest_repr',
+        'ensure_ascii',
+        'ensure_unicode',
+        'ensure_unicode_strlist',
+        'file_megabytes_str',
+        'filesize_str',
+        'filtered_infostr',
+        'find_block_end',
+        'flatten_textlines',
+        'format_multi_paragraphs',
+        'format_multiple_paragraph_sentences',
+        'format_single_paragraph_sentences',
+        'format_text_as_docstr',
+        'func_callsig',
+        'func_defsig',
+        'func_str',
+        'get_bytes',
+        'get_callable_name',
+        'get_indentation',
+        'get_itemstr_list',
+        'get_minimum_indentation',
+        'get_textdiff',
+        'highlight_code',
+        'highlight_multi_regex',
+        'highlight_regex',
+        'highlight_text',
+        'horiz_string',
+        'hz_str',
+        'indent',
+        'indent_list',
+        'indent_rest',
+        'indentjoin',
+        'insert_block_between_lines',
+        'is_byte_encoded_unicode',
+        'is_url',
+        'joins',
+        'list_str',
+        'list_str_summarized',
+        'long_fname_format',
+        'lorium_ipsum',
+        'msgblock',
+        'number_text_lines',
+        'numpy_str',
+        'order_of_magnitude_str',
+        'pack_into',
+        'packstr',
+        'packtext',
+        'parse_bytes',
+        'pluralize',
+        'quantstr',
+        'regex_reconstruct_split',
+        'remove_chars',
+        'remove_doublenewlines',
+        'remove_doublspaces',
+        'replace_between_tags',
+        'repr2',
+        'repr2_json',
+        'repr3',
+        'repr4',
+        'reprfunc',
+        'scalar_str',
+        'second_str',
+        'seconds_str',
+        'split_sentences2',
+        'str_between',
+        'strip_ansi',
+        'testdata_text',
+        'textblock',
+        'theta_str',
+        'to_camel_case',
+        'to_title_caps',
+        'to_underscore_case',
+        'toggle_comment_lines',
+        'trunc_repr',
+        'truncate_str',
+        'unformat_text_as_docstr',
+        'unindent',
+        'utf8_len',
+        'varinfo_str',
+        'verts_str',
+    ],
+    'util_sysreq': [
+        'ensure_in_pythonpath',
+        'get_global_dist_packages_dir',
+        'get_local_dist_packages_dir',
+        'get_site_packages_dir',
+        'in_virtual_env',
+        'is_running_as_root',
+        'locate_path',
+        'total_purge_developed_repo',
+    ],
+    'util_sqlite': [
+        'SQLColumnRichInfo',
+        'get_nonprimary_columninfo',
+        'get_primary_columninfo',
+        'get_table_column',
+        'get_table_columninfo_list',
+        'get_table_columnname_list',
+        'get_table_columns',
+        'get_table_csv',
+        'get_table_num_rows',
+        'get_table_rows',
+        'get_tablenames',
+        'print_database_structure',
+    ],
+    'util_setup': [
+        'NOOP',
+        'SETUP_PATTERNS',
+        'SetupManager',
+        'assert_in_setup_repo',
+        'autogen_sphinx_apidoc',
+        'build_pyo',
+        'clean',
+        'find_ext_modules',
+        'find_packages',
+        'get_cmdclass',
+        'get_numpy_include_dir',
+        'parse_author',
+        'parse_package_for_version',
+        'parse_readme',
+        'presetup',
+        'presetup_commands',
+        'read_license',
+        'setup_chmod',
+        'setuptools_setup',
+    ],
+    'util_set': [
+        'MutableSet',
+        'OrderedSet',
+        'Set',
+        'oset',
+        'time_ordered_sets',
+    ],
+    'util_regex': [
+        'REGEX_C_COMMENT',
+        'REGEX_ESCSTR',
+        'REGEX_FLOAT',
+        'REGEX_INT',
+        'REGEX_LATEX_COMMENT',
+        'REGEX_NONGREEDY',
+        'REGEX_RVAL',
+        'REGEX_STR',
+        'REGEX_VARNAME',
+        'REGEX_WHITESPACE',
+        'RE_FLAGS',
+        'RE_KWARGS',
+        'backref_field',
+        'bref_field',
+        'convert_text_to_varname',
+        'extend_regex2',
+        'extend_regex3',
+        'get_match_text',
+        'modify_quoted_strs',
+        'named_field',
+        'named_field_regex',
+        'named_field_repl',
+        'negative_lookahead',
+        'negative_lookbehind',
+        'nongreedy_kleene_star',
+        'padded_parse',
+        'parse_docblock',
+        'parse_python_syntax',
+        'positive_lookahead',
+        'positive_lookbehind',
+        'regex_get_match',
+        'regex_matches',
+        'regex_or',
+        'regex_parse',
+        'regex_replace',
+        'regex_replace_lines',
+        'regex_search',
+        'regex_split',
+        'regex_word',
+        'whole_word',
+    ],
+    'util_time': [
+        'RealTimerit',
+        'Timer',
+        'Timerit',
+        'date_to_datetime',
+        'datetime_to_posixtime',
+        'determine_timestamp_format',
+        'ensure_timedelta',
+        'exiftime_to_unixtime',
+        'get_datestamp',
+        'get_posix_timedelta_str',
+        'get_posix_timedelta_str2',
+        'get_timedelta_str',
+        'get_timestamp',
+        'get_timestats_dict',
+        'get_timestats_str',
+        'get_unix_timedelta',
+        'get_unix_timedelta_str',
+        'local_timezone',
+        'parse_timedelta_str',
+        'parse_timestamp',
+        'tic',
+        'timestamp',
+        'toc',
+        'unixtime_to_datetimeobj',
+        'unixtime_to_datetimestr',
+        'unixtime_to_timedelta',
+        'utcnow_tz',
+    ],
+    'util_tags': [
+        'alias_tags',
+        'build_alias_map',
+        'filterflags_general_tags',
+        'modify_tags',
+        'tag_coocurrence',
+        'tag_hist',
+    ],
+    'util_type': [
+        'BooleanType',
+        'COMPARABLE_TYPES',
+        'FloatType',
+        'HAVE_PANDAS',
+        'IntType',
+        'LISTLIKE_TYPES',
+        'LongType',
+        'NUMPY_SCALAR_NAMES',
+        'NUMPY_TYPE_TUPLE',
+        'PRIMATIVE_TYPES',
+        'VALID_BOOL_TYPES',
+        'VALID_FLOAT_TYPES',
+        'VALID_INT_TYPES',
+        'VALID_STRING_TYPES',
+        'assert_int',
+        'basestring',
+        'bool_from_str',
+        'float_type_',
+        'fuzzy_int',
+        'fuzzy_subset',
+        'get_homogenous_list_type',
+        'get_type',
+        'int_type_',
+        'is_bool',
+        'is_comparable_type',
+        'is_dict',
+        'is_float',
+        'is_func_or_method',
+        'is_func_or_method_or_partial',
+        'is_funclike',
+        'is_int',
+        'is_list',
+        'is_listlike',
+        'is_method',
+        'is_str',
+        'is_tuple',
+        'is_type',
+        'is_valid_floattype',
+        'sctypeDict',
+        'smart_cast',
+        'smart_cast2',
+        'try_cast',
+        'type_str',
+        'unicode',
+    ],
+    'util_tests': [
+        'BIGFACE',
+        'DEBUG_SRC',
+        'ExitTestException',
+        'HAPPY_FACE',
+        'HAPPY_FACE_BIG',
+        'HAPPY_FACE_SMALL',
+        'INDENT_TEST',
+        'ModuleDoctestTup',
+        'PRINT_FACE',
+        'PRINT_SRC',
+        'SAD_FACE',
+        'SAD_FACE_BIG',
+        'SAD_FACE_SMALL',
+        'SYSEXIT_ON_FAIL',
+        'TestTuple',
+        'VERBOSE_TEST',
+        'VERBOSE_TIMER',
+        'doctest_funcs',
+        'doctest_module_list',
+        'doctest_was_requested',
+        'execute_doctest',
+        'find_doctestable_modnames',
+        'find_testfunc',
+        'find_untested_modpaths',
+        'get_doctest_examples',
+        'get_module_completions',
+        'get_module_doctest_tup',
+        'get_module_testlines',
+        'get_package_testables',
+        'main_function_tester',
+        'parse_docblocks_from_docstr',
+        'parse_doctest_from_docstr',
+        'qt4ensure',
+        'qtensure',
+        'quit_if_noshow',
+        'read_exampleblock',
+        'run_test',
+        'show_if_requested',
+        'show_was_requested',
+    ],
+    'util_web': [
+        'find_open_port',
+        'get_localhost',
+        'is_local_port_open',
+        'render_html',
+        'start_simple_webserver',
+    ],
+    'DynamicStruct': [
+        'DynStruct',
+        'Printable',
+    ],
+    'Preferences': [
+        'Pref',
+        'PrefChoice',
+        'PrefInternal',
+        'PrefNode',
+        'PrefTree',
+        'VERBOSE_PREF',
+        'test_Preferences',
+    ],
+}
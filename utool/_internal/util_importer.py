@@ -400,6 +400,10 @@ def dynamic_import(modname, import_tuples, developing=True, ignore_froms=[],
                     file_.write(new_text)
             else:
                 print('no write hook for file: %r' % init_fpath)
+    if ('--update-%s-lazy-table' % modname) in sys.argv:
+        is_main_proc = multiprocessing.current_process().name == 'MainProcess'
+        if is_main_proc:
+            write_lazy_attr_table(modname, import_tuples)
     if return_initstr:
         initstr = _initstr(modname, imports, from_imports, '', withheader=False)
         return inject_execstr, initstr
@@ -430,3 +434,63 @@ def make_import_tuples(module_path, exclude_modnames=[]):
                             if modname not in exclude_set]
     import_tuples = (module_import_tuples + package_import_tuples)
     return import_tuples
+
+
+def make_lazy_attr_table(modname, import_tuples):
+    """
+    Maps each submodule to the attributes of the (eagerly imported) package
+    that it provides. When several submodules define a name, the first one in
+    import_tuples wins, which is the same rule the star imports follow.
+    Attributes that no submodule provides (like the reload functions defined
+    by the init exec string) are left out.
+
+    Returns:
+        dict: submodule name -> sorted list of attribute names
+    """
+    module = sys.modules[modname]
+    submodnames = [tup[0] for tup in import_tuples]
+    submods = [sys.modules[modname + '.' + name] for name in submodnames]
+    table = {name: [] for name in submodnames}
+    sentinel = object()
+    for attr, val in vars(module).items():
+        if attr.startswith('__') or attr in table:
+            continue
+        for name, submod in zip(submodnames, submods):
+            if getattr(submod, attr, sentinel) is val:
+                table[name].append(attr)
+                break
+    return {name: sorted(attrs) for name, attrs in table.items() if attrs}
+
+
+def write_lazy_attr_table(modname, import_tuples):
+    """
+    Writes the table used by the lazy attribute mode of the package __init__
+    to <package>/_internal/lazy_attr_table.py
+    """
+    from os.path import join
+    module = sys.modules[modname]
+    table = make_lazy_attr_table(modname, import_tuples)
+    lines = [
+        '# -*- coding: utf-8 -*-',
+        '"""',
+        'AUTOGENERATED by util_importer.write_lazy_attr_table. Do not edit.',
+        '',
+        'Maps each submodule to the package attributes it provides.',
+        '',
+        'Regenerate with:',
+        '    python -c "import %s" --update-%s-lazy-table' % (modname, modname),
+        '"""',
+        'LAZY_ATTR_TABLE = {',
+    ]
+    for name in [tup[0] for tup in import_tuples]:
+        if name not in table:
+            continue
+        lines.append('    %r: [' % (str(name),))
+        lines.extend(['        %r,' % (str(attr),) for attr in table[name]])
+        lines.append('    ],')
+    lines.append('}')
+    fpath = join(module.__path__[0], '_internal', 'lazy_attr_table.py')
+    print('writing lazy attribute table: %r' % (fpath,))
+    with open(fpath, 'w') as file_:
+        file_.write('\n'.join(lines) + '\n')
+    return fpath
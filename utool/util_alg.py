@@ -1130,6 +1130,11 @@ def knapsack(items, maxweight, method='recursive'):
 
         maxweight (scalar):  is a non-negative integer.
 
+        method (str): 'recursive', 'iterative', 'packed' or 'ilp'. The
+            iterative method uses knapsack_iterative_packed when numpy is
+            available. It returns the given items, while knapsack_iterative
+            returns copies whose float weights are scaled to integers.
+
     Returns:
         tuple: (total_value, items_subset) - a pair whose first element is the
             sum of values in the most valuable subsequence, and whose second
@@ -1261,7 +1266,11 @@ def knapsack(items, maxweight, method='recursive'):
     if method == 'recursive':
         return knapsack_recursive(items, maxweight)
     elif method == 'iterative':
+        if HAVE_NUMPY:
+            return knapsack_iterative_packed(items, maxweight)
         return knapsack_iterative(items, maxweight)
+    elif method == 'packed':
+        return knapsack_iterative_packed(items, maxweight)
     elif method == 'ilp':
         return knapsack_ilp(items, maxweight)
     else:
@@ -1516,6 +1525,172 @@ def knapsack_iterative_numpy(items, maxweight):
     return total_value, items_subset
 
 
+def _integral_knapsack_weights(weights, maxweight):
+    """
+    Scales float weights by the smallest power of ten that makes them (and
+    maxweight) integral. Rounds instead of truncating so 2.15 * 100 does
+    not become 214.
+    """
+    max_exp = max([number_of_decimals(w_) for w_ in weights] +
+                  [number_of_decimals(maxweight)])
+    coeff = 10 ** max_exp
+    int_weights = np.array([int(round(w_ * coeff)) for w_ in weights],
+                           dtype=np.int64)
+    int_maxweight = int(round(maxweight * coeff))
+    return int_weights, int_maxweight
+
+
+def _packed_knapsack_values(items):
+    """
+    Returns the item values as an int64 or float64 array, or None if they
+    cannot be summed exactly in one (e.g. python ints beyond int64 or
+    non-numeric values).
+    """
+    values = np.asarray([t[0] for t in items])
+    kind = values.dtype.kind
+    if kind == 'f':
+        return values.astype(np.float64)
+    if kind in 'biu':
+        # every partial sum must fit, not just every value
+        value_list = values.tolist()
+        int64_info = np.iinfo(np.int64)
+        if (sum(v for v in value_list if v > 0) > int64_info.max or
+              sum(v for v in value_list if v < 0) < int64_info.min):
+            return None
+        return values.astype(np.int64)
+    return None
+
+
+def knapsack_iterative_packed(items, maxweight):
+    r"""
+    Iterative knapsack with a rolling numpy row and a bit-packed choice matrix.
+
+    Solves the same recurrence as :func:`knapsack_iterative_int`, so it picks
+    the same subset, but each item updates every capacity in one vectorized
+    step. Only the current row of dpmat is kept. The choice flags are stored
+    with ``np.packbits``, one bit per (item, capacity) pair, for the trace
+    back. Float weights are scaled to integers as in
+    :func:`knapsack_iterative`. Values that do not fit in int64 or float64
+    (e.g. huge python ints) are solved exactly by :func:`knapsack_iterative`.
+
+    Args:
+        items (tuple): sequence of tuples `(value, weight, id_)`
+        maxweight (scalar): non-negative capacity
+
+    Returns:
+        tuple: (total_value, items_subset)
+
+    CommandLine:
+        python -m utool.util_alg knapsack_iterative_packed
+
+    SeeAlso:
+        ut.time_knapsack_engines
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> items = [(4, 12, 0), (2, 1, 1), (6, 4, 2), (1, 1, 3), (2, 2, 4)]
+        >>> total_value, items_subset = knapsack_iterative_packed(items, 15)
+        >>> result =  'total_value = %r\n' % (total_value,)
+        >>> result += 'items_subset = %r' % (items_subset,)
+        >>> print(result)
+        total_value = 11
+        items_subset = [(2, 1, 1), (6, 4, 2), (1, 1, 3), (2, 2, 4)]
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> import numpy as np
+        >>> rng = np.random.RandomState(0)
+        >>> for _ in range(20):
+        >>>     n = rng.randint(1, 30)
+        >>>     values = rng.randint(0, 50, n).tolist()
+        >>>     weights = rng.randint(0, 20, n).tolist()
+        >>>     items = list(zip(values, weights, range(n)))
+        >>>     maxweight = int(rng.randint(0, 100))
+        >>>     expected = knapsack_iterative_int(items, maxweight)
+        >>>     assert knapsack_iterative_packed(items, maxweight) == expected
+        >>> # values beyond int64 are not rounded through float64
+        >>> items = [(5, 0, 0), (3, 0, 1), (2 ** 70, 1, 2)]
+        >>> print(knapsack_iterative_packed(items, 1)[0])
+        1180591620717411303432
+    """
+    if len(items) == 0:
+        return 0, []
+    values = _packed_knapsack_values(items)
+    if values is None:
+        return knapsack_iterative(items, maxweight)
+    weights, int_maxweight = _integral_knapsack_weights(
+        [t[1] for t in items], maxweight)
+    maxsize = int_maxweight + 1
+    # best[w] is the value of the best subset of the items so far that weighs
+    # at most w, i.e. the current row of dpmat
+    best = np.zeros(maxsize, dtype=values.dtype)
+    packed_kmat = np.zeros((len(items), (maxsize + 7) // 8), dtype=np.uint8)
+    take = np.zeros(maxsize, dtype=np.bool_)
+    for idx in range(len(items)):
+        item_weight = weights[idx]
+        if item_weight > int_maxweight:
+            continue
+        withitem_val = best[:maxsize - item_weight] + values[idx]
+        take[:item_weight] = False
+        np.greater(withitem_val, best[item_weight:], out=take[item_weight:])
+        np.copyto(best[item_weight:], withitem_val, where=take[item_weight:])
+        packed_kmat[idx] = np.packbits(take)
+    # Trace backwards to get the items used in the solution
+    K = int_maxweight
+    idx_subset = []
+    for idx in reversed(range(len(items))):
+        if (packed_kmat[idx, K >> 3] >> (7 - (K & 7))) & 1:
+            idx_subset.append(idx)
+            K = K - weights[idx]
+    idx_subset = sorted(idx_subset)
+    items_subset = [items[i] for i in idx_subset]
+    total_value = best[int_maxweight].item()
+    return total_value, items_subset
+
+
+def time_knapsack_engines(num_items=100, maxweight=10000, num=1, seed=0):
+    """
+    Benchmarks knapsack_iterative_packed against knapsack_iterative_int and
+    knapsack_iterative_numpy on random integer items and reports the size of
+    the choice matrix each one keeps for the trace back.
+
+    CommandLine:
+        python -m utool.util_alg time_knapsack_engines
+
+    Example:
+        >>> # DISABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> results = time_knapsack_engines(num_items=100, maxweight=10000)
+    """
+    import utool as ut
+    rng = np.random.RandomState(seed)
+    values = rng.randint(1, 1000, num_items).tolist()
+    weights = rng.randint(1, maxweight // 4, num_items).tolist()
+    items = list(zip(values, weights, range(num_items)))
+    kmat_nbytes = {
+        'knapsack_iterative_int': None,
+        'knapsack_iterative_numpy': num_items * (maxweight + 1),
+        'knapsack_iterative_packed': num_items * ((maxweight + 8) // 8),
+    }
+    results = {}
+    expected = knapsack_iterative_int(items, maxweight)
+    for func in [knapsack_iterative_int, knapsack_iterative_numpy,
+                 knapsack_iterative_packed]:
+        for timer in ut.Timerit(num, verbose=0):
+            with timer:
+                total_value, items_subset = func(items, maxweight)
+        label = func.__name__
+        results[label] = timer.parent.min()
+        nbytes = kmat_nbytes[label]
+        print('%-26s %8.3fs  total_value=%r  kmat=%s' % (
+            label, results[label], total_value,
+            'dict' if nbytes is None else ut.byte_str2(nbytes)))
+    assert knapsack_iterative_packed(items, maxweight) == expected
+    return results
+
+
 #def knapsack_all_solns(items, maxweight):
 #    """
 #    TODO: return all optimal solutions to the knapsack problem
@@ -1696,27 +1871,32 @@ def maximin_distance_subset1d(items, K=None, min_thresh=None, verbose=False):
 
 
     Example:
-        >>> # DISABLE_DOCTEST
+        >>> # ENABLE_DOCTEST
         >>> import utool as ut
         >>> from utool.util_alg import *  # NOQA
         >>> #items = [1, 2, 3, 4, 5, 6, 7]
         >>> items = [20, 1, 1, 9, 21, 6, 22]
         >>> min_thresh = 5
         >>> K = None
-        >>> result = maximin_distance_subset1d(items, K, min_thresh, verbose=True)
+        >>> result = maximin_distance_subset1d(items, K, min_thresh)
         >>> print(result)
         (array([1, 3, 6]), [1, 9, 22])
 
     Example:
-        >>> # DISABLE_DOCTEST
+        >>> # ENABLE_DOCTEST
         >>> import utool as ut
         >>> from utool.util_alg import *  # NOQA
         >>> #items = [1, 2, 3, 4, 5, 6, 7]
         >>> items = [0, 1]
         >>> min_thresh = 5
         >>> K = None
-        >>> result = maximin_distance_subset1d(items, K, min_thresh, verbose=True)
+        >>> result = maximin_distance_subset1d(items, K, min_thresh)
         >>> print(result)
+        (array([0]), [0])
+
+    SeeAlso:
+        ut.farthest_point_subset - N-d version
+        ut.time_maximin_engines
     """
     if False:
         import pulp
@@ -1758,43 +1938,15 @@ def maximin_distance_subset1d(items, K=None, min_thresh=None, verbose=False):
         # prob.add(sum(x[i] for i in containing_sets) >= 1)
 
     import utool as ut
-    try:
-        import vtool_ibeis as vt
-    except ImportError:
-        import vtool as vt
-    points = np.array(items)[:, None]
+    points = np.asarray(items)
     # Initial sorting of 1d points
-    initial_sortx = points.argsort(axis=0).flatten()
-    points = points.take(initial_sortx, axis=0)
+    initial_sortx = points.argsort(kind='mergesort')
+    points = points.take(initial_sortx)
 
     if K is None:
         K = len(items)
-
-    def distfunc(x, y):
-        return np.abs(x - y)
-
-    assert points.shape[1] == 1
     assert len(points) >= K, 'cannot return subset'
-    if K == 1:
-        current_idx = [0]
-    else:
-        current_idx = [0, -1]
-        if min_thresh is not None and distfunc(points[0], points[-1])[0] < min_thresh:
-            current_idx = [0]
-    chosen_mask = vt.index_to_boolmask(current_idx, len(points))
-
-    for k in range(2, K):
-        unchosen_idx = np.nonzero(~chosen_mask)[0]
-        unchosen_items = points.compress(~chosen_mask, axis=0)
-        chosen_items = points.compress(chosen_mask, axis=0)
-        distances = distfunc(unchosen_items, chosen_items.T)
-        min_distances = distances.min(axis=1)
-        argx = min_distances.argmax()
-        if min_thresh is not None:
-            if min_distances[argx] < min_thresh:
-                break
-        new_idx = unchosen_idx[argx]
-        chosen_mask[new_idx] = True
+    chosen_mask = _maximin_sorted1d(points, K, min_thresh)
 
     # Put chosen mask back in the input order of items
     chosen_items_mask = chosen_mask.take(initial_sortx.argsort())
@@ -1803,131 +1955,244 @@ def maximin_distance_subset1d(items, K=None, min_thresh=None, verbose=False):
     #current_idx = np.nonzero(chosen_mask)[0]
     if verbose:
         print('Chose subset')
-        chosen_points = points.compress(chosen_mask, axis=0)
-        distances = (spdist.pdist(chosen_points, distfunc))
+        chosen_points = points.compress(chosen_mask)
+        # in 1d the closest pairs of the subset are its neighbors
+        distances = np.diff(chosen_points)
         print('chosen_items_idxs = %r' % (chosen_items_idxs,))
         print('chosen_items = %r' % (chosen_items,))
         print('distances = %r' % (distances,))
     return chosen_items_idxs, chosen_items
 
 
-def maximum_distance_subset(items, K, verbose=False):
+def _maximin_sorted1d(xs, K, min_thresh=None):
     """
-    FIXME: I believe this does not work.
+    Greedy maximin selection on sorted 1d points in O(N log N).
 
-    Returns a subset of size K from items with the maximum pairwise distance
+    The chosen points split the line into gaps. The unchosen point of a gap
+    farthest from all chosen points is the one closest to the middle of the
+    gap, which a binary search finds. A heap keyed by (-distance, index)
+    yields the same picks (and tie breaks) as rescanning every point for
+    each pick, while memory stays O(N).
 
-    References:
-        stackoverflow.com/questions/12278528/subset-elements-furthest-apart-eachother
-        stackoverflow.com/questions/13079563/condensed-distance-matrix-pdist
+    Returns:
+        ndarray: boolean mask of chosen positions in xs
+    """
+    import heapq
+    num = len(xs)
+    chosen_mask = np.zeros(num, dtype=np.bool_)
+    if num == 0:
+        return chosen_mask
+    chosen_mask[0] = True
+    if K == 1 or num == 1:
+        return chosen_mask
+    if min_thresh is None or xs[-1] - xs[0] >= min_thresh:
+        chosen_mask[num - 1] = True
+        gaps = [(0, num - 1)]
+    else:
+        gaps = [(0, None)]
 
-    Recurance:
-        Let X[n,k] be the solution for selecting k elements from first n elements items.
-        X[n, k] = max( max( X[m, k - 1] + (sum_{p in prev_solution} dist(o, p)) for o < n and o not in prev solution) ) for m < n.
+    def best_in_gap(ia, ib):
+        # unchosen points in a gap are at positions ia + 1 to hi - 1
+        lo, hi = ia + 1, (num if ib is None else ib)
+        if lo >= hi:
+            return None
+        inner = xs[lo:hi]
+        a = xs[ia]
+        if ib is None:
+            # only a chosen neighbor on the left, the largest value is best
+            k = lo + np.searchsorted(inner, inner[-1], side='left')
+            return (xs[k] - a, k)
+        b = xs[ib]
+        k = lo + np.searchsorted(inner, (a + b) / 2, side='left')
+        cands = []
+        if k > lo:
+            # first occurrence of the closest value below the middle
+            cands.append(lo + np.searchsorted(inner, xs[k - 1], side='left'))
+        if k < hi:
+            cands.append(k)
+        value, neg_k = max((min(xs[c] - a, b - xs[c]), -c) for c in cands)
+        return value, -neg_k
+
+    heap = []
+
+    def push_gap(ia, ib):
+        best = best_in_gap(ia, ib)
+        if best is not None:
+            value, k = best
+            heapq.heappush(heap, (-value, k, ia, ib))
+
+    for ia, ib in gaps:
+        push_gap(ia, ib)
+    for _ in range(2, K):
+        if not heap:
+            break
+        neg_value, k, ia, ib = heapq.heappop(heap)
+        if min_thresh is not None and -neg_value < min_thresh:
+            break
+        chosen_mask[k] = True
+        push_gap(ia, k)
+        push_gap(k, ib)
+    return chosen_mask
+
+
+def time_maximin_engines(num_items=100000, K=1000, num=1, seed=0):
+    """
+    Benchmarks greedy 1d maximin selection of K out of ``num_items`` random
+    timestamps. It compares three versions:
+
+    - rescanning distances to every chosen item for each pick (the previous
+      maximin_distance_subset1d), timed on fewer picks and extrapolated
+    - a running min-distance vector (farthest_point_subset)
+    - the sorted O(N log N) special case
+
+    CommandLine:
+        python -m utool.util_alg time_maximin_engines
 
     Example:
         >>> # DISABLE_DOCTEST
-        >>> import scipy.spatial.distance as spdist
-        >>> items = [1, 6, 20, 21, 22]
+        >>> from utool.util_alg import *  # NOQA
+        >>> results = time_maximin_engines(num_items=100000, K=1000)
+    """
+    import utool as ut
+    rng = np.random.RandomState(seed)
+    items = rng.rand(num_items) * 1E6
+    sorted_items = np.sort(items)
+    num_rescan = max(2, K // 10)
+
+    def rescan():
+        # the loop maximin_distance_subset1d used before, O(N * K ** 2)
+        chosen_mask = np.zeros(num_items, dtype=np.bool_)
+        chosen_mask[[0, -1]] = True
+        for _ in range(2, num_rescan):
+            unchosen_idx = np.nonzero(~chosen_mask)[0]
+            unchosen = sorted_items.compress(~chosen_mask)[:, None]
+            chosen = sorted_items.compress(chosen_mask)[None, :]
+            min_distances = np.abs(unchosen - chosen).min(axis=1)
+            chosen_mask[unchosen_idx[min_distances.argmax()]] = True
+
+    results = {}
+    for label, func in [
+        ('rescan', rescan),
+        ('running min vector', lambda: farthest_point_subset(sorted_items, K)),
+        ('sorted 1d', lambda: maximin_distance_subset1d(items, K)),
+    ]:
+        for timer in ut.Timerit(num, verbose=0):
+            with timer:
+                func()
+        seconds = timer.parent.min()
+        if label == 'rescan':
+            # the cost of pick k grows linearly with k
+            seconds *= (float(K) / num_rescan) ** 2
+        results[label] = seconds
+        print('%-20s %8.3fs  (N=%d, K=%d)' % (label, seconds, num_items, K))
+    return results
+
+
+def farthest_point_subset(points, K=None, min_thresh=None, start=0):
+    r"""
+    Incremental farthest-point (maximin) selection for N-d points.
+
+    Starting from ``start``, repeatedly picks the point whose euclidean
+    distance to the closest chosen point is largest. A running vector of
+    those distances is updated in O(N) per pick, so no pairwise distance
+    matrix is built and memory stays O(N).
+
+    Args:
+        points (ndarray): (N,) or (N, D) points
+        K (int): number of points to choose (default = all)
+        min_thresh (float): stop once the farthest point is closer than this
+        start (int): index of the first point
+
+    Returns:
+        tuple: (chosen_idxs, pick_dists) - indices in pick order and the
+            distance of each pick to the previously chosen points
+
+    CommandLine:
+        python -m utool.util_alg farthest_point_subset
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> points = [20, 1, 1, 9, 21, 6, 22]
+        >>> chosen_idxs, pick_dists = farthest_point_subset(points, K=4)
+        >>> print(chosen_idxs.tolist())
+        >>> print(pick_dists.tolist())
+        [0, 1, 3, 5]
+        [inf, 19.0, 8.0, 3.0]
+        >>> pts2d = np.array([[0, 0], [10, 0], [0, 10], [5, 5], [1, 1]])
+        >>> print(farthest_point_subset(pts2d, min_thresh=5)[0].tolist())
+        [0, 1, 2, 3]
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 1:
+        points = points[:, None]
+    num = len(points)
+    if K is None:
+        K = num
+    chosen_idxs, pick_dists = [], []
+    min_dists = np.full(num, np.inf)
+    idx, dist = start, np.inf
+    while num and len(chosen_idxs) < K:
+        chosen_idxs.append(idx)
+        pick_dists.append(dist)
+        diff = points - points[idx]
+        if points.shape[1] == 1:
+            dists = np.abs(diff[:, 0])
+        else:
+            dists = np.sqrt(np.einsum('ij,ij->i', diff, diff))
+        np.minimum(min_dists, dists, out=min_dists)
+        min_dists[idx] = -np.inf
+        idx = int(min_dists.argmax())
+        dist = float(min_dists[idx])
+        if dist == -np.inf:
+            break
+        if min_thresh is not None and dist < min_thresh:
+            break
+    return np.array(chosen_idxs, dtype=np.int64), np.array(pick_dists)
+
+
+def maximum_distance_subset(items, K, verbose=False):
+    """
+    Returns a subset of size K from 1d items with the maximum sum of pairwise
+    distances.
+
+    For a sorted subset y_1 <= ... <= y_K the sum of pairwise distances is
+    sum((2 * i - K - 1) * y_i), so the lower half of the subset is weighted
+    negatively and the upper half positively. The optimum is therefore the
+    ``K // 2`` smallest and the ``K - K // 2`` largest items, found with one
+    argsort in O(N log N) time and O(N) memory.
+
+    References:
+        stackoverflow.com/questions/12278528/subset-elements-furthest-apart-eachother
 
     CommandLine:
         python -m utool.util_alg --exec-maximum_distance_subset
 
     Example:
-        >>> # DISABLE_DOCTEST
+        >>> # ENABLE_DOCTEST
         >>> from utool.util_alg import *  # NOQA
         >>> #items = [1, 2, 3, 4, 5, 6, 7]
         >>> items = [1, 6, 20, 21, 22]
         >>> K = 3
-        >>> result = maximum_distance_subset(items, K)
-        >>> print(result)
-        (42.0, array([4, 3, 0]), array([22, 21,  1]))
+        >>> value, subset_idx, subset = maximum_distance_subset(items, K)
+        >>> print((value, subset_idx.tolist(), subset.tolist()))
+        (42.0, [4, 3, 0], [22, 21, 1])
     """
-    from utool import util_decor
     if verbose:
         print('maximum_distance_subset len(items)=%r, K=%r' % (len(items), K,))
-
-    points = np.array(items)[:, None]
-
-    if False:
-        # alternative definition (not sure if works)
-        distmat = spdist.squareform(spdist.pdist(points, lambda x, y: np.abs(x - y)))
-        D = np.triu(distmat)
-        remaining_idxs = np.arange(len(D))
-        for count in range(len(points) - K):
-            values = D.sum(axis=1) + D.sum(axis=0)
-            remove_idx = values.argmin()  # index with minimum pairwise distance
-            remaining_idxs = np.delete(remaining_idxs, remove_idx)
-            D = np.delete(np.delete(D, remove_idx, axis=0), remove_idx, axis=1)
-        value = D.sum()
-        subset_idx = remaining_idxs.tolist()
-        value, subset_idx
-        subset = points.take(subset_idx)
-        #print((value, subset_idx, subset))
-
-    sortx = points.T[0].argsort()[::-1]
-    sorted_points = points.take(sortx, axis=0)
-    pairwise_distance = spdist.pdist(sorted_points, lambda x, y: np.abs(x - y))
-    distmat = (spdist.squareform(pairwise_distance))
-
-    def condensed_idx(i, j):
-        if i >= len(sorted_points) or j >= len(sorted_points):
-            raise IndexError('i=%r j=%r out of range' % (i, j))
-        elif i == j:
-            return None
-        elif j < i:
-            i, j = j, i
-        return (i * len(sorted_points) + j) - (i * (i + 1) // 2) - (i) - (1)
-
-    def dist(i, j):
-        idx = condensed_idx(i, j)
-        return 0 if idx is None else pairwise_distance[idx]
-
-    @util_decor.memoize_nonzero
-    def optimal_solution(n, k):
-        """
-        Givem sorted items sorted_points
-        Pick subset_idx of size k from sorted_points[:n] with maximum pairwise distance
-        Dynamic programming solution
-        """
-        "# FIXME BROKEN "
-        assert n <= len(sorted_points) and k <= len(sorted_points)
-        if k < 2 or n < 2 or n < k:
-            # BASE CASE
-            value, subset_idx =  0, []
-        elif k == 2:
-            # BASE CASE
-            # when k==2 we choose the maximum pairwise pair
-            subdist = np.triu(distmat[0:n, 0:n])
-            maxpos = subdist.argmax()
-            ix, jx = np.unravel_index(maxpos, subdist.shape)
-            value = distmat[ix, jx]
-            subset_idx = [ix, jx]
-        else:
-            # RECURSIVE CASE
-            value = 0
-            subset_idx = None
-            # MAX OVER ALL OTHER NODES (might not need a full on loop here, but this will definitely work)
-            for m in range(k - 1, n):
-                # Choose which point to add would maximize the distance with the previous best answer.
-                prev_value, prev_subset_idx = optimal_solution(m, k - 1)
-                for o in range(n):
-                    if o in prev_subset_idx:
-                        continue
-                    add_value = sum([distmat[o, px] for px in prev_subset_idx])
-                    cur_value = prev_value + add_value
-                    if cur_value > value:
-                        value = cur_value
-                        subset_idx = prev_subset_idx + [o]
-        return value, subset_idx
-
-    value, sorted_subset_idx = optimal_solution(len(points), K)
-    subset_idx = sortx.take(sorted_subset_idx)
+    points = np.asarray(items)
+    assert len(points) >= K, 'cannot return subset'
+    # descending order, ties keep the input order
+    sortx = (-points).argsort(kind='mergesort')
+    num_top = K - K // 2
+    num_bottom = K // 2
+    subset_idx = np.hstack([sortx[0:num_top],
+                            sortx[len(sortx) - num_bottom:]]).astype(np.int64)
     subset = points.take(subset_idx)
-    #print((value, subset_idx, subset))
+    ascending = subset[::-1].astype(np.float64)
+    coeffs = 2 * np.arange(1, K + 1) - K - 1
+    value = float(np.dot(coeffs, ascending))
     return value, subset_idx, subset
-    #np.array([[dist(i, k) if k < i else 0 for k in range(len(A))] for i in range(len(A))])
-    #raise NotImplementedError('unfinished')
 
 
 #def safe_max(arr):
@@ -2143,23 +2408,132 @@ def max_size_max_distance_subset(items, min_thresh=0, Kstart=2, verbose=False):
             print('subset = %r' % (subset,))
             print('subset_idx = %r' % (subset_idx,))
             print('value = %r' % (value,))
-        distances = ut.safe_pdist(subset[:, None])
+        # in 1d the closest pairs of the subset are its neighbors
+        distances = np.diff(np.sort(subset))
         if np.any(distances < min_thresh):
             break
         best_idxs = subset_idx
     return best_idxs
 
 
+# Inputs shorter than this are grouped by the pure python path
+__GROUP_MIN_NUMPY__ = 64
+
+
+def _numeric_groupids(groupid_list):
+    """
+    Returns ``groupid_list`` as an ndarray when it can be grouped by the numpy
+    engine without changing the keys, otherwise None.
+    """
+    if not HAVE_NUMPY:
+        return None
+    if isinstance(groupid_list, np.ndarray):
+        groupids = groupid_list
+        if groupids.ndim != 1 or groupids.dtype.kind not in 'biuf':
+            return None
+        if groupids.dtype.kind == 'f' and np.isnan(groupids).any():
+            # nan keys do not compare equal to each other
+            return None
+        return groupids
+    if len(groupid_list) < __GROUP_MIN_NUMPY__:
+        return None
+    first = groupid_list[0]
+    if not isinstance(first, (six.integer_types, np.integer)):
+        # lists of floats may mix in ints, which numpy would cast to floats
+        return None
+    try:
+        groupids = np.asarray(groupid_list)
+    except (ValueError, OverflowError):
+        return None
+    if groupids.ndim != 1 or groupids.dtype.kind not in 'biu':
+        return None
+    return groupids
+
+
+def _group_boundaries(groupids):
+    """
+    Stable argsort of groupids and the positions where the sorted ids change.
+    """
+    sortx = groupids.argsort(kind='mergesort')
+    sorted_ids = groupids.take(sortx)
+    if len(sorted_ids):
+        splitx = np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1
+        keys = sorted_ids.take(np.hstack([[0], splitx]).astype(np.intp))
+    else:
+        splitx = np.empty(0, dtype=np.intp)
+        keys = sorted_ids
+    return keys, sortx, splitx
+
+
+def group_indices_numpy(groupids):
+    r"""
+    Vectorized version of :func:`group_indices` for numeric group ids.
+
+    A stable argsort puts the indices of each group next to each other in
+    their original order, and the points where the sorted ids change split
+    it into groups. This is the equivalent of ``np.unique(return_inverse)``
+    followed by a stable argsort of the inverse, but needs only one sort.
+
+    Args:
+        groupids (ndarray): 1D array of numeric group ids
+
+    Returns:
+        tuple: (keys, groupxs) - sorted unique ids as an ndarray and a list
+            of index arrays, one per key
+
+    CommandLine:
+        python -m utool.util_alg group_indices_numpy
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> import numpy as np
+        >>> groupids = np.array([2, 1, 2, 1, 2, 1, 2, 3, 3, 3, 3])
+        >>> keys, groupxs = group_indices_numpy(groupids)
+        >>> print(keys.tolist())
+        >>> print([xs.tolist() for xs in groupxs])
+        [1, 2, 3]
+        [[1, 3, 5], [0, 2, 4, 6], [7, 8, 9, 10]]
+    """
+    groupids = np.asarray(groupids)
+    keys, sortx, splitx = _group_boundaries(groupids)
+    if len(sortx) == 0:
+        return keys, []
+    bounds = [0] + splitx.tolist() + [len(sortx)]
+    # slicing directly is much cheaper than np.split for many small groups
+    groupxs = [sortx[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    return keys, groupxs
+
+
+def _group_indices_python(groupid_list):
+    item_list = range(len(groupid_list))
+    grouped_dict = util_dict.group_items(item_list, groupid_list)
+    # Sort by groupid for cache efficiency
+    keys_ = list(grouped_dict.keys())
+    try:
+        keys = sorted(keys_)
+    except TypeError:
+        # Python 3 does not allow sorting mixed types
+        keys = util_list.sortedby2(keys_, keys_)
+    groupxs = util_dict.dict_take(grouped_dict, keys)
+    return keys, groupxs
+
+
 def group_indices(groupid_list):
     """
     groups indicies of each item in ``groupid_list``
 
+    Numeric ids (integer lists and numeric ndarrays) are grouped with
+    :func:`group_indices_numpy`, everything else with a dictionary. Both
+    paths return python lists.
+
     Args:
         groupid_list (list): list of group ids
 
     SeeAlso:
-        vt.group_indices - optimized numpy version
+        ut.group_indices_numpy - returns ndarrays
         ut.apply_grouping
+        ut.time_grouping_engines
 
     CommandLine:
         python -m utool.util_alg --test-group_indices
@@ -2174,32 +2548,39 @@ def group_indices(groupid_list):
         >>> print(result)
         [1, 'b', 'c'],
         [[1, 3, 5], [0, 2, 4, 6], [7, 8, 9, 10]],
-    """
-    item_list = range(len(groupid_list))
-    grouped_dict = util_dict.group_items(item_list, groupid_list)
-    # Sort by groupid for cache efficiency
-    keys_ = list(grouped_dict.keys())
-    try:
-        keys = sorted(keys_)
-    except TypeError:
-        # Python 3 does not allow sorting mixed types
-        keys = util_list.sortedby2(keys_, keys_)
-    groupxs = util_dict.dict_take(grouped_dict, keys)
-    return keys, groupxs
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> import numpy as np
+        >>> rng = np.random.RandomState(0)
+        >>> for groupids in [rng.randint(0, 10, 1000), rng.rand(100).round(1),
+        >>>                  rng.randint(0, 1000, 500).tolist(), []]:
+        >>>     assert group_indices(groupids) == _group_indices_python(groupids)
+    """
+    groupids = _numeric_groupids(groupid_list)
+    if groupids is None:
+        return _group_indices_python(groupid_list)
+    keys, sortx, splitx = _group_boundaries(groupids)
+    flat_groupxs = sortx.tolist()
+    bounds = [0] + splitx.tolist() + [len(flat_groupxs)]
+    groupxs = [flat_groupxs[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    if not flat_groupxs:
+        groupxs = []
+    return keys.tolist(), groupxs
 
 
 def apply_grouping(items, groupxs):
     r"""
     applies grouping from group_indicies
-    non-optimized version
 
     Args:
         items (list): items to group
         groupxs (list of list of ints): grouped lists of indicies
 
     SeeAlso:
-        vt.apply_grouping - optimized numpy version
         ut.group_indices
+        ut.apply_grouping_numpy - groups ndarrays into ndarrays
 
     CommandLine:
         python -m utool.util_alg --exec-apply_grouping --show
@@ -2218,6 +2599,35 @@ def apply_grouping(items, groupxs):
     return [util_list.list_take(items, xs) for xs in groupxs]
 
 
+def apply_grouping_numpy(items, groupxs):
+    r"""
+    Vectorized version of :func:`apply_grouping` for ndarrays. Each group is
+    taken with fancy indexing and returned as an ndarray.
+
+    Args:
+        items (ndarray): items to group along the first axis
+        groupxs (list of ndarrays): grouped indicies
+
+    Returns:
+        list: an ndarray for each group
+
+    SeeAlso:
+        ut.group_indices_numpy
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> import numpy as np
+        >>> items = np.array([1, 8, 5, 5, 8, 6, 7, 5, 3, 0, 9])
+        >>> keys, groupxs = group_indices_numpy(items % 3)
+        >>> grouped_items = apply_grouping_numpy(items, groupxs)
+        >>> print([group.tolist() for group in grouped_items])
+        [[6, 3, 0, 9], [1, 7], [8, 5, 5, 8, 5]]
+    """
+    items = np.asarray(items)
+    return [items.take(xs, axis=0) for xs in groupxs]
+
+
 def iapply_grouping(items, groupxs):
     r"""
     Iterates over groups from group_indicies
@@ -2248,6 +2658,38 @@ def iapply_grouping(items, groupxs):
         yield [items[x] for x in xs]
 
 
+def _ungroup_numpy(grouped_items, groupxs, maxval):
+    """
+    Scatters ndarray groups into one array. Returns None when the groups are
+    not ndarrays of one dtype or do not cover every index, in which case the
+    python path handles fill values and mixed types.
+    """
+    if not HAVE_NUMPY or len(grouped_items) == 0:
+        return None
+    if not all(isinstance(group, np.ndarray) for group in grouped_items):
+        return None
+    dtype = grouped_items[0].dtype
+    if any(group.dtype != dtype for group in grouped_items):
+        return None
+    if all(isinstance(xs, np.ndarray) for xs in groupxs):
+        flat_xs = np.concatenate(groupxs).astype(np.intp, copy=False)
+    else:
+        flat_xs = np.fromiter(itertools.chain.from_iterable(groupxs),
+                              dtype=np.intp)
+    if len(flat_xs) != maxval + 1:
+        return None
+    flat_items = np.concatenate(grouped_items, axis=0)
+    if len(flat_items) != len(flat_xs):
+        return None
+    ungrouped_arr = np.empty((maxval + 1,) + flat_items.shape[1:], dtype=dtype)
+    covered = np.zeros(maxval + 1, dtype=np.bool_)
+    covered[flat_xs] = True
+    if not covered.all():
+        return None
+    ungrouped_arr[flat_xs] = flat_items
+    return ungrouped_arr
+
+
 def ungroup(grouped_items, groupxs, maxval=None, fill=None):
     """
     Ungroups items
@@ -2263,6 +2705,10 @@ def ungroup(grouped_items, groupxs, maxval=None, fill=None):
     SeeAlso:
         vt.invert_apply_grouping
 
+    Notes:
+        When every group is an ndarray of the same dtype and the groups cover
+        every index the items are scattered with one fancy assignment.
+
     CommandLine:
         python -m utool.util_alg ungroup_unique
 
@@ -2276,11 +2722,29 @@ def ungroup(grouped_items, groupxs, maxval=None, fill=None):
         >>> result = ('ungrouped_items = %s' % (ut.repr2(ungrouped_items),))
         >>> print(result)
         ungrouped_items = [1.1, 2.1, 1.2, 3.2, 3.1, 2.2]
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> import numpy as np
+        >>> rng = np.random.RandomState(0)
+        >>> items = rng.rand(100)
+        >>> keys, groupxs = group_indices_numpy(rng.randint(0, 7, 100))
+        >>> grouped_items = apply_grouping_numpy(items, groupxs)
+        >>> assert ungroup(grouped_items, groupxs) == items.tolist()
+        >>> # missing indices use the python path and the fill value
+        >>> ungrouped = ungroup(grouped_items[1:], groupxs[1:], maxval=99)
+        >>> assert ungrouped.count(None) == len(groupxs[0])
     """
     if maxval is None:
         # Determine the number of items if unknown
-        maxpergroup = [max(xs) if len(xs) else 0 for xs in groupxs]
-        maxval = max(maxpergroup) if len(maxpergroup) else 0
+        maxpergroup = [(xs.max() if HAVE_NUMPY and isinstance(xs, np.ndarray)
+                        else max(xs)) if len(xs) else 0 for xs in groupxs]
+        maxval = int(max(maxpergroup)) if len(maxpergroup) else 0
+    ungrouped_arr = _ungroup_numpy(grouped_items, groupxs, maxval)
+    if ungrouped_arr is not None:
+        # iterating keeps the numpy scalars / rows the python path returns
+        return list(ungrouped_arr)
     # Allocate an array containing the newly flattened items
     ungrouped_items = [fill] * (maxval + 1)
     # Populate the array
@@ -2428,12 +2892,385 @@ def ungroup_unique(unique_items, groupxs, maxval=None):
     return ungrouped_items
 
 
+def time_grouping_engines(num_items=1000000, num=3, seed=0):
+    """
+    Benchmarks group_indices / apply_grouping / ungroup with the numpy engine
+    against the pure python path on group ids drawn from a few group-size
+    distributions: a few large groups, mostly singleton groups and a
+    zipf-skewed mix.
+
+    CommandLine:
+        python -m utool.util_alg time_grouping_engines
+
+    Example:
+        >>> # DISABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> results = time_grouping_engines(num_items=100000)
+    """
+    import utool as ut
+    rng = np.random.RandomState(seed)
+    distributions = [
+        ('few-large', rng.randint(0, 100, num_items)),
+        ('singletons', rng.randint(0, num_items * 10, num_items)),
+        ('zipf', rng.zipf(1.5, num_items) % num_items),
+    ]
+    items = rng.rand(num_items)
+    results = {}
+    for dist, groupids in distributions:
+        groupid_list = groupids.tolist()
+        keys, groupxs_np = group_indices_numpy(groupids)
+        _, groupxs = _group_indices_python(groupid_list)
+        grouped_np = apply_grouping_numpy(items, groupxs_np)
+        grouped = [util_list.list_take(items, xs) for xs in groupxs]
+        print('%s: %d items in %d groups' % (dist, num_items, len(keys)))
+        for label, func in [
+            ('group_indices(python)', lambda: _group_indices_python(groupid_list)),
+            ('group_indices(list)', lambda: group_indices(groupid_list)),
+            ('group_indices_numpy', lambda: group_indices_numpy(groupids)),
+            ('apply_grouping(python)', lambda: [
+                util_list.list_take(items, xs) for xs in groupxs]),
+            ('apply_grouping_numpy', lambda: apply_grouping_numpy(items, groupxs_np)),
+            ('ungroup(python)', lambda: ungroup(grouped, groupxs, num_items - 1)),
+            ('ungroup(numpy)', lambda: ungroup(grouped_np, groupxs_np, num_items - 1)),
+        ]:
+            for timer in ut.Timerit(num, verbose=0):
+                with timer:
+                    func()
+            results[(dist, label)] = timer.parent.min()
+            print('    %-24s %8.3fs' % (label, results[(dist, label)]))
+    return results
+
+
+# Rows of the distance matrix computed per task
+__EDIT_DISTANCE_BLOCK_ROWS__ = 256
+# Fewer rows than this are computed in this process
+__EDIT_DISTANCE_MIN_PARALLEL_ROWS__ = 2048
+# Patterns up to this length fit into one uint64 bit-vector
+_MYERS_WORD_SIZE = 64
+
+
+def _myers_distance(pattern, text):
+    """
+    Levenshtein distance with Myers' bit-parallel algorithm on python ints,
+    which works for any pattern length.
+    """
+    m = len(pattern)
+    if m == 0:
+        return len(text)
+    peq = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+def _encode_strings(strs):
+    """ Returns a codepoint matrix padded with zeros and the string lengths """
+    strs = [six.text_type(str_) for str_ in strs]
+    lens = np.array([len(str_) for str_ in strs], dtype=np.int64)
+    width = int(lens.max()) if len(lens) else 0
+    if width == 0:
+        return np.zeros((len(strs), 0), dtype=np.uint32), lens
+    arr = np.array(strs, dtype='U%d' % (width,))
+    codes = arr.view(np.uint32).reshape(len(strs), width)
+    return codes, lens
+
+
+def _myers_block(pattern, codes, lens):
+    """
+    Levenshtein distance of ``pattern`` (at most 64 characters) to each row
+    of the codepoint matrix ``codes`` with Myers' bit-parallel algorithm,
+    vectorized over the rows. ``lens`` must be sorted in ascending order, so
+    the rows still being scanned at column j are a suffix.
+    """
+    m = len(pattern)
+    num = len(lens)
+    if m == 0 or num == 0:
+        return lens.copy()
+    width = int(lens[-1])
+    codes = codes[:, :width]
+    eq_mat = np.zeros(codes.shape, dtype=np.uint64)
+    peq = {}
+    for i, ch in enumerate(pattern):
+        peq[ord(ch)] = peq.get(ord(ch), 0) | (1 << i)
+    for code, mask in peq.items():
+        np.bitwise_or(eq_mat, np.uint64(mask), out=eq_mat, where=codes == code)
+    full = np.uint64((1 << m) - 1)
+    high = np.uint64(1 << (m - 1))
+    one = np.uint64(1)
+    pv = np.full(num, full, dtype=np.uint64)
+    mv = np.zeros(num, dtype=np.uint64)
+    score = np.full(num, m, dtype=np.int64)
+    starts = np.searchsorted(lens, np.arange(width), side='right')
+    for j in range(width):
+        x = starts[j]
+        eq = eq_mat[x:, j]
+        pv_, mv_ = pv[x:], mv[x:]
+        xv = eq | mv_
+        xh = (((eq & pv_) + pv_) ^ pv_) | eq
+        ph = mv_ | (~(xh | pv_) & full)
+        mh = pv_ & xh
+        score[x:] += (ph & high).astype(np.bool_)
+        score[x:] -= (mh & high).astype(np.bool_)
+        ph = ((ph << one) | one) & full
+        mh = (mh << one) & full
+        pv[x:] = mh | (~(xv | ph) & full)
+        mv[x:] = ph & xv
+    return score
+
+
+def _edit_distance_row(pattern, col_strs, col_codes, col_lens):
+    """ Distances from pattern to columns that are sorted by length """
+    if len(pattern) <= _MYERS_WORD_SIZE:
+        return _myers_block(pattern, col_codes, col_lens)
+    return np.array([_myers_distance(pattern, str_) for str_ in col_strs],
+                    dtype=np.int64)
+
+
+def _edit_distance_block_worker(row_start, row_strs, col_strs, col_codes,
+                                col_lens, col_order, max_dist, sparse,
+                                upper_only):
+    """
+    Computes the rows ``row_start:row_start + len(row_strs)``.
+
+    Columns are sorted by length, so the columns within max_dist of the
+    pattern length form one slice and all other columns are skipped.
+
+    Returns:
+        tuple: (row_start, block) for dense output or (idx1, idx2, dists)
+            for sparse output
+    """
+    num_cols = len(col_lens)
+    if sparse:
+        idx1_list, idx2_list, dist_list = [], [], []
+    else:
+        # without max_dist every entry is overwritten
+        fill = -1 if max_dist is None else max_dist + 1
+        block = np.full((len(row_strs), num_cols), fill, dtype=np.int32)
+    for rx, pattern in enumerate(row_strs):
+        m = len(pattern)
+        if max_dist is None:
+            lo, hi = 0, num_cols
+        else:
+            lo = np.searchsorted(col_lens, m - max_dist, side='left')
+            hi = np.searchsorted(col_lens, m + max_dist, side='right')
+        colxs = col_order[lo:hi]
+        sel = slice(lo, hi)
+        if upper_only:
+            # symmetric input: only pairs with i < j
+            keep = colxs > row_start + rx
+            colxs = colxs[keep]
+            sel = np.arange(lo, hi)[keep]
+        col_strs_ = (col_strs[lo:hi] if isinstance(sel, slice) else
+                     [col_strs[x] for x in sel])
+        dists = _edit_distance_row(pattern, col_strs_, col_codes[sel],
+                                   col_lens[sel])
+        if max_dist is not None:
+            dists = np.minimum(dists, max_dist + 1)
+        if sparse:
+            flags = dists <= max_dist
+            idx2_list.append(colxs[flags])
+            dist_list.append(dists[flags])
+            idx1_list.append(np.full(len(idx2_list[-1]), row_start + rx,
+                                     dtype=np.int64))
+        else:
+            block[rx, colxs] = dists
+    if sparse:
+        if not idx1_list:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty.astype(np.int32)
+        return (np.hstack(idx1_list), np.hstack(idx2_list),
+                np.hstack(dist_list).astype(np.int32))
+    return row_start, block
+
+
+def iter_edit_distance_blocks(strs1, strs2=None, max_dist=None, sparse=False,
+                              nprocs=None, block_rows=None):
+    r"""
+    Streams the pairwise Levenshtein distances between ``strs1`` and
+    ``strs2`` one block of rows at a time, so only a few blocks are held in
+    memory regardless of the number of pairs.
+
+    Each pattern of at most 64 characters is compared against all columns
+    at once with Myers' bit-parallel algorithm in numpy. Longer patterns use
+    the same algorithm on python ints. With ``max_dist`` the columns whose
+    length differs from the pattern by more than max_dist are never compared.
+    Blocks are computed in a process pool when there are many rows.
+
+    Args:
+        strs1 (list): row strings
+        strs2 (list): column strings. If None, strs1 is compared with itself
+            and the sparse output only contains pairs with i < j.
+        max_dist (int): distances above this are reported as max_dist + 1
+            (dense) or dropped (sparse)
+        sparse (bool): yield (idx1, idx2, dists) arrays of the pairs within
+            max_dist instead of (row_start, block) dense blocks
+        nprocs (int): number of processes (default = auto)
+        block_rows (int): rows per task (default = __EDIT_DISTANCE_BLOCK_ROWS__)
+
+    Yields:
+        tuple: (row_start, block) or (idx1, idx2, dists)
+
+    CommandLine:
+        python -m utool.util_alg iter_edit_distance_blocks
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> strs = ['kitten', 'sitting', 'mitten', 'fitting', 'kit']
+        >>> blocks = list(iter_edit_distance_blocks(strs, block_rows=2))
+        >>> print([row_start for row_start, block in blocks])
+        >>> print(blocks[0][1].tolist())
+        [0, 2, 4]
+        [[0, 3, 1, 3, 3], [3, 0, 3, 1, 5]]
+    """
+    from utool import util_parallel
+    if max_dist is None and sparse:
+        raise ValueError('sparse output requires max_dist')
+    if block_rows is None:
+        block_rows = __EDIT_DISTANCE_BLOCK_ROWS__
+    symmetric = strs2 is None
+    strs1 = list(strs1)
+    strs2 = strs1 if symmetric else list(strs2)
+    lens2 = np.array([len(str_) for str_ in strs2], dtype=np.int64)
+    col_order = lens2.argsort(kind='mergesort')
+    col_strs = [strs2[x] for x in col_order]
+    col_codes, col_lens = _encode_strings(col_strs)
+    upper_only = symmetric and sparse
+    if nprocs is None and len(strs1) < __EDIT_DISTANCE_MIN_PARALLEL_ROWS__:
+        nprocs = 1
+    row_starts = list(range(0, len(strs1), block_rows))
+    args_gen = ((row_start, strs1[row_start:row_start + block_rows], col_strs,
+                 col_codes, col_lens, col_order, max_dist, sparse, upper_only)
+                for row_start in row_starts)
+    for result in util_parallel.generate2(
+            _edit_distance_block_worker, args_gen, ntasks=len(row_starts),
+            ordered=True, stream=True, nprocs=nprocs,
+            force_serial=nprocs == 1, verbose=False):
+        yield result
+
+
+def edit_distance_matrix(strs1, strs2=None, max_dist=None, nprocs=None,
+                         block_rows=None, out=None):
+    r"""
+    Dense matrix of pairwise Levenshtein distances.
+
+    Args:
+        strs1 (list): row strings
+        strs2 (list): column strings (default = strs1)
+        max_dist (int): pairs whose distance is above max_dist are pruned
+            and reported as max_dist + 1
+        nprocs (int): number of processes (default = auto)
+        block_rows (int): rows per task
+        out (ndarray): preallocated (len(strs1), len(strs2)) array to write
+            into, e.g. a ``np.memmap`` to keep memory bounded
+
+    Returns:
+        ndarray: distmat
+
+    SeeAlso:
+        ut.iter_edit_distance_blocks
+        ut.edit_distance_pairs
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> strs1 = ['hello world', 'kitten']
+        >>> strs2 = ['goodbye world', 'rofl', 'hello', 'world', 'lowo', '']
+        >>> print(edit_distance_matrix(strs1, strs2).tolist())
+        [[7, 9, 6, 6, 7, 11], [12, 6, 6, 6, 6, 6]]
+        >>> print(edit_distance_matrix(strs1, strs2, max_dist=6).tolist())
+        [[7, 7, 6, 6, 7, 7], [7, 6, 6, 6, 6, 6]]
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> import numpy as np
+        >>> rng = np.random.RandomState(0)
+        >>> strs = [''.join(rng.choice(list('abc'), rng.randint(0, 80)))
+        >>>         for _ in range(30)]
+        >>> distmat = edit_distance_matrix(strs, block_rows=7)
+        >>> expected = [[_myers_distance(s1, s2) for s2 in strs] for s1 in strs]
+        >>> assert distmat.tolist() == expected
+        >>> assert _myers_distance('kitten', 'sitting') == 3
+    """
+    strs1 = list(strs1)
+    num_cols = len(strs1) if strs2 is None else len(strs2)
+    if out is None:
+        out = np.empty((len(strs1), num_cols), dtype=np.int32)
+    for row_start, block in iter_edit_distance_blocks(
+            strs1, strs2, max_dist=max_dist, nprocs=nprocs,
+            block_rows=block_rows):
+        out[row_start:row_start + len(block)] = block
+    return out
+
+
+def edit_distance_pairs(strs1, strs2=None, max_dist=1, nprocs=None,
+                        block_rows=None):
+    r"""
+    Sparse pairs of strings whose Levenshtein distance is at most max_dist.
+
+    Args:
+        strs1 (list): row strings
+        strs2 (list): column strings. If None, pairs (i, j) of strs1 with
+            i < j are returned.
+        max_dist (int): distance threshold
+        nprocs (int): number of processes (default = auto)
+        block_rows (int): rows per task
+
+    Returns:
+        tuple: (idx1, idx2, dists) arrays
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> names = ['jon smith', 'john smith', 'jane smyth', 'jon smith', 'x']
+        >>> idx1, idx2, dists = edit_distance_pairs(names, max_dist=2)
+        >>> print(list(zip(idx1.tolist(), idx2.tolist(), dists.tolist())))
+        [(0, 1, 1), (0, 3, 0), (1, 3, 1)]
+    """
+    idx1_list, idx2_list, dist_list = [], [], []
+    for idx1, idx2, dists in iter_edit_distance_blocks(
+            strs1, strs2, max_dist=max_dist, sparse=True, nprocs=nprocs,
+            block_rows=block_rows):
+        idx1_list.append(idx1)
+        idx2_list.append(idx2)
+        dist_list.append(dists)
+    if not idx1_list:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty.astype(np.int32)
+    idx1 = np.hstack(idx1_list)
+    idx2 = np.hstack(idx2_list)
+    dists = np.hstack(dist_list)
+    # blocks are in row order, sort the columns within each row
+    sortx = np.lexsort((idx2, idx1))
+    return idx1[sortx], idx2[sortx], dists[sortx]
+
+
 def edit_distance(string1, string2):
     """
     Edit distance algorithm. String1 and string2 can be either
     strings or lists of strings
 
-    pip install python-Levenshtein
+    Uses :func:`edit_distance_matrix` when numpy is available. Otherwise it
+    uses python-Levenshtein if installed or a pure python bit-parallel
+    implementation.
 
     Args:
         string1 (str or list):
@@ -2443,39 +3280,36 @@ def edit_distance(string1, string2):
         python -m utool.util_alg edit_distance --show
 
     Example:
-        >>> # DISABLE_DOCTEST
+        >>> # ENABLE_DOCTEST
         >>> from utool.util_alg import *  # NOQA
         >>> import utool as ut
         >>> string1 = 'hello world'
         >>> string2 = ['goodbye world', 'rofl', 'hello', 'world', 'lowo']
-        >>> edit_distance(['hello', 'one'], ['goodbye', 'two'])
-        >>> edit_distance('hello', ['goodbye', 'two'])
-        >>> edit_distance(['hello', 'one'], 'goodbye')
-        >>> edit_distance('hello', 'goodbye')
+        >>> assert edit_distance(['hello', 'one'], ['goodbye', 'two']) == [[7, 4], [5, 3]]
+        >>> assert edit_distance('hello', ['goodbye', 'two']) == [7, 4]
+        >>> assert edit_distance(['hello', 'one'], 'goodbye') == [7, 5]
+        >>> assert edit_distance('hello', 'goodbye') == 7
         >>> distmat = edit_distance(string1, string2)
         >>> result = ('distmat = %s' % (ut.repr2(distmat),))
         >>> print(result)
-        >>> [7, 9, 6, 6, 7]
+        distmat = [7, 9, 6, 6, 7]
     """
-
-    import utool as ut
-    try:
-        import Levenshtein
-    except ImportError as ex:
-        ut.printex(ex, 'pip install python-Levenshtein')
-        raise
-    #np.vectorize(Levenshtein.distance, [int])
-    #vec_lev = np.frompyfunc(Levenshtein.distance, 2, 1)
-    #return vec_lev(string1, string2)
     import utool as ut
     isiter1 = ut.isiterable(string1)
     isiter2 = ut.isiterable(string2)
     strs1 = string1 if isiter1 else [string1]
     strs2 = string2 if isiter2 else [string2]
-    distmat = [
-        [Levenshtein.distance(str1, str2) for str2 in strs2]
-        for str1 in strs1
-    ]
+    if HAVE_NUMPY:
+        distmat = edit_distance_matrix(strs1, strs2).tolist()
+    else:
+        try:
+            from Levenshtein import distance
+        except ImportError:
+            distance = _myers_distance
+        distmat = [
+            [distance(str1, str2) for str2 in strs2]
+            for str1 in strs1
+        ]
     # broadcast
     if not isiter2:
         distmat = ut.take_column(distmat, 0)
@@ -2484,6 +3318,56 @@ def edit_distance(string1, string2):
     return distmat
 
 
+def time_edit_distance_engines(num_strs=2000, max_dist=2, num=1, seed=0):
+    """
+    Benchmarks the all-pairs distances of ``num_strs`` random name-like
+    strings: a python loop over python-Levenshtein (if installed) and over
+    the pure python bit-parallel distance, against edit_distance_matrix and
+    the pruned edit_distance_pairs.
+
+    CommandLine:
+        python -m utool.util_alg time_edit_distance_engines
+
+    Example:
+        >>> # DISABLE_DOCTEST
+        >>> from utool.util_alg import *  # NOQA
+        >>> results = time_edit_distance_engines(num_strs=1000)
+    """
+    import utool as ut
+    rng = np.random.RandomState(seed)
+    alphabet = list('abcdefghijklmnopqrstuvwxyz ')
+    strs = [''.join(rng.choice(alphabet, rng.randint(4, 24)))
+            for _ in range(num_strs)]
+    engines = []
+    try:
+        from Levenshtein import distance
+    except ImportError:
+        pass
+    else:
+        engines.append(('Levenshtein loop', lambda: [
+            [distance(s1, s2) for s2 in strs] for s1 in strs]))
+    # the pure python loop is slow, time it on a slice and extrapolate
+    sub = strs[0:max(1, num_strs // 20)]
+    engines += [
+        ('python myers loop', lambda: [
+            [_myers_distance(s1, s2) for s2 in strs] for s1 in sub]),
+        ('edit_distance_matrix', lambda: edit_distance_matrix(strs)),
+        ('edit_distance_pairs', lambda: edit_distance_pairs(
+            strs, max_dist=max_dist)),
+    ]
+    results = {}
+    for label, func in engines:
+        for timer in ut.Timerit(num, verbose=0):
+            with timer:
+                func()
+        seconds = timer.parent.min()
+        if label == 'python myers loop':
+            seconds *= float(num_strs) / len(sub)
+        results[label] = seconds
+        print('%-22s %8.3fs  (%d pairs)' % (label, seconds, num_strs ** 2))
+    return results
+
+
 def get_nth_bell_number(n):
     """
     Returns the (num_items - 1)-th Bell number using recursion.
@@ -76,6 +76,99 @@ def _register_arg(argstr_list, type_, default, help_):
     __REGISTERED_ARGS__.append((argstr_list, type_, default, help_))
 
 
+class _ArgvIndex(object):
+    """
+    Parsed view of a command line (plus the UTOOL_* environment variables)
+    that lets get_argflag and get_argval find their flags without scanning
+    the whole vector on every call.
+
+    Attributes:
+        flag_items (set): argv items plus flags enabled by the environment
+        val_argv (list): argv plus (key, val) pairs taken from the environment
+        exact_pos (dict): maps an item in val_argv to its positions
+        equal_pos (dict): maps the part of a ``--key=val`` item before the
+            first ``=`` to its positions
+    """
+    def __init__(self, argv, environ):
+        flag_extra = []
+        val_extra = []
+        sentinal = 'UTOOL_'
+        for key, val in environ.items():
+            key = key.upper()
+            if key.startswith(sentinal):
+                key = key[len(sentinal):]
+                if val.upper() in ['TRUE', 'ON']:
+                    flag_extra.append('--' + key.lower().replace('_', '-'))
+                elif val.upper() not in ['FALSE', 'OFF']:
+                    val_extra.extend(['--' + key.lower(), val])
+        self.flag_extra = flag_extra
+        self.val_extra = val_extra
+        self.flag_items = set(argv).union(flag_extra)
+        self.val_argv = list(argv) + val_extra
+        self.exact_pos = {}
+        self.equal_pos = {}
+        for argx, item in enumerate(self.val_argv):
+            self.exact_pos.setdefault(item, []).append(argx)
+            eqx = item.find('=')
+            if eqx >= 0:
+                self.equal_pos.setdefault(item[:eqx], []).append(argx)
+
+    def candidate_positions(self, argstr_list):
+        """
+        Returns the sorted positions in val_argv that are equal to an argstr
+        or start with ``argstr + '='``.
+        """
+        if any('=' in argstr for argstr in argstr_list):
+            return list(range(len(self.val_argv)))
+        candidates = set([])
+        for argstr in argstr_list:
+            candidates.update(self.exact_pos.get(argstr, []))
+            candidates.update(self.equal_pos.get(argstr, []))
+        return sorted(candidates)
+
+
+__ARGV_INDEX_CACHE__ = {'key': None, 'argv': None, 'index': None}
+
+
+def reset_argv_index():
+    """
+    forces the index used by get_argflag / get_argval to be rebuilt. Only
+    needed if sys.argv is modified in place without changing its length.
+    """
+    __ARGV_INDEX_CACHE__.update(key=None, argv=None, index=None)
+
+
+def _get_argv_index(argv=None):
+    """
+    Returns the _ArgvIndex of sys.argv, which is rebuilt only when the
+    identity or length of sys.argv (or the size of os.environ) changes.
+    Custom argument vectors are indexed on each call.
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_arg import *  # NOQA
+        >>> from utool.util_arg import _get_argv_index
+        >>> index1 = _get_argv_index()
+        >>> assert _get_argv_index() is index1
+        >>> sys.argv.append('--argv-index-test=3')
+        >>> index2 = _get_argv_index()
+        >>> sys.argv.remove('--argv-index-test=3')
+        >>> assert index2 is not index1
+        >>> index3 = _get_argv_index(['--spam', 'eggs', '--ans=42', '--spam'])
+        >>> print(index3.candidate_positions(['--spam', '--ans'])[0:3])
+        [0, 2, 3]
+    """
+    if argv is not None and argv is not sys.argv:
+        return _ArgvIndex(argv, os.environ)
+    argv = sys.argv
+    key = (id(argv), len(argv), len(os.environ))
+    cache = __ARGV_INDEX_CACHE__
+    if cache['key'] != key or cache['argv'] is not argv:
+        # keep a reference to argv so its id cannot be reused
+        cache.update(key=key, argv=argv, index=_ArgvIndex(argv, os.environ))
+    return cache['index']
+
+
 def autogen_argparse_block(extra_args=[]):
     """
     SHOULD TURN ANY REGISTERED ARGS INTO A A NEW PARSING CONFIG
@@ -169,8 +262,6 @@ def get_argflag(argstr_, default=False, help_='', return_specified=None,
         >>> result = ('(parsed_val, was_specified) = %s' % (str((parsed_val, was_specified)),))
         >>> print(result)
     """
-    if argv is None:
-        argv = sys.argv
     assert isinstance(default, bool), 'default must be boolean'
     argstr_list = meta_util_iter.ensure_iterable(argstr_)
     #if VERYVERBOSE:
@@ -184,30 +275,15 @@ def get_argflag(argstr_, default=False, help_='', return_specified=None,
         debug = DEBUG
 
     # Check environment variables for default as well as argv
-    import os
     #"""
     #set UTOOL_NOCNN=True
     #export UTOOL_NOCNN True
     #"""
-    #argv_orig = argv[:]
-    # HACK: make this not happen very time you loop
-    for key, val in os.environ.items():
-        key = key.upper()
-        sentinal = 'UTOOL_'
-        if key.startswith(sentinal):
-            flag = '--' + key[len(sentinal):].lower().replace('_', '-')
-            if val.upper() in ['TRUE', 'ON']:
-                pass
-            elif val.upper() in ['FALSE', 'OFF']:
-                continue
-            else:
-                continue
-                #flag += '=False'
-            new_argv = [flag]
-            argv = argv[:] + new_argv
-            if debug:
-                print('ENV SPECIFIED COMMAND LINE')
-                print('argv.extend(new_argv=%r)' % (new_argv,))
+    argv_index = _get_argv_index(argv)
+    flag_items = argv_index.flag_items
+    if debug and argv_index.flag_extra:
+        print('ENV SPECIFIED COMMAND LINE')
+        print('argv.extend(new_argv=%r)' % (argv_index.flag_extra,))
 
     for argstr in argstr_list:
         #if VERYVERBOSE:
@@ -216,30 +292,30 @@ def get_argflag(argstr_, default=False, help_='', return_specified=None,
             raise AssertionError('Invalid argstr: %r' % (argstr,))
         if not need_prefix:
             noprefix = argstr.replace('--', '')
-            if noprefix in argv:
+            if noprefix in flag_items:
                 parsed_val = True
                 was_specified = True
                 break
         #if argstr.find('--no') == 0:
             #argstr = argstr.replace('--no', '--')
         noarg = argstr.replace('--', '--no')
-        if argstr in argv:
+        if argstr in flag_items:
             parsed_val = True
             was_specified = True
             #if VERYVERBOSE:
             #    print('[util_arg]   * ...WAS_SPECIFIED. AND PARSED')
             break
-        elif noarg in argv:
+        elif noarg in flag_items:
             parsed_val = False
             was_specified = True
             #if VERYVERBOSE:
             #    print('[util_arg]   * ...WAS_SPECIFIED. AND NOT PARSED')
             break
-        elif argstr + '=True' in argv:
+        elif argstr + '=True' in flag_items:
             parsed_val = True
             was_specified = True
             break
-        elif argstr + '=False' in argv:
+        elif argstr + '=False' in flag_items:
             parsed_val = False
             was_specified = True
             break
@@ -414,26 +490,17 @@ def get_argval(argstr_, type_=None, default=None, help_=None, smartcast=True,
             argstr_list = argstr_list2
 
         # Check environment variables for default as well as argv
-        import os
         """
         set UTOOL_NOCNN=True
         export UTOOL_NOCNN True
         """
-        #argv_orig = argv[:]
-        for key, val in os.environ.items():
-            key = key.upper()
-            sentinal = 'UTOOL_'
-            if key.startswith(sentinal):
-                key = '--' + key[len(sentinal):].lower()
-                new_argv = [key, val]
-                if val.upper() in ['TRUE', 'FALSE', 'ON', 'OFF']:
-                    # handled by get_argflag
-                    continue
-                argv = argv[:] + new_argv
-                if debug:
-                    print('argv.extend(new_argv=%r)' % (new_argv,))
+        argv_index = _get_argv_index(argv)
+        argv = argv_index.val_argv
+        if debug and argv_index.val_extra:
+            print('argv.extend(new_argv=%r)' % (argv_index.val_extra,))
 
-        for argx, item in enumerate(argv):
+        for argx in argv_index.candidate_positions(argstr_list):
+            item = argv[argx]
             for argstr in argstr_list:
                 if item == argstr:
                     if type_ is bool:
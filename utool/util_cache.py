@@ -8,16 +8,22 @@ import six
 import uuid
 import json
 import codecs
+import array
+import hashlib
 import os
+import fnmatch
+import threading
+import time
+import weakref
 #import lru
 #git+https://github.com/amitdev/lru-dict
-#import atexit
+import atexit
 #import inspect
 import contextlib
 import collections
 from six.moves import cPickle as pickle
 from six.moves import range, zip
-from os.path import join, normpath, basename, exists
+from os.path import join, normpath, basename, exists, dirname, splitext
 from functools import partial
 from itertools import chain
 import zipfile
@@ -34,6 +40,7 @@ from utool import util_class
 from utool import util_type
 from utool import util_decor  # NOQA
 from utool import util_dict
+from utool import util_time
 from utool._internal import meta_util_constants
 print, rrr, profile = util_inject.inject2(__name__)
 
@@ -207,12 +214,813 @@ def _args2_fpath(dpath, fname, cfgstr, ext):
     return fpath
 
 
+# Magic bytes of the protocol 5 container written by _save_pkl5
+_PKL5_MAGIC = b'UTPKL5\x00\x01'
+# Buffers in the protocol 5 container start at multiples of this
+_PKL5_ALIGN = 64
+_NPZ_META_KEY = '__utool_meta__'
+# Arrays at least this large are stored as memory mapped .npy files by the
+# '.lazy.pkl' backend
+__LAZY_MIN_NBYTES__ = 2 ** 20
+__CACHE_BACKENDS__ = {}
+
+
+def register_cache_backend(ext, save_func, load_func, atomic=False,
+                           companions_func=None):
+    """
+    Registers the functions the cache layer uses to write and read files
+    ending with ext. The longest matching registered suffix wins, so
+    compound extensions like '.pkl5.zst' are supported.
+
+    Args:
+        ext (str): file extension including the dot
+        save_func (func): called as save_func(fpath, data)
+        load_func (func): called as load_func(fpath) and returns data
+        atomic (bool): if True save_func replaces fpath atomically itself and
+            returns the list of companion files it wrote next to fpath.
+            Otherwise the cache layer writes to a temporary file and renames
+            it. (default = False)
+        companions_func (func): called as companions_func(fpath) and returns
+            the companion files of an existing file, which are deleted with
+            it. (default = None)
+
+    CommandLine:
+        python -m utool.util_cache register_cache_backend
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_cache import *  # NOQA
+        >>> import utool as ut
+        >>> import numpy as np
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_cache_backends')
+        >>> data = {'vecs': np.arange(1000, dtype=np.float32).reshape(100, 10),
+        >>>         'names': ['a', 'b'], 'ax2_score': {1: np.ones(3)}}
+        >>> for ext in ['.cPkl', '.pkl5', '.cache.npz']:
+        >>>     fpath = save_cache(dpath, 'backend', 'test', data, ext=ext, verbose=False)
+        >>>     data2 = load_cache(dpath, 'backend', 'test', ext=ext, verbose=False)
+        >>>     assert np.all(data2['vecs'] == data['vecs'])
+        >>>     assert data2['vecs'].flags.writeable
+        >>>     assert data2['names'] == data['names']
+        >>>     assert np.all(data2['ax2_score'][1] == 1)
+        >>> ut.delete(dpath, verbose=False)
+    """
+    if len(ext) == 0 or ext[0] != '.':
+        raise ValueError('Please be explicit and use a dot in ext')
+    __CACHE_BACKENDS__[ext] = {
+        'save': save_func,
+        'load': load_func,
+        'atomic': atomic,
+        'companions': companions_func,
+    }
+
+
+def _get_cache_backend(fpath):
+    """ Returns the registered backend of fpath or None """
+    fname = basename(fpath)
+    best = None
+    for ext in __CACHE_BACKENDS__:
+        if fname.endswith(ext) and (best is None or len(ext) > len(best)):
+            best = ext
+    return None if best is None else __CACHE_BACKENDS__[best]
+
+
+def _dumps_pkl5(data):
+    """
+    Serializes data into a protocol 5 container. Large contiguous buffers
+    (e.g. ndarray data) are written out-of-band after the pickle stream
+    instead of being copied into it.
+    """
+    import struct
+    buffers = []
+    if pickle.HIGHEST_PROTOCOL >= 5:
+        stream = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+        raw_list = [buf.raw() for buf in buffers]
+    else:
+        stream = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        raw_list = []
+    header = struct.pack('<QQ', len(stream), len(raw_list))
+    header += struct.pack('<%dQ' % len(raw_list), *[raw.nbytes for raw in raw_list])
+    parts = [_PKL5_MAGIC, header, stream]
+    offset = sum(map(len, parts))
+    for raw in raw_list:
+        pad = (-offset) % _PKL5_ALIGN
+        parts.append(b'\x00' * pad)
+        parts.append(raw)
+        offset += pad + raw.nbytes
+    return parts
+
+
+def _loads_pkl5(blob):
+    """ Inverse of _dumps_pkl5. Arrays are views into blob. """
+    import struct
+    view = memoryview(blob)
+    if bytes(view[0:len(_PKL5_MAGIC)]) != _PKL5_MAGIC:
+        raise IOError('not a utool protocol 5 cache file')
+    offset = len(_PKL5_MAGIC)
+    stream_nbytes, num = struct.unpack_from('<QQ', blob, offset)
+    offset += 16
+    sizes = struct.unpack_from('<%dQ' % num, blob, offset)
+    offset += 8 * num
+    stream = view[offset:offset + stream_nbytes]
+    offset += stream_nbytes
+    buffers = []
+    for nbytes in sizes:
+        offset += (-offset) % _PKL5_ALIGN
+        buffers.append(view[offset:offset + nbytes])
+        offset += nbytes
+    if num:
+        return pickle.loads(stream, buffers=buffers)
+    return pickle.loads(stream)
+
+
+def _save_pkl5(fpath, data):
+    with open(fpath, 'wb') as file_:
+        for part in _dumps_pkl5(data):
+            file_.write(part)
+
+
+def _load_pkl5(fpath):
+    nbytes = os.path.getsize(fpath)
+    # read into a writable buffer so loaded arrays are writable
+    blob = bytearray(nbytes)
+    with open(fpath, 'rb') as file_:
+        file_.readinto(blob)
+    return _loads_pkl5(blob)
+
+
+def _get_codec(codec):
+    """ Returns (compress, decompress) for an optional compression library """
+    if codec == 'lz4':
+        try:
+            import lz4.frame
+        except ImportError:
+            raise ImportError('the .lz4 cache backend requires the lz4 package')
+        return lz4.frame.compress, lz4.frame.decompress
+    elif codec == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('the .zst cache backend requires the zstandard package')
+        def _decompress(blob):
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return zstandard.ZstdCompressor(level=3).compress, _decompress
+    else:
+        raise ValueError('unknown codec=%r' % (codec,))
+
+
+def _make_compressed_pkl5_backend(codec):
+    def _save(fpath, data):
+        compress = _get_codec(codec)[0]
+        with open(fpath, 'wb') as file_:
+            file_.write(compress(b''.join(_dumps_pkl5(data))))
+
+    def _load(fpath):
+        decompress = _get_codec(codec)[1]
+        with open(fpath, 'rb') as file_:
+            blob = bytearray(decompress(file_.read()))
+        return _loads_pkl5(blob)
+    return _save, _load
+
+
+def _is_plain_ndarray(val):
+    return (util_type.HAVE_NUMPY and isinstance(val, util_type.np.ndarray) and
+            not val.dtype.hasobject)
+
+
+def _save_cache_npz(fpath, data):
+    """
+    Writes the ndarray members of a dict as uncompressed npz members. All
+    other members are pickled into one extra member.
+    """
+    np = util_type.np
+    if isinstance(data, dict) and all(isinstance(key, six.string_types)
+                                      for key in data.keys()):
+        arrays = {key: val for key, val in six.iteritems(data)
+                  if _is_plain_ndarray(val) and key != _NPZ_META_KEY}
+        meta = (True, {key: val for key, val in six.iteritems(data)
+                       if key not in arrays})
+    else:
+        arrays = {}
+        meta = (False, data)
+    meta_bytes = pickle.dumps(meta, protocol=pickle.HIGHEST_PROTOCOL)
+    arrays[_NPZ_META_KEY] = np.frombuffer(meta_bytes, dtype=np.uint8)
+    with open(fpath, 'wb') as file_:
+        np.savez(file_, **arrays)
+
+
+def _load_cache_npz(fpath):
+    np = util_type.np
+    with np.load(fpath, allow_pickle=False) as npz:
+        is_dict, meta = pickle.loads(npz[_NPZ_META_KEY].tobytes())
+        if not is_dict:
+            return meta
+        data = meta
+        for key in npz.files:
+            if key != _NPZ_META_KEY:
+                data[key] = npz[key]
+    return data
+
+
+class _LazyPickler(pickle.Pickler):
+    """
+    Pickler that writes large ndarrays to separate .npy files and leaves a
+    persistent reference to them in the pickle stream.
+    """
+    def __init__(self, file_, sidecar_fmt, min_nbytes):
+        pickle.Pickler.__init__(self, file_, protocol=pickle.HIGHEST_PROTOCOL)
+        self.sidecar_fmt = sidecar_fmt
+        self.min_nbytes = min_nbytes
+        self.sidecar_fpaths = []
+
+    def persistent_id(self, obj):
+        if (type(obj) is util_type.np.ndarray or
+             isinstance(obj, util_type.np.memmap)):
+            if not obj.dtype.hasobject and obj.nbytes >= self.min_nbytes:
+                sidecar_fpath = self.sidecar_fmt % (len(self.sidecar_fpaths),)
+                util_type.np.save(sidecar_fpath, obj)
+                self.sidecar_fpaths.append(sidecar_fpath)
+                return ('npy', basename(sidecar_fpath))
+        return None
+
+
+class _LazyUnpickler(pickle.Unpickler):
+    """ Loads the .npy references written by _LazyPickler as memmaps """
+    def __init__(self, file_, dpath):
+        pickle.Unpickler.__init__(self, file_)
+        self.dpath = dpath
+
+    def persistent_load(self, pid):
+        kind, fname = pid
+        if kind != 'npy':
+            raise pickle.UnpicklingError('unknown persistent id %r' % (pid,))
+        # copy-on-write keeps the arrays writable without touching the file
+        return util_type.np.load(join(self.dpath, fname), mmap_mode='c')
+
+
+def _read_lazy_header(file_):
+    header = pickle.load(file_)
+    if not isinstance(header, dict) or header.get('kind') != 'utool_lazy':
+        raise IOError('not a utool lazy cache file')
+    return header
+
+
+def _lazy_companions(fpath):
+    """ the .npy files referenced by an existing lazy cache file """
+    try:
+        with open(fpath, 'rb') as file_:
+            header = _read_lazy_header(file_)
+    except (IOError, OSError, EOFError, pickle.UnpicklingError):
+        return []
+    dpath = dirname(fpath)
+    return [join(dpath, fname) for fname in header['sidecars']]
+
+
+def _save_cache_lazy(fpath, data, min_nbytes=None):
+    """
+    Pickles data but writes every ndarray of at least min_nbytes bytes to a
+    hidden .npy file next to fpath. The sidecars are unique per save, so a
+    reader never sees a mix of old and new arrays. The sidecars of the
+    replaced version are deleted after the rename.
+
+    Returns:
+        list: the written sidecar paths
+    """
+    if min_nbytes is None:
+        min_nbytes = __LAZY_MIN_NBYTES__
+    dpath, fname = dirname(fpath), basename(fpath)
+    token = uuid.uuid4().hex[0:8]
+    sidecar_fmt = join(dpath, '.%s.%s.%%d.npy' % (fname, token))
+    old_sidecars = _lazy_companions(fpath) if exists(fpath) else []
+    payload_file = six.BytesIO()
+    pickler = _LazyPickler(payload_file, sidecar_fmt, min_nbytes)
+    temp_fpath = _temp_fpath(fpath)
+    try:
+        pickler.dump(data)
+        header = {
+            'kind': 'utool_lazy',
+            'sidecars': [basename(x) for x in pickler.sidecar_fpaths],
+        }
+        with open(temp_fpath, 'wb') as file_:
+            pickle.dump(header, file_, protocol=pickle.HIGHEST_PROTOCOL)
+            file_.write(payload_file.getvalue())
+        _atomic_rename(temp_fpath, fpath)
+    except BaseException:
+        for fpath_ in pickler.sidecar_fpaths + [temp_fpath]:
+            if exists(fpath_):
+                os.remove(fpath_)
+        raise
+    for old_fpath in old_sidecars:
+        try:
+            os.remove(old_fpath)
+        except OSError:
+            pass
+    return pickler.sidecar_fpaths
+
+
+def _load_cache_lazy(fpath):
+    """
+    Loads a file written by _save_cache_lazy. Large arrays come back as
+    copy-on-write np.memmap objects, so only the pages that are touched are
+    read from disk.
+
+    CommandLine:
+        python -m utool.util_cache _load_cache_lazy
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_cache import *  # NOQA
+        >>> from utool.util_cache import _load_cache_lazy
+        >>> import utool as ut
+        >>> import numpy as np
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_cache_lazy')
+        >>> ut.delete(dpath, verbose=False)
+        >>> ut.ensuredir(dpath)
+        >>> data = {'big': np.arange(2 ** 18, dtype=np.float64),
+        >>>         'small': np.arange(10), 'cfgstr': 'foo'}
+        >>> fpath = save_cache(dpath, 'lazy_', 'a', data, ext='.lazy.pkl')
+        >>> data2 = _load_cache_lazy(fpath)
+        >>> assert isinstance(data2['big'], np.memmap)
+        >>> assert not isinstance(data2['small'], np.memmap)
+        >>> assert data2['big'][5] == 5 and data2['cfgstr'] == 'foo'
+        >>> data2['big'][5] = -1  # copy-on-write does not change the file
+        >>> assert _load_cache_lazy(fpath)['big'][5] == 5
+        >>> # overwriting replaces the sidecar of the old version
+        >>> fpath = save_cache(dpath, 'lazy_', 'a', data, ext='.lazy.pkl')
+        >>> print(len(os.listdir(dpath)))
+        2
+        >>> del data2
+        >>> ut.delete(dpath, verbose=False)
+    """
+    with open(fpath, 'rb') as file_:
+        _read_lazy_header(file_)
+        return _LazyUnpickler(file_, dirname(fpath)).load()
+
+
+def _save_cache_data(fpath, data, **kwargs):
+    backend = _get_cache_backend(fpath)
+    if backend is None:
+        util_io.save_data(fpath, data, **kwargs)
+    else:
+        backend['save'](fpath, data)
+
+
+def _load_cache_data(fpath, **kwargs):
+    backend = _get_cache_backend(fpath)
+    if backend is None:
+        return util_io.load_data(fpath, **kwargs)
+    else:
+        return backend['load'](fpath)
+
+
+def _remove_cache_file(fpath):
+    """ Deletes a cache file and the companion files of its backend """
+    backend = _get_cache_backend(fpath)
+    fpath_list = [fpath]
+    if backend is not None and backend['companions'] is not None:
+        fpath_list.extend(backend['companions'](fpath))
+    for fpath_ in fpath_list:
+        try:
+            os.remove(fpath_)
+        except OSError:
+            # already removed by another process
+            pass
+
+
+register_cache_backend('.pkl5', _save_pkl5, _load_pkl5)
+register_cache_backend('.pkl5.lz4', *_make_compressed_pkl5_backend('lz4'))
+register_cache_backend('.pkl5.zst', *_make_compressed_pkl5_backend('zstd'))
+if util_type.HAVE_NUMPY:
+    register_cache_backend('.cache.npz', _save_cache_npz, _load_cache_npz)
+    register_cache_backend('.lazy.pkl', _save_cache_lazy, _load_cache_lazy,
+                           atomic=True, companions_func=_lazy_companions)
+
+
+_atomic_rename = util_io._atomic_rename
+_temp_fpath = util_io._temp_fpath
+
+
+def _atomic_save_data(fpath, data, **kwargs):
+    """
+    Writes data to a hidden temporary file next to fpath and renames it into
+    place, so concurrent readers never see a partially written file.
+
+    Returns:
+        list: companion files written next to fpath by the backend
+    """
+    backend = _get_cache_backend(fpath)
+    if backend is not None and backend['atomic']:
+        return backend['save'](fpath, data) or []
+    # keep the extension last so util_io dispatches on the same format
+    temp_fpath = _temp_fpath(fpath)
+    # report the final path instead of the temporary one
+    verbose = util_io._rectify_verb_write(kwargs.pop('verbose', None))
+    if verbose:
+        print('[util_cache] * save_data(%r)' % (util_path.tail(fpath),))
+    try:
+        if backend is None:
+            util_io.save_data(temp_fpath, data, verbose=False, **kwargs)
+        else:
+            backend['save'](temp_fpath, data)
+        _atomic_rename(temp_fpath, fpath)
+    except BaseException:
+        if exists(temp_fpath):
+            os.remove(temp_fpath)
+        raise
+    return []
+
+
+class CacheDirManager(object):
+    """
+    Keeps the files in a cache directory under a byte budget.
+
+    Only files written through the cache functions (see record_write), or
+    explicitly adopted with a glob pattern (see adopt), are indexed and can be
+    evicted. Other files in the directory are never touched, so a shared
+    directory like the default app resource dir is safe to manage.
+
+    Sizes, access times and hit counts are kept in an index file inside the
+    directory, so listing and eviction do not need a directory scan. Writes,
+    removals and accesses are buffered in memory and merged into the on-disk
+    index on flush, which lets several processes share one directory.
+
+    Args:
+        dpath (str): cache directory
+        max_nbytes (int): byte budget. None means unbounded (default = None)
+        policy (str): eviction order. 'lru' removes the least recently used
+            files first, 'lfu' the least frequently used. (default = 'lru')
+        flush_every (int): number of buffered changes before the index is
+            written (default = 32)
+
+    CommandLine:
+        python -m utool.util_cache CacheDirManager
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_cache import *  # NOQA
+        >>> import utool as ut
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_cachedirmanager')
+        >>> ut.delete(dpath, verbose=False)
+        >>> ut.ensuredir(dpath)
+        >>> notes_fpath = join(dpath, 'notes.txt')
+        >>> ut.write_to(notes_fpath, 'x' * 5000, verbose=False)
+        >>> manager = get_cache_dir_manager(dpath, max_nbytes=2500, verbose=False)
+        >>> data = b'x' * 1000
+        >>> fpath_a = save_cache(dpath, 'item_', 'a', data, verbose=False)
+        >>> fpath_b = save_cache(dpath, 'item_', 'b', data, verbose=False)
+        >>> _ = load_cache(dpath, 'item_', 'a', verbose=False)
+        >>> fpath_c = save_cache(dpath, 'item_', 'c', data, verbose=False)
+        >>> # b was the least recently used file
+        >>> print(manager.fnames())
+        ['item_a.cPkl', 'item_c.cPkl']
+        >>> assert not exists(fpath_b)
+        >>> assert manager.nbytes <= manager.max_nbytes
+        >>> # files that were not written through the cache are left alone
+        >>> assert exists(notes_fpath)
+        >>> # a fresh manager reads the index instead of scanning
+        >>> manager.flush()
+        >>> manager2 = CacheDirManager(dpath)
+        >>> assert manager2.fnames('item_*') == manager.fnames()
+        >>> remove_cache_dir_manager(dpath)
+        >>> ut.delete(dpath, verbose=False)
+    """
+    index_fname = '.utool_cache_index.json'
+
+    def __init__(self, dpath, max_nbytes=None, policy='lru', flush_every=32,
+                 verbose=None):
+        if policy not in ['lru', 'lfu']:
+            raise ValueError('unknown eviction policy=%r' % (policy,))
+        if verbose is None:
+            verbose = VERBOSE_CACHE
+        self.dpath = normpath(dpath)
+        self.index_fpath = join(self.dpath, self.index_fname)
+        self.max_nbytes = max_nbytes
+        self.policy = policy
+        self.flush_every = flush_every
+        self.verbose = verbose
+        self.entries = None
+        # changes not yet merged into the on-disk index
+        self._added = {}
+        self._removed = set([])
+        self._touched = {}
+        self._adopted = set([])
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return '<%s(%r, max_nbytes=%r, policy=%r)>' % (
+            self.__class__.__name__, self.dpath, self.max_nbytes, self.policy)
+
+    def _ensure_loaded(self):
+        if self.entries is None:
+            self.entries = self._read_index()
+            if self.entries is None:
+                self.entries = {}
+
+    @contextlib.contextmanager
+    def _index_lock(self):
+        """ Serializes index updates between processes where fcntl exists """
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        with open(self.index_fpath + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read_index(self):
+        try:
+            with open(self.index_fpath, 'r') as file_:
+                return json.load(file_)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _write_index(self, entries):
+        temp_fpath = '%s.%d.%s.tmp' % (self.index_fpath, os.getpid(),
+                                       uuid.uuid4().hex[0:8])
+        with open(temp_fpath, 'w') as file_:
+            json.dump(entries, file_)
+        _atomic_rename(temp_fpath, self.index_fpath)
+
+    def _stat_entry(self, fpath):
+        st = os.stat(fpath)
+        # atime is not updated on noatime mounts
+        return {'nbytes': st.st_size, 'atime': max(st.st_atime, st.st_mtime),
+                'hits': 0}
+
+    def _num_pending(self):
+        return len(self._added) + len(self._removed) + len(self._touched)
+
+    def rebuild(self):
+        """
+        Refreshes the sizes of the indexed files from the filesystem and drops
+        the ones that no longer exist. Files that are not indexed are ignored.
+        """
+        with self._lock:
+            self.flush()
+            self._ensure_loaded()
+            entries = {}
+            for fname, entry in six.iteritems(self.entries):
+                fpath = join(self.dpath, fname)
+                companions = entry.get('companions', [])
+                try:
+                    new_entry = self._stat_entry(fpath)
+                    new_entry['nbytes'] += sum(
+                        os.path.getsize(join(self.dpath, x))
+                        for x in companions)
+                except OSError:
+                    continue
+                new_entry['atime'] = max(new_entry['atime'], entry['atime'])
+                new_entry['hits'] = entry['hits']
+                if companions:
+                    new_entry['companions'] = companions
+                entries[fname] = new_entry
+            self.entries = entries
+            with self._index_lock():
+                self._write_index(entries)
+
+    def adopt(self, pattern):
+        """
+        Indexes existing files that match a glob pattern (e.g. the files of a
+        Cacher written before the manager existed). Each pattern is only
+        scanned once per manager.
+
+        Returns:
+            list: the newly indexed file names
+        """
+        adopted = []
+        with self._lock:
+            if pattern in self._adopted:
+                return adopted
+            self._adopted.add(pattern)
+            self._ensure_loaded()
+            for fname in fnmatch.filter(os.listdir(self.dpath), pattern):
+                # hidden files are the index and in-progress writes
+                if fname.startswith('.') or fname in self.entries:
+                    continue
+                fpath = join(self.dpath, fname)
+                if os.path.isfile(fpath):
+                    entry = self._stat_entry(fpath)
+                    self.entries[fname] = entry
+                    self._added[fname] = entry
+                    self._removed.discard(fname)
+                    adopted.append(fname)
+            if adopted:
+                self.evict()
+                self.flush()
+        return adopted
+
+    def flush(self):
+        """ Merges buffered changes into the on-disk index """
+        with self._lock:
+            if self.entries is None:
+                return
+            if not (self._added or self._removed or self._touched):
+                return
+            with self._index_lock():
+                entries = self._read_index()
+                if entries is None:
+                    entries = {}
+                for fname in self._removed:
+                    entries.pop(fname, None)
+                entries.update(self._added)
+                for fname, (atime, hits) in six.iteritems(self._touched):
+                    entry = entries.get(fname, None)
+                    if entry is not None:
+                        entry['atime'] = max(entry['atime'], atime)
+                        entry['hits'] += hits
+                self._write_index(entries)
+            self.entries = entries
+            self._added.clear()
+            self._removed.clear()
+            self._touched.clear()
+
+    @property
+    def nbytes(self):
+        """ total size of the indexed files """
+        with self._lock:
+            self._ensure_loaded()
+            return sum(entry['nbytes'] for entry in self.entries.values())
+
+    def fnames(self, pattern=None):
+        """ Lists the indexed file names, optionally matching a glob pattern """
+        with self._lock:
+            self._ensure_loaded()
+            fnames = sorted(self.entries.keys())
+        if pattern is not None:
+            fnames = fnmatch.filter(fnames, pattern)
+        return fnames
+
+    def fpaths(self, pattern=None):
+        return [join(self.dpath, fname) for fname in self.fnames(pattern)]
+
+    def record_write(self, fpath, companions=None):
+        """
+        Registers a newly written file and evicts to stay in budget.
+        Companion files (e.g. the .npy files of the '.lazy.pkl' backend) count
+        towards its size and are deleted with it.
+        """
+        fname = basename(fpath)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._stat_entry(fpath)
+            entry['atime'] = max(entry['atime'], time.time())
+            if companions:
+                entry['nbytes'] += sum(map(os.path.getsize, companions))
+                entry['companions'] = [basename(x) for x in companions]
+            self.entries[fname] = entry
+            self._added[fname] = entry
+            self._removed.discard(fname)
+            self._touched.pop(fname, None)
+            if self._num_pending() >= self.flush_every:
+                # merging also brings in files written by other processes
+                self.flush()
+            self.evict(keep=[fname])
+
+    def record_access(self, fpath):
+        """ Registers a read of a file for the eviction policy """
+        fname = basename(fpath)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self.entries.get(fname, None)
+            if entry is None:
+                # written by someone who does not use the manager
+                if exists(fpath):
+                    self.record_write(fpath)
+                return
+            atime = time.time()
+            entry['atime'] = atime
+            entry['hits'] += 1
+            if fname not in self._added:
+                # new entries are merged whole on flush
+                hits = self._touched.get(fname, (None, 0))[1]
+                self._touched[fname] = (atime, hits + 1)
+            if self._num_pending() >= self.flush_every:
+                self.flush()
+
+    def record_remove(self, fpath):
+        """ Registers that a file was deleted """
+        fname = basename(fpath)
+        with self._lock:
+            self._ensure_loaded()
+            self.entries.pop(fname, None)
+            self._added.pop(fname, None)
+            self._touched.pop(fname, None)
+            self._removed.add(fname)
+            if self._num_pending() >= self.flush_every:
+                self.flush()
+
+    def evict(self, keep=[]):
+        """
+        Deletes files in policy order until the directory is within its byte
+        budget. Files in keep are never removed.
+
+        Returns:
+            list: the removed file paths
+        """
+        removed = []
+        if self.max_nbytes is None:
+            return removed
+        with self._lock:
+            self._ensure_loaded()
+            total = self.nbytes
+            if total <= self.max_nbytes:
+                return removed
+            if self.policy == 'lru':
+                sortkey = lambda item: item[1]['atime']  # NOQA
+            else:
+                sortkey = lambda item: (item[1]['hits'], item[1]['atime'])  # NOQA
+            for fname, entry in sorted(self.entries.items(), key=sortkey):
+                if total <= self.max_nbytes:
+                    break
+                if fname in keep:
+                    continue
+                fpath = join(self.dpath, fname)
+                for fname_ in [fname] + entry.get('companions', []):
+                    try:
+                        os.remove(join(self.dpath, fname_))
+                    except OSError:
+                        # already removed by another process
+                        pass
+                total -= entry['nbytes']
+                del self.entries[fname]
+                self._added.pop(fname, None)
+                self._touched.pop(fname, None)
+                self._removed.add(fname)
+                removed.append(fpath)
+            if self.verbose and removed:
+                print('[cache] evicted %d files from %s' % (
+                    len(removed), util_path.tail(self.dpath)))
+            if self._num_pending() >= self.flush_every:
+                self.flush()
+        return removed
+
+
+__CACHE_DIR_MANAGERS__ = {}
+__CACHE_DIR_LOCK__ = threading.RLock()
+
+
+def get_cache_dir_manager(dpath, **kwargs):
+    """
+    Returns the CacheDirManager for a directory, creating it if needed. Once
+    registered, save_cache, load_cache, Cacher and Cachable keep its index up
+    to date. Given keyword arguments update the manager settings.
+
+    Args:
+        dpath (str): cache directory
+        **kwargs: max_nbytes, policy, flush_every, verbose
+    """
+    key = normpath(dpath)
+    with __CACHE_DIR_LOCK__:
+        manager = __CACHE_DIR_MANAGERS__.get(key, None)
+        if manager is None:
+            manager = CacheDirManager(key, **kwargs)
+            __CACHE_DIR_MANAGERS__[key] = manager
+        else:
+            for attr, val in six.iteritems(kwargs):
+                setattr(manager, attr, val)
+    return manager
+
+
+def remove_cache_dir_manager(dpath):
+    """ Flushes and unregisters the manager of a directory """
+    with __CACHE_DIR_LOCK__:
+        manager = __CACHE_DIR_MANAGERS__.pop(normpath(dpath), None)
+    if manager is not None:
+        manager.flush()
+
+
+def _lookup_cache_dir_manager(fpath):
+    """ Returns the registered manager of the directory of fpath, if any """
+    if not __CACHE_DIR_MANAGERS__:
+        return None
+    return __CACHE_DIR_MANAGERS__.get(normpath(dirname(fpath)), None)
+
+
+def _flush_cache_dir_managers():
+    with __CACHE_DIR_LOCK__:
+        managers = list(__CACHE_DIR_MANAGERS__.values())
+    for manager in managers:
+        try:
+            manager.flush()
+        except Exception:
+            pass
+
+
+atexit.register(_flush_cache_dir_managers)
+
+
 def save_cache(dpath, fname, cfgstr, data, ext='.cPkl', verbose=None):
     """
     Saves data using util_io, but smartly constructs a filename
     """
     fpath = _args2_fpath(dpath, fname, cfgstr, ext)
-    util_io.save_data(fpath, data, verbose=verbose)
+    companions = _atomic_save_data(fpath, data, verbose=verbose)
+    manager = _lookup_cache_dir_manager(fpath)
+    if manager is not None:
+        manager.record_write(fpath, companions)
     return fpath
 
 
@@ -244,7 +1052,7 @@ def load_cache(dpath, fname, cfgstr, ext='.cPkl', verbose=None, enabled=True):
             print('[util_cache] About to read file of size %s' % (ut.byte_str2(nbytes),))
     try:
         with ut.Timer(fpath, verbose=big_verbose and verbose > 3):
-            data = util_io.load_data(fpath, verbose=verbose > 2)
+            data = _load_cache_data(fpath, verbose=verbose > 2)
     except (EOFError, IOError, ImportError) as ex:
         print('CORRUPTED? fpath = %s' % (fpath,))
         if verbose > 1:
@@ -257,6 +1065,9 @@ def load_cache(dpath, fname, cfgstr, ext='.cPkl', verbose=None, enabled=True):
     else:
         if verbose > 2:
             print('[util_cache] ... cache hit')
+        manager = _lookup_cache_dir_manager(fpath)
+        if manager is not None:
+            manager.record_access(fpath)
     return data
 
 
@@ -325,12 +1136,18 @@ class Cacher(object):
     """
     def __init__(self, fname, cfgstr=None, cache_dir='default',
                  appname='utool', ext='.cPkl', verbose=None,
-                 enabled=True):
+                 enabled=True, max_nbytes=None, policy='lru'):
         if verbose is None:
             verbose = VERBOSE
         if cache_dir == 'default':
             cache_dir = util_cplat.get_app_resource_dir(appname)
         util_path.ensuredir(cache_dir)
+        if max_nbytes is not None:
+            # bound the size of the cache directory
+            manager = get_cache_dir_manager(cache_dir, max_nbytes=max_nbytes,
+                                            policy=policy)
+            # versions saved before the manager existed count too
+            manager.adopt(fname + '*' + ext)
         self.dpath = cache_dir
         self.fname = fname
         self.cfgstr = cfgstr
@@ -349,7 +1166,12 @@ class Cacher(object):
         """
         import glob
         pattern = self.fname + '_*' + self.ext
-        for fname in glob.glob1(self.dpath, pattern):
+        manager = _lookup_cache_dir_manager(join(self.dpath, pattern))
+        if manager is not None:
+            fname_list = manager.fnames(pattern)
+        else:
+            fname_list = glob.glob1(self.dpath, pattern)
+        for fname in fname_list:
             fpath = join(self.dpath, fname)
             yield fpath
 
@@ -418,7 +1240,8 @@ class Cacher(object):
         assert self.dpath is not None, 'no dpath'
         if self.verbose > 0:
             print('[cache] ... ' + self.fname + ' Cacher save')
-        save_cache(self.dpath, self.fname, cfgstr, data, self.ext)
+        save_cache(self.dpath, self.fname, cfgstr, data, self.ext,
+                   verbose=self.verbose > 1)
 
 
 #@util_decor.memoize
@@ -705,9 +1528,165 @@ def cachestr_repr(val):
                 return val.get_dbname()
 
 
+# Maximum number of memoized argument digests for get_cfgstr_from_args
+_CFGVAL_MEMO_MAX_SIZE = 4096
+# Digests of immutable values keyed by (type signature, value)
+_CFGVAL_VALUE_MEMO = {}
+# Digests of read-only ndarrays keyed by id. Entries are dropped when the
+# array is garbage collected.
+_CFGVAL_ARRAY_MEMO = {}
+_CFGVAL_SCALAR_TYPES = (bool, float, type(None)) + six.integer_types + six.string_types
+# Closes a list or tuple in a type signature
+_CFGVAL_SIG_END = object()
+
+
+def _cfgval_type_sig(val):
+    """
+    Flat preorder tuple of the type names in nested lists and tuples.
+    util_hash.hash_data hashes values that compare equal (1 / 1.0 / True,
+    list / tuple) the same, so the signature is hashed with the value.
+    """
+    sig = []
+    stack = [val]
+    while stack:
+        item = stack.pop()
+        if item is _CFGVAL_SIG_END:
+            sig.append(')')
+            continue
+        sig.append(type(item).__name__)
+        if isinstance(item, (list, tuple)):
+            item_types = set(map(type, item))
+            if len(item_types) == 1:
+                item_type = item_types.pop()
+                if item_type in _CFGVAL_SCALAR_TYPES:
+                    # summarize homogeneous scalar lists at C speed
+                    sig.append('%s*%d' % (item_type.__name__, len(item)))
+                    sig.append(')')
+                    continue
+            stack.append(_CFGVAL_SIG_END)
+            stack.extend(item[::-1])
+        elif util_type.HAVE_NUMPY and isinstance(item, util_type.np.ndarray):
+            sig.append(item.dtype.str)
+    return tuple(sig)
+
+
+def _cfgval_digest(val):
+    """
+    Returns a short hash of an argument value without building its repr.
+    Buffers are fed to util_hash directly. The digests of immutable values
+    and read-only ndarrays are memoized. Values that compare equal but hold
+    different types get different digests.
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_cache import *  # NOQA
+        >>> from utool.util_cache import _cfgval_digest
+        >>> # equal values of different types must not share a memo entry
+        >>> pairs = [((1, 2), (1, 2.0)), ((True, 0), (1, 0)),
+        >>>          ((1, 2), [1, 2]), ([1.0, 2.0], (1.0, 2.0)),
+        >>>          (((1,), 'a'), ((1.0,), 'a')), (1, True)]
+        >>> for val1, val2 in pairs:
+        >>>     assert val1 == val2 or list(val1) == list(val2)
+        >>>     assert _cfgval_digest(val1) != _cfgval_digest(val2), (val1, val2)
+        >>>     assert _cfgval_digest(val2) != _cfgval_digest(val1), (val1, val2)
+        >>> assert _cfgval_digest((1, 2.0)) == _cfgval_digest((1, 2.0))
+    """
+    if (util_type.HAVE_NUMPY and isinstance(val, util_type.np.ndarray) and
+          not val.flags.writeable):
+        array_id = id(val)
+        entry = _CFGVAL_ARRAY_MEMO.get(array_id, None)
+        if entry is not None and entry[0]() is val:
+            return entry[1]
+        digest = _hash_cfgval(val)
+
+        def _forget(_, array_id=array_id):
+            _CFGVAL_ARRAY_MEMO.pop(array_id, None)
+        _CFGVAL_ARRAY_MEMO[array_id] = (weakref.ref(val, _forget), digest)
+        return digest
+    digest = _packed_list_digest(val)
+    if digest is not None:
+        return digest
+    sig = _cfgval_type_sig(val)
+    memo_key = None
+    if isinstance(val, (tuple, frozenset, six.binary_type) + _CFGVAL_SCALAR_TYPES):
+        memo_key = (sig, val)
+        try:
+            return _CFGVAL_VALUE_MEMO[memo_key]
+        except KeyError:
+            pass
+        except TypeError:
+            # tuples of mutable items
+            memo_key = None
+    digest = _hash_cfgval(val, sig)
+    if memo_key is not None:
+        if len(_CFGVAL_VALUE_MEMO) >= _CFGVAL_MEMO_MAX_SIZE:
+            _CFGVAL_VALUE_MEMO.clear()
+        _CFGVAL_VALUE_MEMO[memo_key] = digest
+    return digest
+
+
+def _hash_cfgval(val, sig=None):
+    if sig is None:
+        sig = _cfgval_type_sig(val)
+    try:
+        return util_hash.hash_data([sig, val], hashlen=16)
+    except TypeError:
+        # types util_hash does not know about
+        return util_hash.hashstr27(cachestr_repr(val))
+
+
+def _packed_list_digest(val):
+    """
+    Hashes homogeneous int or float lists as one packed buffer instead of
+    feeding util_hash one item at a time. Returns None for other data.
+    """
+    if not isinstance(val, (list, tuple)) or len(val) == 0:
+        return None
+    item_types = set(map(type, val))
+    if len(item_types) != 1:
+        return None
+    item_type = item_types.pop()
+    if item_type is float:
+        typecode, tag = 'd', 'PACKED_FLOAT'
+    elif item_type in six.integer_types and item_type is not bool:
+        typecode, tag = 'q', 'PACKED_INT'
+    else:
+        return None
+    try:
+        packed = array.array(typecode, val)
+    except OverflowError:
+        return None
+    hasher = hashlib.sha512()
+    # lists and tuples of the same items get different digests
+    hasher.update(('%s_%s' % (tag, type(val).__name__)).encode('utf8'))
+    hasher.update(memoryview(packed).cast('B') if six.PY3 else packed.tostring())
+    return util_hash.convert_hexstr_to_bigbase(
+        hasher.hexdigest(), util_hash.ALPHABET_27,
+        bigbase=len(util_hash.ALPHABET_27))[:16]
+
+
+def _cfgval_str(val, use_hash=None):
+    """
+    hash based replacement of ``hashstr27(cachestr_repr(val))``. Short
+    scalars keep the same readable json representation as the repr path.
+    """
+    if use_hash is not True and isinstance(val, _CFGVAL_SCALAR_TYPES):
+        text = to_json(val)
+        if use_hash is False or len(text) <= 16:
+            return text
+    return _cfgval_digest(val)
+
+
 def get_cfgstr_from_args(func, args, kwargs, key_argx, key_kwds, kwdefaults,
-                         argnames, use_hash=None):
+                         argnames, use_hash=None, fast=False):
     """
+    Args:
+        use_hash (bool): if None only long values are hashed, if True all
+            values are hashed, if False none are.
+        fast (bool): if True values are hashed with util_hash.hash_data
+            instead of hashing their repr. This avoids building huge strings
+            for large ndarray or list arguments. Short scalars produce the
+            same cfgstr either way. (default = False)
     Dev:
         argx = ['fdsf', '432443432432', 43423432, 'fdsfsd', 3.2, True]
         memlist = list(map(cachestr_repr, argx))
@@ -749,6 +1728,26 @@ def get_cfgstr_from_args(func, args, kwargs, key_argx, key_kwds, kwdefaults,
         >>> kwdefaults = ut.util_inspect.get_kwdefaults(func)
         >>> argnames   = ut.util_inspect.get_argnames(func)
         >>> get_cfgstr_from_args(func, args, kwargs, key_argx, key_kwds, kwdefaults, argnames)
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_cache import *  # NOQA
+        >>> import utool as ut
+        >>> import numpy as np
+        >>> func = consensed_cfgstr
+        >>> kwdefaults = ut.util_inspect.get_kwdefaults(func)
+        >>> argnames = ut.util_inspect.get_argnames(func)
+        >>> args = ('a', 3)
+        >>> cfgstr1 = get_cfgstr_from_args(func, args, {}, None, [], kwdefaults, argnames)
+        >>> cfgstr2 = get_cfgstr_from_args(func, args, {}, None, [], kwdefaults, argnames, fast=True)
+        >>> assert cfgstr1 == cfgstr2
+        >>> print(cfgstr2)
+        prefix=("a")_cfgstr=(3)
+        >>> arr = np.arange(1000)
+        >>> arr.flags.writeable = False
+        >>> cfgstr3 = get_cfgstr_from_args(func, (arr, 3), {}, None, [], kwdefaults, argnames, fast=True)
+        >>> cfgstr4 = get_cfgstr_from_args(func, (arr + 1, 3), {}, None, [], kwdefaults, argnames, fast=True)
+        >>> assert cfgstr3 != cfgstr4 and len(cfgstr3) < 50
     """
     #try:
     #fmt_str = '%s(%s)'
@@ -768,6 +1767,11 @@ def get_cfgstr_from_args(func, args, kwargs, key_argx, key_kwds, kwdefaults,
     kw_hashfmtstr = [key + '=(%s)' for key in key_kwds]
     cfgstr_fmt = '_'.join(chain(arg_hashfmtstr, kw_hashfmtstr))
     #print('cfgstr_fmt = %r' % cfgstr_fmt)
+    if fast:
+        argcfg_list = [_cfgval_str(args[argx], use_hash) for argx in key_argx]
+        kwdcfg_list = [_cfgval_str(given_kwargs[key], use_hash)
+                       for key in key_kwds]
+        return cfgstr_fmt % tuple(chain(argcfg_list, kwdcfg_list))
     argrepr_iter = (cachestr_repr(args[argx]) for argx in key_argx)
     kwdrepr_iter = (cachestr_repr(given_kwargs[key]) for key in key_kwds)
     if use_hash is None:
@@ -789,13 +1793,54 @@ def get_cfgstr_from_args(func, args, kwargs, key_argx, key_kwds, kwdefaults,
     return cfgstr
 
 
+class CacheStats(object):
+    """
+    Hit, miss, and latency counters for a cached function.
+
+    Seconds are accumulated separately for deriving keys, serving memory
+    hits, reading the disk (hits and misses), and computing missed results.
+    """
+    def __init__(self):
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.key_seconds = 0.0
+        self.memory_seconds = 0.0
+        self.disk_seconds = 0.0
+        self.compute_seconds = 0.0
+
+    @property
+    def calls(self):
+        return self.memory_hits + self.disk_hits + self.misses
+
+    def asdict(self):
+        keys = ['memory_hits', 'disk_hits', 'misses', 'key_seconds',
+                'memory_seconds', 'disk_seconds', 'compute_seconds']
+        return collections.OrderedDict([(key, getattr(self, key))
+                                        for key in keys])
+
+    def reset(self):
+        self.__init__()
+
+    def __repr__(self):
+        return 'CacheStats(' + ', '.join(
+            '%s=%r' % item for item in self.asdict().items()) + ')'
+
+
 def cached_func(fname=None, cache_dir='default', appname='utool', key_argx=None,
-                key_kwds=None, use_cache=None, verbose=None):
+                key_kwds=None, use_cache=None, verbose=None, mem_max_size=None,
+                mem_max_nbytes=None, fast_key=False):
     r"""
     Wraps a function with a Cacher object
 
     uses a hash of arguments as input
 
+    If ``mem_max_size`` or ``mem_max_nbytes`` is given, a bounded in-memory
+    LRU tier sits in front of the disk tier, so repeated calls with the same
+    arguments do not touch the filesystem. Memory hits return the same object
+    each time (not a copy). The wrapper exposes ``cacher``, ``memcache``
+    (None if disabled), and ``stats`` (a :class:`CacheStats`).
+
     Args:
         fname (str):  file name (defaults to function name)
         cache_dir (unicode): (default = u'default')
@@ -803,6 +1848,14 @@ def cached_func(fname=None, cache_dir='default', appname='utool', key_argx=None,
         key_argx (None): (default = None)
         key_kwds (None): (default = None)
         use_cache (bool):  turns on disk based caching(default = None)
+        mem_max_size (int): maximum number of results kept in memory
+            (default = None)
+        mem_max_nbytes (int): maximum total size in bytes of the results kept
+            in memory (default = None)
+        fast_key (bool): derive keys by hashing argument buffers instead of
+            their repr (see get_cfgstr_from_args). Results cached with the
+            other setting are not found, because long arguments get different
+            keys. (default = False)
 
     CommandLine:
         python -m utool.util_cache --exec-cached_func
@@ -826,6 +1879,22 @@ def cached_func(fname=None, cache_dir='default', appname='utool', key_argx=None,
         >>> assert ans5 == ans4
         >>> assert ans5 == ans0
         >>> assert ans1 != ans0
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> import utool as ut
+        >>> def costly_func2(a, b):
+        ...     return [a] * b
+        >>> closure_ = ut.cached_func('costly_func2', appname='utool_test',
+        >>>                           mem_max_size=2, verbose=0)
+        >>> efficient_func = closure_(costly_func2)
+        >>> efficient_func.cacher.save([42, 42], 'a=(42)_b=(2)')
+        >>> ans1 = efficient_func(42, 2)  # disk hit
+        >>> ans2 = efficient_func(42, 2)  # memory hit
+        >>> ans3 = efficient_func(42, 2, use_cache=False)  # recompute
+        >>> assert ans1 is ans2 and ans1 == ans3 == [42, 42]
+        >>> stats = efficient_func.stats
+        >>> assert (stats.disk_hits, stats.memory_hits, stats.misses) == (1, 1, 1)
     """
     if verbose is None:
         verbose = VERBOSE_CACHE
@@ -840,6 +1909,11 @@ def cached_func(fname=None, cache_dir='default', appname='utool', key_argx=None,
             argnames = argnames[1:]
         cacher = Cacher(fname_, cache_dir=cache_dir, appname=appname,
                         verbose=verbose)
+        if mem_max_size is None and mem_max_nbytes is None:
+            memcache = None
+        else:
+            memcache = SizedLRUDict(mem_max_size, max_nbytes=mem_max_nbytes)
+        stats = CacheStats()
         if use_cache is None:
             use_cache_ = not util_arg.get_argflag('--nocache-' + fname_)
         else:
@@ -858,25 +1932,50 @@ def cached_func(fname=None, cache_dir='default', appname='utool', key_argx=None,
                 if verbose > 2:
                     print('[util_cache] computing cached function fname_=%s' %
                           ( fname_,))
+                tstart = util_time.default_timer()
                 # Implicitly adds use_cache to kwargs
                 cfgstr = get_cfgstr_from_args(func, args, kwargs, key_argx,
-                                              key_kwds, kwdefaults, argnames)
+                                              key_kwds, kwdefaults, argnames,
+                                              fast=fast_key)
                 if util_cplat.WIN32:
                     # remove potentially invalid chars
                     cfgstr = '_' + util_hash.hashstr27(cfgstr)
                 assert cfgstr is not None, 'cfgstr=%r cannot be None' % (cfgstr,)
                 use_cache__ = kwargs.pop('use_cache', use_cache_)
+                tnow = util_time.default_timer()
+                stats.key_seconds += tnow - tstart
                 if use_cache__:
+                    if memcache is not None:
+                        tstart = tnow
+                        try:
+                            data = memcache[cfgstr]
+                        except KeyError:
+                            pass
+                        else:
+                            stats.memory_hits += 1
+                            stats.memory_seconds += (
+                                util_time.default_timer() - tstart)
+                            return data
                     # Make cfgstr from specified input
+                    tstart = util_time.default_timer()
                     data = cacher.tryload(cfgstr)
+                    stats.disk_seconds += util_time.default_timer() - tstart
                     if data is not None:
+                        stats.disk_hits += 1
+                        if memcache is not None:
+                            memcache[cfgstr] = data
                         return data
+                stats.misses += 1
                 # Cached missed compute function
+                tstart = util_time.default_timer()
                 data = func(*args, **kwargs)
+                stats.compute_seconds += util_time.default_timer() - tstart
                 # Cache save
                 #if use_cache__:
                 # TODO: save_cache
                 cacher.save(data, cfgstr)
+                if memcache is not None:
+                    memcache[cfgstr] = data
                 return data
             #except ValueError as ex:
             # handle protocal error
@@ -894,6 +1993,8 @@ def cached_func(fname=None, cache_dir='default', appname='utool', key_argx=None,
         # Give function a handle to the cacher object
         cached_wraper = util_decor.preserve_sig(cached_wraper, func)
         cached_wraper.cacher = cacher
+        cached_wraper.memcache = memcache
+        cached_wraper.stats = stats
         return cached_wraper
     return cached_closure
 
@@ -1034,7 +2135,14 @@ class Cachable(object):
     must implement get_cfgstr()
 
     """
-    ext = '.cPkl'  # TODO: Capt'n Proto backend to replace pickle backend
+    # Serialization backend is chosen by extension. '.cPkl' stays readable by
+    # python2. See register_cache_backend for faster alternatives such as
+    # '.pkl5', '.pkl5.lz4', '.pkl5.zst' and '.cache.npz', or '.lazy.pkl' to
+    # memory map large arrays on load.
+    ext = '.cPkl'
+    # If set, the cache directory is kept under this many bytes
+    cache_max_nbytes = None
+    cache_policy = 'lru'
 
     #@abc.abstractmethod
     def get_cfgstr(self):
@@ -1081,7 +2189,21 @@ class Cachable(object):
         fpath = self.get_fpath(cachedir, cfgstr=cfgstr)
         if verbose:
             print('[Cachable] cache delete: %r' % (basename(fpath),))
-        os.remove(fpath)
+        if not exists(fpath):
+            raise OSError(2, 'No such file or directory: %r' % (fpath,))
+        _remove_cache_file(fpath)
+        manager = _lookup_cache_dir_manager(fpath)
+        if manager is not None:
+            manager.record_remove(fpath)
+
+    def _get_dir_manager(self, fpath):
+        if self.cache_max_nbytes is not None:
+            manager = get_cache_dir_manager(dirname(fpath),
+                                            max_nbytes=self.cache_max_nbytes,
+                                            policy=self.cache_policy)
+            manager.adopt(self.get_prefix() + '*' + self.ext)
+            return manager
+        return _lookup_cache_dir_manager(fpath)
 
     @profile
     def save(self, cachedir=None, cfgstr=None, verbose=VERBOSE, quiet=QUIET,
@@ -1105,14 +2227,17 @@ class Cachable(object):
                          for (key, val) in six.iteritems(statedict)
                          if key not in ignore_keys}
 
-        util_io.save_data(fpath, save_dict)
+        companions = _atomic_save_data(fpath, save_dict)
+        manager = self._get_dir_manager(fpath)
+        if manager is not None:
+            manager.record_write(fpath, companions)
         return fpath
         #save_cache(cachedir, '', cfgstr, self.__dict__)
         #with open(fpath, 'wb') as file_:
         #    pickle.dump(self.__dict__, file_)
 
     def _unsafe_load(self, fpath, ignore_keys=None):
-        loaded_dict = util_io.load_data(fpath)
+        loaded_dict = _load_cache_data(fpath)
         if ignore_keys is not None:
             for key in ignore_keys:
                 if key in loaded_dict:
@@ -1130,6 +2255,9 @@ class Cachable(object):
         prefix = self.get_prefix()
         pattern = prefix + '*' + partial_cfgstr + '*' + self.ext
         cachedir = self.get_cachedir(cachedir)
+        manager = _lookup_cache_dir_manager(join(cachedir, pattern))
+        if manager is not None:
+            return manager.fpaths(pattern)
         valid_targets = util_path.glob(cachedir, pattern, recursive=False)
         return valid_targets
 
@@ -1161,6 +2289,9 @@ class Cachable(object):
             self._unsafe_load(fpath, ignore_keys)
             if verbose:
                 print('... self cache hit: %r' % (basename(fpath),))
+            manager = self._get_dir_manager(fpath)
+            if manager is not None:
+                manager.record_access(fpath)
         except ValueError as ex:
             import utool as ut
             msg = '[!Cachable] Cachable(%s) is likely corrupt' % (self.get_cfgstr())
@@ -1342,6 +2473,76 @@ class LRUDict(object):
         self._cache[key] = value
 
 
+class SizedLRUDict(LRUDict):
+    """
+    LRUDict that can be bounded by the number of items, the total size of
+    its values in bytes, or both.
+
+    Args:
+        max_size (int): maximum number of items (None means unbounded)
+        max_nbytes (int): maximum total size of the values (None means
+            unbounded). Values larger than this are not stored.
+        sizeof (func): measures a value in bytes
+            (default = ut.get_object_nbytes)
+
+    CommandLine:
+        python -m utool.util_cache --test-SizedLRUDict
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_cache import *  # NOQA
+        >>> self = SizedLRUDict(max_nbytes=10, sizeof=len)
+        >>> self['a'] = 'aaaa'
+        >>> self['b'] = 'bbbb'
+        >>> self['a']
+        >>> self['c'] = 'cccc'
+        >>> self['d'] = 'd' * 11
+        >>> result = ('keys=%r, nbytes=%r' % (list(self.keys()), self.nbytes))
+        >>> print(result)
+        keys=['a', 'c'], nbytes=8
+    """
+
+    def __init__(self, max_size=None, max_nbytes=None, sizeof=None):
+        super(SizedLRUDict, self).__init__(max_size)
+        if sizeof is None:
+            from utool import util_dev
+            sizeof = util_dev.get_object_nbytes
+        self._max_nbytes = max_nbytes
+        self._sizeof = sizeof
+        self._key_to_nbytes = {}
+        self.nbytes = 0
+
+    def __delitem__(self, key):
+        del self._cache[key]
+        self.nbytes -= self._key_to_nbytes.pop(key)
+
+    def clear(self):
+        self._key_to_nbytes.clear()
+        self.nbytes = 0
+        return self._cache.clear()
+
+    def _evict_oldest(self):
+        key, _ = self._cache.popitem(last=False)
+        self.nbytes -= self._key_to_nbytes.pop(key)
+
+    def __setitem__(self, key, value):
+        if key in self._cache:
+            del self[key]
+        nbytes = 0
+        if self._max_nbytes is not None:
+            nbytes = self._sizeof(value)
+            if nbytes > self._max_nbytes:
+                return
+            while self._cache and self.nbytes + nbytes > self._max_nbytes:
+                self._evict_oldest()
+        if self._max_size is not None:
+            while self._cache and len(self._cache) >= self._max_size:
+                self._evict_oldest()
+        self._cache[key] = value
+        self._key_to_nbytes[key] = nbytes
+        self.nbytes += nbytes
+
+
 def time_different_diskstores():
     """
     %timeit shelf_write_test()    # 15.1 ms per loop
@@ -1401,6 +2602,109 @@ def time_different_diskstores():
     cPickle_read_test2()
 
 
+def time_cfgstr_from_args(sizes=[10, 1000, 100000, 1000000], num=5):
+    """
+    Benchmarks the repr based and hash based (fast) cache key derivation of
+    get_cfgstr_from_args against the size of ndarray and list arguments.
+
+    CommandLine:
+        python -m utool.util_cache time_cfgstr_from_args
+
+    Example:
+        >>> # DISABLE_DOCTEST
+        >>> from utool.util_cache import *  # NOQA
+        >>> time_cfgstr_from_args()
+    """
+    import utool as ut
+    import numpy as np
+
+    def func(data, flag=True):
+        pass
+    kwdefaults = ut.util_inspect.get_kwdefaults(func)
+    argnames = ut.util_inspect.get_argnames(func)
+    rows = []
+    for size in sizes:
+        arr = np.random.RandomState(0).rand(size)
+        arr_ro = arr.copy()
+        arr_ro.flags.writeable = False
+        data_list = list(range(size))
+        cases = [('ndarray', arr), ('ndarray(ro)', arr_ro), ('list', data_list)]
+        for label, data in cases:
+            for fast in [False, True]:
+                for timer in ut.Timerit(num, verbose=0):
+                    with timer:
+                        get_cfgstr_from_args(func, (data,), {}, None, None,
+                                             kwdefaults, argnames, fast=fast)
+                rows.append((size, label, 'fast' if fast else 'repr',
+                             timer.parent.min()))
+    for size, label, mode, seconds in rows:
+        print('size=%8d %-12s %-4s %.3es' % (size, label, mode, seconds))
+    return rows
+
+
+def time_cache_backends(exts=['.cPkl', '.pkl5', '.cache.npz', '.lazy.pkl',
+                              '.pkl5.lz4', '.pkl5.zst'], num=3, scale=1):
+    """
+    Benchmarks save/load throughput and file size of the registered cache
+    backends on payloads shaped like Cachable.__dict__ state. Backends whose
+    optional dependencies are missing are skipped.
+
+    CommandLine:
+        python -m utool.util_cache time_cache_backends
+
+    Example:
+        >>> # DISABLE_DOCTEST
+        >>> from utool.util_cache import *  # NOQA
+        >>> time_cache_backends()
+    """
+    import utool as ut
+    import numpy as np
+    rng = np.random.RandomState(0)
+    payloads = {
+        # a few big feature arrays
+        'arrays': {
+            'vecs': rng.randint(0, 255, (200000 * scale, 128)).astype(np.uint8),
+            'kpts': rng.rand(200000 * scale, 6).astype(np.float32),
+            'cfgstr': 'FEAT(hesaff+sift)',
+        },
+        # many small arrays in nested containers
+        'nested': {
+            'qaid2_fm': {aid: rng.randint(0, 1000, (50, 2)) for aid in range(2000 * scale)},
+            'qaid2_fs': {aid: rng.rand(50) for aid in range(2000 * scale)},
+            'name_list': ['name%d' % (x,) for x in range(10000)],
+        },
+    }
+    dpath = ut.ensure_app_resource_dir('utool', 'time_cache_backends')
+    rows = []
+    for label, data in payloads.items():
+        nbytes = ut.get_object_nbytes(data)
+        for ext in exts:
+            fpath = join(dpath, 'payload' + ext)
+            try:
+                for timer in ut.Timerit(num, verbose=0):
+                    with timer:
+                        _save_cache_data(fpath, data, verbose=False)
+                save_seconds = timer.parent.min()
+                for timer in ut.Timerit(num, verbose=0):
+                    with timer:
+                        _load_cache_data(fpath, verbose=False)
+                load_seconds = timer.parent.min()
+            except ImportError as ex:
+                print('skip %s: %s' % (ext, ex))
+                continue
+            backend = _get_cache_backend(fpath)
+            companions = []
+            if backend is not None and backend['companions'] is not None:
+                companions = backend['companions'](fpath)
+            file_nbytes = sum(map(ut.get_file_nBytes, [fpath] + companions))
+            rows.append((label, ext, save_seconds, load_seconds, file_nbytes))
+            print('%-7s %-11s save %7.1f MB/s  load %7.1f MB/s  size %s' % (
+                label, ext, nbytes / save_seconds / 2 ** 20,
+                nbytes / load_seconds / 2 ** 20, ut.byte_str2(file_nbytes)))
+    ut.delete(dpath, verbose=False)
+    return rows
+
+
 class KeyedDefaultDict(util_dict.DictLike):
     def __init__(self, default_func, *args, **kwargs):
         self._default_func = default_func
@@ -14,6 +14,7 @@ import copy
 import os
 import six
 import uuid
+from os.path import join
 import random
 import warnings
 from six.moves import zip, map
@@ -224,7 +225,8 @@ def _covert_to_hashable(data):
     #     prefix = b'FLT'
     elif util_type.HAVE_NUMPY and isinstance(data, np.int64):
         return _covert_to_hashable(int(data))
-    elif util_type.HAVE_NUMPY and isinstance(data, np.float64):
+    elif isinstance(data, float):
+        # includes np.float64
         a, b = float(data).as_integer_ratio()
         hashable = (a.to_bytes(8, byteorder='big') +
                     b.to_bytes(8, byteorder='big'))
@@ -318,44 +320,92 @@ def _update_hasher(hasher, data):
         print(hasher.hexdigest())
 
     """
-    if isinstance(data, (tuple, list, zip)):
-        needs_iteration = True
-    elif (util_type.HAVE_NUMPY and isinstance(data, np.ndarray) and
-          data.dtype.kind == 'O'):
-        # ndarrays of objects cannot be hashed directly.
-        needs_iteration = True
-    else:
-        needs_iteration = False
-
-    if needs_iteration:
-        # try to nest quickly without recursive calls
-        SEP = b'SEP'
-        iter_prefix = b'ITER'
-        # if isinstance(data, tuple):
-        #     iter_prefix = b'TUP'
-        # else:
-        #     iter_prefix = b'LIST'
-        iter_ = iter(data)
-        hasher.update(iter_prefix)
+    # Walk nested sequences with an explicit stack of iterators instead of
+    # recursion. The bytes fed to the hasher are the same as the original
+    # recursive version: ITER, then the items separated by SEP.
+    stack = []
+    item = data
+    while True:
+        if isinstance(item, (tuple, list, zip)):
+            hasher.update(_ITER_PREFIX)
+            packed = None
+            if not isinstance(item, zip):
+                packed = _pack_leaf_sequence(item)
+            if packed is not None:
+                hasher.update(packed)
+            else:
+                iter_ = iter(item)
+                first = next(iter_, _EXHAUSTED)
+                if first is not _EXHAUSTED:
+                    stack.append(iter_)
+                    item = first
+                    continue
+        elif (util_type.HAVE_NUMPY and isinstance(item, np.ndarray) and
+              item.dtype.kind == 'O'):
+            # ndarrays of objects cannot be hashed directly. The original
+            # implementation hashed the pickled array once per row.
+            if item.ndim == 0:
+                raise TypeError('iteration over a 0-d array')
+            msg = '[ut] hashing ndarrays with dtype=object is unstable'
+            warnings.warn(msg, RuntimeWarning)
+            hasher.update(_ITER_PREFIX)
+            sep_dumped = _SEP + item.dumps()
+            for _ in range(len(item)):
+                hasher.update(sep_dumped)
+        else:
+            _update_hasher_leaf(hasher, item)
+        # move on to the next item of the innermost unfinished sequence
+        while stack:
+            item = next(stack[-1], _EXHAUSTED)
+            if item is _EXHAUSTED:
+                stack.pop()
+            else:
+                hasher.update(_SEP)
+                break
+        else:
+            return
+
+
+_SEP = b'SEP'
+_ITER_PREFIX = b'ITER'
+_EXHAUSTED = object()
+
+
+def _update_hasher_leaf(hasher, data):
+    """ Feeds a non-sequence value to the hasher """
+    if (util_type.HAVE_NUMPY and isinstance(data, np.ndarray) and
+         data.flags.c_contiguous):
+        # hash the array buffer in place instead of copying with tobytes
         try:
-            for item in iter_:
-                prefix, hashable = _covert_to_hashable(data)
-                binary_data = SEP + prefix + hashable
-                # b''.join([SEP, prefix, hashable])
-                hasher.update(binary_data)
-        except TypeError:
-            # need to use recursive calls
-            # Update based on current item
-            _update_hasher(hasher, item)
-            for item in iter_:
-                # Ensure the items have a spacer between them
-                hasher.update(SEP)
-                _update_hasher(hasher, item)
-    else:
-        prefix, hashable = _covert_to_hashable(data)
-        binary_data = prefix + hashable
-        # b''.join([prefix, hashable])
-        hasher.update(binary_data)
+            hasher.update(data)
+            return
+        except (BufferError, TypeError, ValueError):
+            pass
+    prefix, hashable = _covert_to_hashable(data)
+    hasher.update(prefix + hashable)
+
+
+def _pack_leaf_sequence(items):
+    """
+    Returns the bytes of a list of only text, only bytes or only ints as a
+    single SEP-joined buffer, which is what the hasher would have been fed
+    item by item. Returns None for any other list.
+    """
+    item_types = set(map(type, items))
+    if len(item_types) == 0:
+        return b''
+    if len(item_types) == 1:
+        item_type = next(iter(item_types))
+        if item_type is six.text_type:
+            return _SEP.join([item.encode('utf-8') for item in items])
+        elif item_type is six.binary_type:
+            return _SEP.join(items)
+    if item_types.issubset(_PACKABLE_INT_TYPES):
+        try:
+            return _SEP.join(map(_SMALL_INT_BYTES.__getitem__, items))
+        except KeyError:
+            return _SEP.join(map(_int_to_bytes, items))
+    return None
 
 
 # def _bytes_generator(data):
@@ -434,15 +484,42 @@ def combine_hashes(bytes_list, hasher=None):
     return hasher.digest()
 
 
+def _rectify_hasher(hasher):
+    """
+    Returns a new hasher object from an algorithm name. Besides the hashlib
+    algorithms, 'xxh64', 'xxh128', 'xxh3_64' and 'xxh3_128' are supported
+    when the optional xxhash package is installed.
+    """
+    if hasher is None:
+        return hashlib.sha512()
+    if isinstance(hasher, six.string_types):
+        if hasher.startswith('xxh'):
+            try:
+                import xxhash
+            except ImportError:
+                raise ImportError('hasher=%r requires the xxhash package' % (hasher,))
+            return getattr(xxhash, hasher)()
+        return hashlib.new(hasher)
+    # assume a hasher constructor
+    return hasher()
+
+
 @profile
-def hash_data(data, hashlen=None, alphabet=None):
+def hash_data(data, hashlen=None, alphabet=None, hasher=None):
     r"""
     Get a unique hash depending on the state of the data.
 
+    Nested lists and tuples are walked without recursion, contiguous ndarrays
+    are hashed without copying, and lists of only ints or only strings are
+    fed to the hasher as one buffer.
+
     Args:
         data (object): any sort of loosely organized data
         hashlen (None): (default = None)
         alphabet (None): (default = None)
+        hasher (str): algorithm name. Defaults to sha512. Faster choices are
+            'blake2b' or, if xxhash is installed, 'xxh3_128'. Hashes with
+            short digests are shorter than hashlen. (default = None)
 
     Returns:
         str: text -  hash string
@@ -478,6 +555,24 @@ def hash_data(data, hashlen=None, alphabet=None):
         >>>     print('failed {} on {}'.format(count, input_))
         >>>     print('got={}, want={}'.format(got, want))
         >>> assert not failed
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_hash import *  # NOQA
+        >>> import numpy as np
+        >>> # deep nesting does not hit the recursion limit
+        >>> deep = [1]
+        >>> for _ in range(10000):
+        >>>     deep = [deep, 'x']
+        >>> assert len(hash_data(deep)) == 32
+        >>> arr = np.arange(12).reshape(3, 4)
+        >>> assert hash_data(arr.T) == hash_data(np.ascontiguousarray(arr.T))
+        >>> print(hash_data([1, 2, 3]))
+        >>> print(hash_data([1, 2, 3], hasher='blake2b'))
+        >>> print(hash_data(''))
+        lhbbuszgivatjknioimlyksdsdvetsqe
+        qylkhvpshdmccrrlqddwefeulvwdiabn
+        aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa
     """
     if alphabet is None:
         alphabet = ALPHABET_27
@@ -487,7 +582,7 @@ def hash_data(data, hashlen=None, alphabet=None):
         # Make a special hash for empty data
         text = (alphabet[0] * hashlen)
     else:
-        hasher = hashlib.sha512()
+        hasher = _rectify_hasher(hasher)
         _update_hasher(hasher, data)
         # Get a 128 character hex string
         text = hasher.hexdigest()
@@ -495,7 +590,7 @@ def hash_data(data, hashlen=None, alphabet=None):
         hashstr2 = convert_hexstr_to_bigbase(text, alphabet, bigbase=len(alphabet))
         # Truncate
         text = hashstr2[:hashlen]
-        return text
+    return text
 
 
 def digest_data(data, alg='sha256'):
@@ -705,6 +800,11 @@ else:
         return int_
 
 
+_PACKABLE_INT_TYPES = set(six.integer_types) | {bool}
+# Precomputed _int_to_bytes of small non-negative ints
+_SMALL_INT_BYTES = {int_: _int_to_bytes(int_) for int_ in range(4096)}
+
+
 def _test_int_byte_conversion():
     import itertools as it
     import utool as ut
@@ -899,6 +999,219 @@ def get_file_hash(fpath, blocksize=65536, hasher=None, stride=1,
             return hasher.digest()
 
 
+class FileHashIndex(object):
+    r"""
+    Persistent SQLite index that maps a file's stat signature to its digest.
+
+    A file is identified by (path, size, mtime_ns, inode), and digests are
+    stored per hashing configuration (algorithm, blocksize, stride). A stored
+    digest is reused as long as the stat signature is unchanged.
+
+    Args:
+        fpath (str): path to the sqlite database. Defaults to a file in the
+            utool resource directory.
+
+    CommandLine:
+        python -m utool.util_hash FileHashIndex
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_hash import *  # NOQA
+        >>> import utool as ut
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_filehashindex')
+        >>> index = FileHashIndex(join(dpath, 'index.sqlite'))
+        >>> fpath = join(dpath, 'data.txt')
+        >>> ut.write_to(fpath, 'foobar', verbose=False)
+        >>> key = ('sha1', 2 ** 16, 1)
+        >>> sig = index.stat_signature(fpath)
+        >>> assert index.lookup([(fpath, sig)], key) == [None]
+        >>> digest = get_file_hash(fpath)
+        >>> index.store([(fpath, sig, digest)], key)
+        >>> assert index.lookup([(fpath, sig)], key) == [digest]
+        >>> assert index.lookup([(fpath, (0, 0, 0))], key) == [None]
+        >>> index.close()
+        >>> ut.delete(dpath, verbose=False)
+    """
+    def __init__(self, fpath=None):
+        import sqlite3
+        import threading
+        if fpath is None:
+            from utool import util_cplat
+            fpath = join(util_cplat.ensure_app_resource_dir('utool'),
+                         'file_hash_index.sqlite')
+        self.fpath = fpath
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(fpath, timeout=60,
+                                     check_same_thread=False)
+        with self._lock:
+            try:
+                # lets readers and a writer in other processes coexist
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            except sqlite3.OperationalError:
+                pass
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS file_hashes (
+                    fpath TEXT NOT NULL,
+                    hasher TEXT NOT NULL,
+                    blocksize INTEGER NOT NULL,
+                    stride INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    digest BLOB NOT NULL,
+                    PRIMARY KEY (fpath, hasher, blocksize, stride)
+                )
+                """)
+            self._conn.commit()
+
+    def __repr__(self):
+        return '<%s(%r)>' % (self.__class__.__name__, self.fpath)
+
+    @staticmethod
+    def stat_signature(fpath):
+        """ Returns the (size, mtime_ns, inode) of a file """
+        st = os.stat(fpath)
+        mtime_ns = getattr(st, 'st_mtime_ns', None)
+        if mtime_ns is None:
+            mtime_ns = int(st.st_mtime * 1E9)
+        return (st.st_size, mtime_ns, st.st_ino)
+
+    def lookup(self, items, key):
+        """
+        Args:
+            items (list): tuples of (fpath, stat_signature)
+            key (tuple): (hasher_name, blocksize, stride)
+
+        Returns:
+            list: stored digests or None where the signature changed
+        """
+        query = (
+            """
+            SELECT size, mtime_ns, inode, digest FROM file_hashes
+            WHERE fpath=? AND hasher=? AND blocksize=? AND stride=?
+            """)
+        digest_list = []
+        with self._lock:
+            cursor = self._conn.cursor()
+            for fpath, sig in items:
+                row = cursor.execute(query, (fpath,) + tuple(key)).fetchone()
+                if row is not None and tuple(row[0:3]) == tuple(sig):
+                    digest_list.append(bytes(row[3]))
+                else:
+                    digest_list.append(None)
+        return digest_list
+
+    def store(self, items, key):
+        """
+        Args:
+            items (list): tuples of (fpath, stat_signature, digest)
+            key (tuple): (hasher_name, blocksize, stride)
+        """
+        import sqlite3
+        rows = [(fpath,) + tuple(key) + tuple(sig) + (sqlite3.Binary(digest),)
+                for fpath, sig, digest in items]
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                rows)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+__FILE_HASH_INDEXES__ = {}
+
+
+def _get_file_hash_index(index_fpath=None):
+    """ Returns a cached connection to the file hash index """
+    index = __FILE_HASH_INDEXES__.get(index_fpath, None)
+    if index is None:
+        index = FileHashIndex(index_fpath)
+        __FILE_HASH_INDEXES__[index_fpath] = index
+    return index
+
+
+def _hash_file_worker(fpath, hasher_name, blocksize, stride):
+    return get_file_hash(fpath, blocksize=blocksize,
+                         hasher=hashlib.new(hasher_name), stride=stride)
+
+
+def get_file_hashes(fpath_list, hasher='sha1', blocksize=65536, stride=1,
+                    hexdigest=False, use_index=True, index_fpath=None,
+                    nthreads=None):
+    r"""
+    Bulk version of get_file_hash. Digests of files whose (path, size,
+    mtime_ns, inode) are unchanged are reused from a persistent
+    FileHashIndex. The remaining files are hashed in a thread pool (hashlib
+    releases the GIL on large buffers).
+
+    Args:
+        fpath_list (list): file paths
+        hasher (str): name of a hashlib algorithm (default = 'sha1')
+        blocksize (int): see get_file_hash (default = 65536)
+        stride (int): see get_file_hash (default = 1)
+        hexdigest (bool): return hex strings instead of bytes
+        use_index (bool): read and update the persistent index
+        index_fpath (str): location of the index (default = utool resource dir)
+        nthreads (int): number of hashing threads (default = number of cpus)
+
+    Returns:
+        list: digests in the same order as fpath_list
+
+    CommandLine:
+        python -m utool.util_hash get_file_hashes
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_hash import *  # NOQA
+        >>> import utool as ut
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_get_file_hashes')
+        >>> fpath_list = [join(dpath, 'file%d.txt' % x) for x in range(5)]
+        >>> for x, fpath in enumerate(fpath_list):
+        >>>     ut.write_to(fpath, 'data%d' % x, verbose=False)
+        >>> index_fpath = join(dpath, 'index.sqlite')
+        >>> hashes1 = get_file_hashes(fpath_list, index_fpath=index_fpath)
+        >>> hashes2 = get_file_hashes(fpath_list, index_fpath=index_fpath)
+        >>> assert hashes1 == hashes2 == [get_file_hash(f) for f in fpath_list]
+        >>> ut.write_to(fpath_list[2], 'changed', verbose=False)
+        >>> hashes3 = get_file_hashes(fpath_list, index_fpath=index_fpath)
+        >>> assert hashes3[2] == get_file_hash(fpath_list[2]) != hashes1[2]
+        >>> ut.delete(dpath, verbose=False)
+    """
+    fpath_list = [os.path.abspath(fpath) for fpath in fpath_list]
+    key = (hasher, blocksize, stride)
+    if use_index:
+        index = _get_file_hash_index(index_fpath)
+        sig_list = [FileHashIndex.stat_signature(fpath) for fpath in fpath_list]
+        digest_list = index.lookup(list(zip(fpath_list, sig_list)), key)
+    else:
+        digest_list = [None] * len(fpath_list)
+    miss_idxs = [idx for idx, digest in enumerate(digest_list) if digest is None]
+    if len(miss_idxs) > 1 and nthreads != 1:
+        from utool import util_parallel
+        executor = util_parallel.get_shared_pool('thread', nprocs=nthreads,
+                                                 key='get_file_hashes')
+        futures = [executor.submit(_hash_file_worker, fpath_list[idx], hasher,
+                                   blocksize, stride) for idx in miss_idxs]
+        new_digests = [future.result() for future in futures]
+    else:
+        new_digests = [_hash_file_worker(fpath_list[idx], hasher, blocksize,
+                                         stride) for idx in miss_idxs]
+    for idx, digest in zip(miss_idxs, new_digests):
+        digest_list[idx] = digest
+    if use_index and miss_idxs:
+        index.store([(fpath_list[idx], sig_list[idx], digest_list[idx])
+                     for idx in miss_idxs], key)
+    if hexdigest:
+        import binascii
+        digest_list = [binascii.hexlify(digest).decode('ascii')
+                       for digest in digest_list]
+    return digest_list
+
+
 def write_hash_file(fpath, hash_tag='md5', recompute=False):
     r""" Creates a hash file for each file in a path
 
@@ -967,9 +1280,16 @@ def write_hash_file_for_path(path, recompute=False):
     return hash_fpath_list
 
 
-def get_file_uuid(fpath, hasher=None, stride=1):
+def get_file_uuid(fpath, hasher=None, stride=1, use_index=False):
     """ Creates a uuid from the hash of a file
+
+    Args:
+        use_index (bool): reuse the digest from the persistent file hash
+            index when the file is unchanged (see get_file_hashes). Only
+            used with the default sha1 hasher.
     """
+    if use_index and hasher is None:
+        return get_file_uuids([fpath], stride=stride)[0]
     if hasher is None:
         hasher = hashlib.sha1()  # 20 bytes of output
         #hasher = hashlib.sha256()  # 32 bytes of output
@@ -981,6 +1301,19 @@ def get_file_uuid(fpath, hasher=None, stride=1):
     return uuid_
 
 
+def get_file_uuids(fpath_list, stride=1, use_index=True, nthreads=None):
+    """
+    Bulk version of get_file_uuid that uses get_file_hashes
+
+    Returns:
+        list: uuids in the same order as fpath_list
+    """
+    hashbytes_list = get_file_hashes(fpath_list, hasher='sha1', stride=stride,
+                                     use_index=use_index, nthreads=nthreads)
+    # sha1 produces 20 bytes, but UUID requires 16 bytes
+    return [uuid.UUID(bytes=hashbytes_20[0:16]) for hashbytes_20 in hashbytes_list]
+
+
 def image_uuid(pil_img):
     """
     UNSAFE: DEPRICATE: JPEG IS NOT GAURENTEED TO PRODUCE CONSITENT VALUES ON
@@ -997,6 +1330,15 @@ def image_uuid(pil_img):
     return uuid_
 
 
+def _augment_repr(x):
+    y = repr(x)
+    # hack to remove u prefix
+    if isinstance(x, six.string_types):
+        if y.startswith('u'):
+            y = y[1:]
+    return y
+
+
 def augment_uuid(uuid_, *hashables):
     #from six.moves import reprlib
     #uuidhex_data   = uuid_.get_bytes()
@@ -1006,13 +1348,7 @@ def augment_uuid(uuid_, *hashables):
     # ascii data in python2 and unicode text in python3
     # it would be nice to
     # warnings.warn('[ut] should not use repr when hashing', RuntimeWarning)
-    def tmprepr(x):
-        y = repr(x)
-        # hack to remove u prefix
-        if isinstance(x, six.string_types):
-            if y.startswith('u'):
-                y = y[1:]
-        return y
+    tmprepr = _augment_repr
     if six.PY2:
         hashable_text = ''.join(map(tmprepr, hashables))
         hashable_data = hashable_text.encode('utf-8')
@@ -1175,6 +1511,260 @@ def hashable_to_uuid(hashable_):
     return uuid_
 
 
+def _uuid_list_from_digests(digest_list):
+    """
+    Builds uuid.UUID objects from 16 byte digests. Skips the argument
+    validation of the UUID constructor when this python's UUID layout is the
+    expected one.
+    """
+    if not _FAST_UUID_OK:
+        return [uuid.UUID(bytes=digest) for digest in digest_list]
+    new = object.__new__
+    setattr_ = object.__setattr__
+    UUID = uuid.UUID
+    unknown = uuid.SafeUUID.unknown
+    from_bytes = int.from_bytes
+    uuid_list = []
+    append = uuid_list.append
+    for digest in digest_list:
+        uuid_ = new(UUID)
+        setattr_(uuid_, 'int', from_bytes(digest, 'big'))
+        setattr_(uuid_, 'is_safe', unknown)
+        append(uuid_)
+    return uuid_list
+
+
+def _check_fast_uuid():
+    try:
+        digest = hashlib.sha1(b'check').digest()[0:16]
+        uuid_ = object.__new__(uuid.UUID)
+        object.__setattr__(uuid_, 'int', int.from_bytes(digest, 'big'))
+        object.__setattr__(uuid_, 'is_safe', uuid.SafeUUID.unknown)
+        want = uuid.UUID(bytes=digest)
+        return (uuid_ == want and str(uuid_) == str(want) and
+                hash(uuid_) == hash(want) and uuid_.bytes == want.bytes)
+    except Exception:
+        return False
+
+
+_FAST_UUID_OK = _check_fast_uuid()
+
+
+def _format_uuid_digests(digest_list, output):
+    if output == 'uuid':
+        return _uuid_list_from_digests(digest_list)
+    elif output == 'bytes':
+        return digest_list
+    elif output == 'array':
+        arr = np.frombuffer(b''.join(digest_list), dtype=np.uint8)
+        return arr.reshape(len(digest_list), 16)
+    else:
+        raise ValueError('unknown output=%r' % (output,))
+
+
+def _uuid_bytes_list(uuid_list):
+    """ 16 byte representations of uuids given as UUIDs, bytes or an array """
+    if util_type.HAVE_NUMPY and isinstance(uuid_list, np.ndarray):
+        flat = np.ascontiguousarray(uuid_list, dtype=np.uint8).reshape(-1, 16)
+        return [row.tobytes() for row in flat]
+    return [uuid_.bytes if isinstance(uuid_, uuid.UUID) else uuid_
+            for uuid_ in uuid_list]
+
+
+def _sha1_digests16(bytes_list):
+    sha1 = hashlib.sha1
+    return [sha1(bytes_).digest()[0:16] for bytes_ in bytes_list]
+
+
+def hashable_to_uuids(hashables, output='uuid'):
+    r"""
+    Batch version of hashable_to_uuid.
+
+    Args:
+        hashables (list or ndarray): items accepted by hashable_to_uuid. For
+            a numeric or structured ndarray each row (item along the first
+            axis) is hashed by its raw bytes, like hashable_to_uuid does for
+            a single row.
+        output (str): 'uuid' for a list of uuid.UUID, 'bytes' for a list of
+            16 byte strings, or 'array' for an (N, 16) uint8 ndarray.
+            The last two skip UUID construction entirely.
+
+    Returns:
+        list or ndarray: uuids in input order
+
+    CommandLine:
+        python -m utool.util_hash hashable_to_uuids
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_hash import *  # NOQA
+        >>> import numpy as np
+        >>> hashables = ['foobar', b'foobar', 10, [1, 2, 3]]
+        >>> assert hashable_to_uuids(hashables) == list(map(hashable_to_uuid, hashables))
+        >>> rows = np.zeros(3, dtype=[('aid', np.int64), ('bbox', np.float32, 4)])
+        >>> rows['aid'] = [1, 2, 3]
+        >>> uuid_arr = hashable_to_uuids(rows, output='array')
+        >>> print(uuid_arr.shape)
+        (3, 16)
+        >>> assert hashable_to_uuids(rows)[1] == hashable_to_uuid(rows[1])
+    """
+    if (util_type.HAVE_NUMPY and isinstance(hashables, np.ndarray) and
+          not hashables.dtype.hasobject):
+        arr = np.ascontiguousarray(hashables)
+        num = len(arr)
+        if num == 0:
+            digest_list = []
+        else:
+            view = memoryview(arr.reshape(-1).view(np.uint8))
+            rowsize = len(view) // num
+            sha1 = hashlib.sha1
+            digest_list = [sha1(view[start:start + rowsize]).digest()[0:16]
+                           for start in range(0, len(view), rowsize)]
+    else:
+        item_types = set(map(type, hashables))
+        if item_types.issubset({six.binary_type}):
+            bytes_list = hashables
+        elif item_types.issubset({six.text_type}):
+            bytes_list = [text.encode('utf-8') for text in hashables]
+        else:
+            bytes_list = list(map(_ensure_hashable_bytes, hashables))
+        digest_list = _sha1_digests16(bytes_list)
+    return _format_uuid_digests(digest_list, output)
+
+
+def augment_uuids(uuid_list, *hashable_lists, **kwargs):
+    r"""
+    Batch version of augment_uuid. Augments uuid_list[i] with the i-th item
+    of each hashable list.
+
+    Args:
+        uuid_list (list): uuid.UUID objects, 16 byte strings, or an (N, 16)
+            uint8 ndarray
+        *hashable_lists: sequences parallel to uuid_list
+        output (str): see hashable_to_uuids (default = 'uuid')
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_hash import *  # NOQA
+        >>> uuid_list = hashable_to_uuids(['a', 'b', 'c'])
+        >>> names = ['x', 'y', 'z']
+        >>> nums = [1, 2.5, None]
+        >>> result = augment_uuids(uuid_list, names, nums)
+        >>> assert result == [augment_uuid(*args) for args in zip(uuid_list, names, nums)]
+    """
+    output = kwargs.pop('output', 'uuid')
+    if kwargs:
+        raise TypeError('unexpected keyword arguments %r' % (list(kwargs.keys()),))
+    uuid_bytes_list = _uuid_bytes_list(uuid_list)
+    if len(hashable_lists) == 0:
+        text_list = [''] * len(uuid_bytes_list)
+    else:
+        text_list = [''.join(map(_augment_repr, items))
+                     for items in zip(*hashable_lists)]
+    bytes_list = [uuid_bytes + text.encode('utf-8')
+                  for uuid_bytes, text in zip(uuid_bytes_list, text_list)]
+    return _format_uuid_digests(_sha1_digests16(bytes_list), output)
+
+
+def combine_uuid_groups(uuid_groups, ordered=True, salt='', output='uuid'):
+    r"""
+    Batch version of combine_uuids. Combines each group of uuids into one.
+
+    Args:
+        uuid_groups (list): lists of uuid.UUID objects
+        ordered (bool): see combine_uuids
+        salt (str): see combine_uuids
+        output (str): see hashable_to_uuids (default = 'uuid')
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_hash import *  # NOQA
+        >>> uuids = hashable_to_uuids(['one', 'two', 'three'])
+        >>> uuid_groups = [uuids, uuids[::-1], uuids[0:1], []]
+        >>> result1 = combine_uuid_groups(uuid_groups, ordered=False)
+        >>> result2 = [combine_uuids(group, ordered=False) for group in uuid_groups]
+        >>> assert result1 == result2
+    """
+    sep_str = '-'
+    sep_byte = six.binary_type(six.b(sep_str))
+    zero_bytes = get_zero_uuid().bytes
+    salt_prefix = '{}{}'.format(salt, sep_str)
+    digest_list = [None] * len(uuid_groups)
+    hash_idxs = []
+    bytes_list = []
+    for idx, uuids in enumerate(uuid_groups):
+        if len(uuids) == 0:
+            digest_list[idx] = zero_bytes
+            continue
+        uuid_bytes_list = _uuid_bytes_list(uuids)
+        if len(uuids) == 1:
+            digest_list[idx] = uuid_bytes_list[0]
+            continue
+        if not ordered:
+            # UUIDs order by their int, which is the order of their bytes
+            uuid_bytes_list = sorted(uuid_bytes_list)
+        pref = six.binary_type(six.b(salt_prefix + str(len(uuids))))
+        bytes_list.append(pref + sep_byte.join(uuid_bytes_list))
+        hash_idxs.append(idx)
+    for idx, digest in zip(hash_idxs, _sha1_digests16(bytes_list)):
+        digest_list[idx] = digest
+    return _format_uuid_digests(digest_list, output)
+
+
+def time_bulk_uuids(num=100000):
+    """
+    Benchmarks the batch uuid functions against loops over their scalar
+    versions.
+
+    CommandLine:
+        python -m utool.util_hash time_bulk_uuids
+
+    Example:
+        >>> # DISABLE_DOCTEST
+        >>> from utool.util_hash import *  # NOQA
+        >>> time_bulk_uuids()
+    """
+    import utool as ut
+    text_list = ['annot%d' % (x,) for x in range(num)]
+    rows = np.zeros(num, dtype=[('aid', np.int64), ('bbox', np.float32, 4),
+                                ('theta', np.float32)])
+    rows['aid'] = np.arange(num)
+    uuid_list = hashable_to_uuids(text_list)
+    uuid_groups = [uuid_list[x:x + 5] for x in range(0, num, 5)]
+    nums = list(range(num))
+    tests = [
+        ('hashable_to_uuid(text)',
+         lambda: [hashable_to_uuid(x) for x in text_list],
+         lambda: hashable_to_uuids(text_list),
+         lambda: hashable_to_uuids(text_list, output='bytes')),
+        ('hashable_to_uuid(row)',
+         lambda: [hashable_to_uuid(x) for x in rows],
+         lambda: hashable_to_uuids(rows),
+         lambda: hashable_to_uuids(rows, output='array')),
+        ('augment_uuid',
+         lambda: [augment_uuid(u, x, n) for u, x, n in zip(uuid_list, text_list, nums)],
+         lambda: augment_uuids(uuid_list, text_list, nums),
+         lambda: augment_uuids(uuid_list, text_list, nums, output='bytes')),
+        ('combine_uuids',
+         lambda: [combine_uuids(group) for group in uuid_groups],
+         lambda: combine_uuid_groups(uuid_groups),
+         lambda: combine_uuid_groups(uuid_groups, output='bytes')),
+    ]
+    rows_ = []
+    for label, scalar_func, batch_func, raw_func in tests:
+        times = []
+        for func in [scalar_func, batch_func, raw_func]:
+            for timer in ut.Timerit(3, verbose=0):
+                with timer:
+                    func()
+            times.append(timer.parent.min())
+        rows_.append((label,) + tuple(times))
+        print('%-24s scalar %.3fs  batch %.3fs (%.1fx)  raw %.3fs (%.1fx)' % (
+            label, times[0], times[1], times[0] / times[1], times[2],
+            times[0] / times[2]))
+    return rows_
+
+
 def random_uuid():
     return uuid.uuid4()
 
@@ -4,12 +4,21 @@ import six
 from six.moves import cPickle as pickle
 from utool import util_path
 from utool import util_inject
-from os.path import splitext, basename, exists
+from utool._internal.meta_util_cplat import WIN32
+from os.path import splitext, basename, exists, dirname, join
+import os
+import uuid
+import threading
+import contextlib
 try:
     import lockfile
     HAVE_LOCKFILE = True
 except ImportError:
     HAVE_LOCKFILE = False
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 try:
     import numpy as np
     HAS_NUMPY = True
@@ -25,6 +34,8 @@ __PRINT_READS__  =  __PRINT_IO__
 __FORCE_PRINT_READS__ = False
 __FORCE_PRINT_WRITES__ = False
 __READ_TAIL_N__ = 3
+# Default for the ``atomic`` keyword of the writers in this module
+__ATOMIC_WRITES__ = False
 #__FORCE_PRINT_READS__ = True
 #__FORCE_PRINT_WRITES__ = True
 
@@ -56,7 +67,7 @@ def save_data(fpath, data, **kwargs):
     elif ext in ['.hdf5']:
         return save_hdf5(fpath, data, **kwargs)
     elif ext in ['.txt']:
-        return save_text(fpath, **kwargs)
+        return save_text(fpath, data, **kwargs)
     elif HAS_NUMPY and ext in ['.npz', '.npy']:
         return save_numpy(fpath, data, **kwargs)
     else:
@@ -79,9 +90,231 @@ def _rectify_verb_read(verbose):
     return verbose
 
 
+def _rectify_atomic(atomic, mode='w'):
+    if atomic is None:
+        # the global default only applies to writes that replace the file,
+        # appends and updates keep writing in place
+        atomic = __ATOMIC_WRITES__ and mode.startswith('w')
+    return atomic
+
+
+def _atomic_rename(src, dst):
+    """ Renames src over dst in one step """
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+    else:
+        if WIN32 and exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def _temp_fpath(fpath):
+    """ hidden, unique sibling of fpath with the same final extension """
+    stem, ext = splitext(basename(fpath))
+    return join(dirname(fpath), '.%s.%d.%s.tmp%s' % (
+        stem, os.getpid(), uuid.uuid4().hex[0:8], ext))
+
+
+def _fsync_fpath(fpath):
+    """ Flushes a file (or a directory entry on posix) to disk """
+    flags = os.O_RDONLY
+    if os.path.isdir(fpath):
+        if WIN32:
+            return
+        flags |= getattr(os, 'O_DIRECTORY', 0)
+    fd = os.open(fpath, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def atomic_fpath(fpath, fsync=True):
+    r"""
+    Yields a hidden temporary path next to ``fpath``. When the block exits
+    cleanly the temporary file is fsynced and renamed over ``fpath``, so
+    concurrent readers see either the old or the new file and never a
+    partially written one. On error the temporary file is removed.
+
+    Args:
+        fpath (str): final destination
+        fsync (bool): flush the file and its directory entry to disk
+
+    CommandLine:
+        python -m utool.util_io atomic_fpath
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_io import *  # NOQA
+        >>> import utool as ut
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_atomic')
+        >>> fpath = join(dpath, 'atomic.txt')
+        >>> ut.write_to(fpath, 'old', verbose=False)
+        >>> with atomic_fpath(fpath) as temp_fpath:
+        >>>     ut.write_to(temp_fpath, 'new', verbose=False)
+        >>>     assert ut.read_from(fpath, verbose=False) == 'old'
+        >>> assert ut.read_from(fpath, verbose=False) == 'new'
+        >>> assert not exists(temp_fpath)
+    """
+    temp_fpath = _temp_fpath(fpath)
+    try:
+        yield temp_fpath
+        if fsync:
+            _fsync_fpath(temp_fpath)
+        _atomic_rename(temp_fpath, fpath)
+    except BaseException:
+        if exists(temp_fpath):
+            os.remove(temp_fpath)
+        raise
+    if fsync:
+        _fsync_fpath(dirname(fpath) or '.')
+
+
+@contextlib.contextmanager
+def atomic_open(fpath, mode='w', fsync=True):
+    r"""
+    Like ``open(fpath, mode)`` for writing, but the data only replaces
+    ``fpath`` once the block exits cleanly (see :func:`atomic_fpath`).
+
+    Args:
+        fpath (str): final destination
+        mode (str): a truncating write mode ('w' or 'wb')
+        fsync (bool): flush the file and its directory entry to disk
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_io import *  # NOQA
+        >>> import utool as ut
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_atomic')
+        >>> fpath = join(dpath, 'atomic.pkl')
+        >>> with atomic_open(fpath, 'wb') as file_:
+        >>>     pickle.dump([1, 2, 3], file_, protocol=2)
+        >>> assert load_cPkl(fpath, verbose=False) == [1, 2, 3]
+    """
+    if not mode.startswith('w'):
+        raise ValueError('atomic writes replace the whole file, '
+                         'mode=%r is not supported' % (mode,))
+    with atomic_fpath(fpath, fsync=False) as temp_fpath:
+        with open(temp_fpath, mode) as file_:
+            yield file_
+            if fsync:
+                file_.flush()
+                os.fsync(file_.fileno())
+    if fsync:
+        _fsync_fpath(dirname(fpath) or '.')
+
+
+_HELD_LOCKS = threading.local()
+
+
+def _lock_fpath(fpath):
+    return fpath + '.lock'
+
+
+@contextlib.contextmanager
+def lock_file(fpath, shared=False):
+    r"""
+    Holds an advisory lock on ``fpath`` for the duration of the block.
+
+    The lock is taken with ``fcntl.flock`` on a ``<fpath>.lock`` sidecar, so
+    it is shared between processes and the target file can still be
+    replaced by an atomic rename while the lock is held. Use an exclusive
+    lock around read-modify-write cycles. The lock is reentrant within a
+    thread. Where fcntl is unavailable the ``lockfile`` package is used if
+    it is installed, otherwise the block runs unlocked.
+
+    Args:
+        fpath (str): file to lock
+        shared (bool): take a shared (reader) lock instead of an exclusive
+            one
+
+    CommandLine:
+        python -m utool.util_io lock_file
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_io import *  # NOQA
+        >>> import utool as ut
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_atomic')
+        >>> fpath = join(dpath, 'counter.pkl')
+        >>> save_cPkl(fpath, 0, verbose=False)
+        >>> with lock_file(fpath):
+        >>>     count = load_cPkl(fpath, verbose=False)
+        >>>     lock_and_save_cPkl(fpath, count + 1)
+        >>> assert load_cPkl(fpath, verbose=False) == 1
+    """
+    lock_fpath = _lock_fpath(fpath)
+    held = getattr(_HELD_LOCKS, 'held', None)
+    if held is None:
+        held = _HELD_LOCKS.held = {}
+    if lock_fpath in held:
+        if not shared and held[lock_fpath][1]:
+            raise RuntimeError(
+                'cannot upgrade a shared lock on %r to exclusive' % (fpath,))
+        held[lock_fpath][0] += 1
+        try:
+            yield
+        finally:
+            held[lock_fpath][0] -= 1
+        return
+    if fcntl is None:
+        if HAVE_LOCKFILE:
+            with lockfile.LockFile(lock_fpath):
+                held[lock_fpath] = [1, False]
+                try:
+                    yield
+                finally:
+                    del held[lock_fpath]
+        else:
+            yield
+        return
+    with open(lock_fpath, 'a') as lock_file_:
+        fcntl.flock(lock_file_.fileno(),
+                    fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        held[lock_fpath] = [1, shared]
+        try:
+            yield
+        finally:
+            del held[lock_fpath]
+            fcntl.flock(lock_file_.fileno(), fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def _writer_context(fpath, atomic, lock, mode='wb'):
+    """ Opens fpath for a writer honoring the atomic and lock options """
+    atomic = _rectify_atomic(atomic, mode)
+    lock_ctx = lock_file(fpath) if lock else _null_context()
+    with lock_ctx:
+        if atomic:
+            with atomic_open(fpath, mode) as file_:
+                yield file_
+        else:
+            with open(fpath, mode) as file_:
+                yield file_
+
+
+@contextlib.contextmanager
+def _writer_fpath_context(fpath, atomic, lock):
+    """ Like _writer_context for writers that need a path """
+    atomic = _rectify_atomic(atomic)
+    lock_ctx = lock_file(fpath) if lock else _null_context()
+    with lock_ctx:
+        if atomic:
+            with atomic_fpath(fpath) as temp_fpath:
+                yield temp_fpath
+        else:
+            yield fpath
+
+
+@contextlib.contextmanager
+def _null_context():
+    yield
+
+
 def write_to(fpath, to_write, aslines=False, verbose=None,
-             onlyifdiff=False, mode='w', n=None):
-    """ Writes text to a file. Automatically encodes text as utf8.
+             onlyifdiff=False, mode='w', n=None, atomic=None, lock=False):
+    r""" Writes text to a file. Automatically encodes text as utf8.
 
     Args:
         fpath (str): file path
@@ -92,10 +325,34 @@ def write_to(fpath, to_write, aslines=False, verbose=None,
                 checks hash of to_write vs the hash of the contents of fpath
         mode (unicode): (default = u'w')
         n (int):  (default = 2)
+        atomic (bool): write to a temporary file, fsync it and rename it
+            over fpath. Only truncating modes can be atomic. If None,
+            __ATOMIC_WRITES__ decides for truncating modes and other modes
+            write in place. (default = None)
+        lock (bool): hold an exclusive :func:`lock_file` while writing
 
     CommandLine:
         python -m utool.util_io --exec-write_to --show
 
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_io import *  # NOQA
+        >>> from utool import util_io
+        >>> import utool as ut
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_write_to')
+        >>> fpath = ut.unixjoin(dpath, 'append.txt')
+        >>> prev = util_io.__ATOMIC_WRITES__
+        >>> util_io.__ATOMIC_WRITES__ = True
+        >>> try:
+        >>>     write_to(fpath, 'foo\n', verbose=False)
+        >>>     write_to(fpath, 'bar\n', mode='a', verbose=False)
+        >>> finally:
+        >>>     util_io.__ATOMIC_WRITES__ = prev
+        >>> print(repr(read_from(fpath, verbose=False)))
+        'foo\nbar\n'
+        >>> ut.assert_raises(ValueError, write_to, fpath, 'baz', mode='a',
+        >>>                  verbose=False, atomic=True)
+
     Ignore:
         >>> # DISABLE_DOCTEST
         >>> from utool.util_io import *  # NOQA
@@ -134,7 +391,7 @@ def write_to(fpath, to_write, aslines=False, verbose=None,
         # Should just read from the file
         fpath = fpath.name
 
-    with open(fpath, mode) as file_:
+    with _writer_context(fpath, atomic, lock, mode) as file_:
         if aslines:
             file_.writelines(to_write)
         else:
@@ -226,6 +483,169 @@ def read_lines_from(fpath, num_lines=None, verbose=None, n=None):
                 break
     return line_list
 
+def iter_lines(fpath, with_offsets=False, errors='replace'):
+    r"""
+    Lazily yields the lines of a text file decoded as utf8. Lines are split
+    on newlines only, the same way ``read_from(aslines=True)`` splits them,
+    but only one line is held in memory at a time.
+
+    Args:
+        fpath (str): file path
+        with_offsets (bool): if True yields (byte_offset, line) tuples
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_io import *  # NOQA
+        >>> import utool as ut
+        >>> fpath = ut.unixjoin(ut.ensure_app_resource_dir('utool'), 'test_iter_lines.txt')
+        >>> write_to(fpath, 'spam\nδ eggs\n\nham', verbose=False)
+        >>> print(list(iter_lines(fpath, with_offsets=True)))
+        [(0, 'spam\n'), (5, 'δ eggs\n'), (13, '\n'), (14, 'ham')]
+        >>> assert list(iter_lines(fpath)) == read_from(fpath, aslines=True, verbose=False)
+    """
+    with open(fpath, 'rb') as file_:
+        offset = 0
+        for raw_line in file_:
+            line = raw_line.decode('utf8', errors=errors)
+            if with_offsets:
+                yield offset, line
+            else:
+                yield line
+            offset += len(raw_line)
+
+
+def iter_line_chunks(fpath, chunksize=2 ** 24, errors='replace'):
+    r"""
+    Decodes a (possibly huge) utf8 file in chunks of whole lines. Chunks are
+    cut after a newline, which never occurs inside a multibyte character, so
+    each chunk decodes exactly like the corresponding lines would.
+
+    Args:
+        fpath (str): file path
+        chunksize (int): approximate number of bytes per chunk. A single line
+            longer than this becomes its own (longer) chunk.
+
+    Yields:
+        tuple: (byte_offset, line_offset, text)
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_io import *  # NOQA
+        >>> import utool as ut
+        >>> fpath = ut.unixjoin(ut.ensure_app_resource_dir('utool'), 'test_iter_line_chunks.txt')
+        >>> write_to(fpath, 'aaaa\nbb\nccccccccc\nd', verbose=False)
+        >>> for chunk in iter_line_chunks(fpath, chunksize=6):
+        >>>     print(chunk)
+        (0, 0, 'aaaa\n')
+        (5, 1, 'bb\n')
+        (8, 2, 'ccccccccc\n')
+        (18, 3, 'd')
+    """
+    with open(fpath, 'rb') as file_:
+        byte_offset = 0
+        line_offset = 0
+        remainder = b''
+        while True:
+            block = file_.read(chunksize)
+            if not block:
+                if remainder:
+                    yield (byte_offset, line_offset,
+                           remainder.decode('utf8', errors=errors))
+                break
+            block = remainder + block
+            cutx = block.rfind(b'\n') + 1
+            if cutx == 0:
+                # no complete line yet
+                remainder = block
+                continue
+            raw, remainder = block[:cutx], block[cutx:]
+            yield byte_offset, line_offset, raw.decode('utf8', errors=errors)
+            byte_offset += len(raw)
+            line_offset += raw.count(b'\n')
+
+
+class MappedText(object):
+    r"""
+    Read-only memory map of a text file. Bytes regexes run directly on the
+    map so a file can be scanned without reading it into memory or decoding
+    it. Only the lines that are asked for are decoded.
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_io import *  # NOQA
+        >>> import utool as ut
+        >>> import re
+        >>> fpath = ut.unixjoin(ut.ensure_app_resource_dir('utool'), 'test_mapped_text.txt')
+        >>> write_to(fpath, 'import os\nδ = 1\nimport re\n', verbose=False)
+        >>> with MappedText(fpath) as mapped:
+        >>>     print(list(mapped.finditer_lines(re.compile(b'import'))))
+        >>>     print(mapped.line(12))
+        [(0, 'import os\n'), (2, 'import re\n')]
+        δ = 1
+        <BLANKLINE>
+    """
+    def __init__(self, fpath, errors='replace'):
+        import mmap
+        self.fpath = fpath
+        self.errors = errors
+        self._file = open(fpath, 'rb')
+        if os.fstat(self._file.fileno()).st_size == 0:
+            # empty files cannot be mapped
+            self.buf = b''
+        else:
+            self.buf = mmap.mmap(self._file.fileno(), 0,
+                                 access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.buf)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_, value, trace):
+        self.close()
+
+    def close(self):
+        if hasattr(self.buf, 'close'):
+            self.buf.close()
+        self._file.close()
+
+    def line_bounds(self, offset):
+        """ returns the byte range of the line containing offset """
+        start = self.buf.rfind(b'\n', 0, offset) + 1
+        end = self.buf.find(b'\n', offset)
+        end = len(self.buf) if end == -1 else end + 1
+        return start, end
+
+    def line(self, offset):
+        """ returns the decoded line containing the byte offset """
+        start, end = self.line_bounds(offset)
+        return self.buf[start:end].decode('utf8', errors=self.errors)
+
+    def count_newlines(self, start, end, blocksize=2 ** 24):
+        """ counts newlines in buf[start:end] without copying it at once """
+        num = 0
+        for x in range(start, end, blocksize):
+            num += self.buf[x:min(x + blocksize, end)].count(b'\n')
+        return num
+
+    def finditer_lines(self, regex):
+        """
+        Yields (line_index, line) for each match of a bytes regex, in match
+        order. Line indices are counted incrementally between matches.
+        """
+        lx = 0
+        last_offset = 0
+        size = len(self.buf)
+        for match in regex.finditer(self.buf):
+            offset = match.start()
+            if offset >= size:
+                break
+            lx += self.count_newlines(last_offset, offset)
+            last_offset = offset
+            yield lx, self.line(offset)
+
+
 # aliases
 readfrom = read_from
 writeto = write_to
@@ -233,25 +653,29 @@ save_text = write_to
 load_text = read_from
 
 
-def save_json(fpath, data, **kwargs):
+def save_json(fpath, data, verbose=None, atomic=None, lock=False, **kwargs):
     import utool as ut
     json_data = ut.to_json(data, **kwargs)
-    ut.save_text(fpath, json_data)
+    ut.save_text(fpath, json_data, verbose=verbose, atomic=atomic, lock=lock)
 
 
-def load_json(fpath):
+def load_json(fpath, verbose=None):
     import utool as ut
-    json_data = ut.load_text(fpath)
+    json_data = ut.load_text(fpath, verbose=verbose)
     data = ut.from_json(json_data)
     return data
 
 
-def save_cPkl(fpath, data, verbose=None, n=None):
-    """ Saves data to a pickled file with optional verbosity """
+def save_cPkl(fpath, data, verbose=None, n=None, atomic=None, lock=False):
+    """
+    Saves data to a pickled file with optional verbosity. With ``atomic``
+    the pickle is written to a temporary file and renamed into place, so
+    concurrent readers never load a truncated pickle.
+    """
     verbose = _rectify_verb_write(verbose)
     if verbose:
         print('[util_io] * save_cPkl(%r, data)' % (util_path.tail(fpath, n=n),))
-    with open(fpath, 'wb') as file_:
+    with _writer_context(fpath, atomic, lock, 'wb') as file_:
         # Use protocol 2 to support python2 and 3
         pickle.dump(data, file_, protocol=2)
 
@@ -387,16 +811,16 @@ def _python2_load_cpkl(fpath):
 
 
 def lock_and_load_cPkl(fpath, verbose=False):
-    with lockfile.LockFile(fpath + '.lock'):
+    with lock_file(fpath, shared=True):
         return load_cPkl(fpath, verbose)
 
 
 def lock_and_save_cPkl(fpath, data, verbose=False):
-    with lockfile.LockFile(fpath + '.lock'):
-        return save_cPkl(fpath, data, verbose)
+    return save_cPkl(fpath, data, verbose, atomic=True, lock=True)
 
 
-def save_hdf5(fpath, data, verbose=None, compression='lzf'):
+def save_hdf5(fpath, data, verbose=None, compression='lzf', atomic=None,
+              lock=False):
     r"""
     Restricted save of data using hdf5. Can only save ndarrays and dicts of
     ndarrays.
@@ -411,6 +835,8 @@ def save_hdf5(fpath, data, verbose=None, compression='lzf'):
             FLETCHER32 - error detection
             Scale-offset - integer / float scaling and truncation
             SZIP - fast and patented
+        atomic (bool): write to a temporary file and rename it over fpath
+        lock (bool): hold an exclusive :func:`lock_file` while writing
 
     CommandLine:
         python -m utool.util_io --test-save_hdf5
@@ -577,40 +1003,41 @@ def save_hdf5(fpath, data, verbose=None, compression='lzf'):
     #else:
     h5kw = {}
 
-    if isinstance(data, dict):
-        array_data = {key: val for key, val in data.items()
-                      if isinstance(val, (list, np.ndarray))}
-        attr_data = {key: val for key, val in data.items() if key not in array_data}
-
-        #assert all([
-        #    isinstance(vals, np.ndarray)
-        #    for vals in six.itervalues(data)
-        #]), ('can only save dicts as ndarrays')
-        # file_ = h5py.File(fpath, 'w', **h5kw)
-        with h5py.File(fpath, mode='w', **h5kw) as file_:
-            grp = file_.create_group(fname)
-            for key, val in six.iteritems(array_data):
-                val = np.asarray(val)
-                dset = grp.create_dataset(
-                    key, val.shape,  val.dtype, chunks=chunks,
-                    compression=compression)
-                dset[...] = val
-            for key, val in six.iteritems(attr_data):
-                grp.attrs[key] = val
-    else:
-        assert isinstance(data, np.ndarray)
-        shape = data.shape
-        dtype = data.dtype
-        #if verbose or (verbose is None and __PRINT_WRITES__):
-        #    print('[util_io] * save_hdf5(%r, data)' % (util_path.tail(fpath),))
-        # file_ = h5py.File(fpath, 'w', **h5kw)
-        with h5py.File(fpath, mode='w', **h5kw) as file_:
-            #file_.create_dataset(
-            #    fname, shape,  dtype, chunks=chunks, compression=compression,
-            #    data=data)
-            dset = file_.create_dataset(
-                fname, shape,  dtype, chunks=chunks, compression=compression)
-            dset[...] = data
+    with _writer_fpath_context(fpath, atomic, lock) as out_fpath:
+        if isinstance(data, dict):
+            array_data = {key: val for key, val in data.items()
+                          if isinstance(val, (list, np.ndarray))}
+            attr_data = {key: val for key, val in data.items() if key not in array_data}
+
+            #assert all([
+            #    isinstance(vals, np.ndarray)
+            #    for vals in six.itervalues(data)
+            #]), ('can only save dicts as ndarrays')
+            # file_ = h5py.File(fpath, 'w', **h5kw)
+            with h5py.File(out_fpath, mode='w', **h5kw) as file_:
+                grp = file_.create_group(fname)
+                for key, val in six.iteritems(array_data):
+                    val = np.asarray(val)
+                    dset = grp.create_dataset(
+                        key, val.shape,  val.dtype, chunks=chunks,
+                        compression=compression)
+                    dset[...] = val
+                for key, val in six.iteritems(attr_data):
+                    grp.attrs[key] = val
+        else:
+            assert isinstance(data, np.ndarray)
+            shape = data.shape
+            dtype = data.dtype
+            #if verbose or (verbose is None and __PRINT_WRITES__):
+            #    print('[util_io] * save_hdf5(%r, data)' % (util_path.tail(fpath),))
+            # file_ = h5py.File(fpath, 'w', **h5kw)
+            with h5py.File(out_fpath, mode='w', **h5kw) as file_:
+                #file_.create_dataset(
+                #    fname, shape,  dtype, chunks=chunks, compression=compression,
+                #    data=data)
+                dset = file_.create_dataset(
+                    fname, shape,  dtype, chunks=chunks, compression=compression)
+                dset[...] = data
 
 
 def load_hdf5(fpath, verbose=None):
@@ -714,11 +1141,17 @@ def load_numpy(fpath, mmap_mode=None, verbose=None):
     return np.load(fpath, mmap_mode=mmap_mode)
 
 
-def save_numpy(fpath, data, verbose=None, **kwargs):
+def save_numpy(fpath, data, verbose=None, atomic=None, lock=False, **kwargs):
     verbose = _rectify_verb_write(verbose)
     if verbose:
         print('[util_io] * save_numpy(%r, data)' % util_path.tail(fpath))
-    return np.save(fpath, data)
+    if not _rectify_atomic(atomic) and not lock:
+        return np.save(fpath, data)
+    if not fpath.endswith('.npy'):
+        # np.save only appends the extension when given a path
+        fpath = fpath + '.npy'
+    with _writer_context(fpath, atomic, lock, 'wb') as file_:
+        np.save(file_, data)
 
 
 #def save_capnp(fpath, data, verbose=False):
@@ -3,9 +3,19 @@
 Module to executes the same function with different arguments in parallel.
 """
 from __future__ import absolute_import, division, print_function
+import collections
+import itertools as it
+import functools
+import math
+import os
+import shutil
+import tempfile
+import time
+import traceback
 import multiprocessing
+import multiprocessing.pool
 from concurrent import futures
-# import atexit
+import atexit
 #import sys
 import signal
 import ctypes
@@ -14,9 +24,12 @@ import threading
 from six.moves import map, range, zip  # NOQA
 from utool._internal.meta_util_six import get_funcname
 from utool import util_progress
+from utool import util_iter
+from utool import util_time
 from utool import util_arg
 from utool import util_inject
 from utool import util_cplat
+from six.moves import cPickle as pickle
 if six.PY2:
     # import thread as _thread
     import Queue as queue
@@ -47,10 +60,20 @@ __MIN_PARALLEL_TASKS__ = 4
 if util_cplat.WIN32:
     __MIN_PARALLEL_TASKS__ = 16
 
+# Rough cost model used by generate2(adaptive=True)
+# Seconds to start a fresh process pool (see the generate2 doctests)
+__POOL_STARTUP_SECONDS__ = 0.1
+if util_cplat.WIN32:
+    __POOL_STARTUP_SECONDS__ = 0.5
+# Seconds of fixed overhead for each chunk sent through a process pool
+__POOL_ROUNDTRIP_SECONDS__ = 2E-4
+
 
 def generate2(func, args_gen, kw_gen=None, ntasks=None, ordered=True,
               force_serial=False, use_pool=False, chunksize=None, nprocs=None,
-              progkw={}, nTasks=None, verbose=None, use_futures_thread=False):
+              progkw={}, nTasks=None, verbose=None, use_futures_thread=False,
+              stream=False, window=None, use_shared_pool=False,
+              adaptive=False, use_shared_memory=False):
     r"""
     Interfaces to either multiprocessing or futures.
     Esentially maps ``args_gen`` onto ``func`` using pool.imap.
@@ -72,6 +95,30 @@ def generate2(func, args_gen, kw_gen=None, ntasks=None, ordered=True,
         ordered (bool): (default = True)
         force_serial (bool): (default = False)
         verbose (bool):  verbosity flag(default = None)
+        stream (bool): if True ``args_gen`` is consumed lazily and tasks are
+            sent to the workers in chunks of ``chunksize``. At most
+            ``window`` chunks are in flight at any time, so memory is bounded
+            regardless of the number of tasks. Always uses futures
+            (``use_pool`` is ignored). (default = False)
+        window (int): maximum number of in-flight chunks when ``stream`` is
+            True. Defaults to twice the number of processes.
+        use_shared_pool (bool): if True the workers come from the warm
+            process-global pool (see :func:`get_shared_pool`) instead of a
+            fresh pool that is torn down afterwards. Because there is no
+            startup cost, small batches are also run in parallel.
+            (default = False)
+        adaptive (bool): if True the first few tasks are timed in-process,
+            along with the cost of pickling their args and results. The rest
+            are then run serially, on a thread pool, or on a process pool
+            (with a chunksize) depending on which is estimated to be fastest.
+            The choice and its reasoning are printed if verbose.
+            (default = False)
+        use_shared_memory (bool): if True, large ndarrays in the arguments and
+            results of process workers are passed through memory-mapped files
+            in shared memory (``/dev/shm`` when available) and only small
+            handles are pickled. Workers map arguments copy-on-write and the
+            same array object is only shared once per call. Files are deleted
+            as soon as the tasks using them return. (default = False)
 
     CommandLine:
         python -m utool.util_parallel generate2
@@ -113,6 +160,51 @@ def generate2(func, args_gen, kw_gen=None, ntasks=None, ordered=True,
         >>> assert flag_list0 == flag_list1
         >>> assert flag_list0 == flag_list2
 
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> # Streaming mode never materializes the input generator
+        >>> import utool as ut
+        >>> num = 500
+        >>> args_gen = ((x,) for x in range(num))
+        >>> flag_list0 = [ut.is_prime(x) for x in range(num)]
+        >>> flag_list1 = list(ut.generate2(ut.is_prime, args_gen, stream=True,
+        >>>                                chunksize=16, window=4, verbose=0))
+        >>> flag_list2 = list(ut.generate2(ut.is_prime, zip(range(num)),
+        >>>                                stream=True, ordered=False,
+        >>>                                use_futures_thread=True, verbose=0))
+        >>> assert flag_list0 == flag_list1
+        >>> assert sorted(flag_list0) == sorted(flag_list2)
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> # Repeated calls reuse the same warm workers
+        >>> import utool as ut
+        >>> for _ in range(3):
+        >>>     flags = list(ut.generate2(ut.is_prime, zip(range(8)), nprocs=2,
+        >>>                               use_shared_pool=True, verbose=0))
+        >>>     assert flags == [ut.is_prime(x) for x in range(8)]
+        >>> ut.shutdown_shared_pools()
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> # Cheap functions are not worth sending to other processes
+        >>> import utool as ut
+        >>> num = 2000
+        >>> flags = list(ut.generate2(ut.is_prime, zip(range(num)), nprocs=2,
+        >>>                           adaptive=True, verbose=1))
+        >>> assert flags == [ut.is_prime(x) for x in range(num)]
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> # Large arrays are passed by handle instead of being pickled
+        >>> import utool as ut
+        >>> import numpy as np
+        >>> imgs = [np.full((256, 256), i, dtype=np.float64) for i in range(6)]
+        >>> sums = list(ut.generate2(np.multiply, zip(imgs, [2] * 6), nprocs=2,
+        >>>                          force_serial=False, use_shared_memory=True,
+        >>>                          verbose=0))
+        >>> assert all(np.all(x == i * 2) for i, x in enumerate(sums))
+
     Example1:
         >>> # ENABLE_DOCTEST
         >>> # Trying to recreate the freeze seen in IBEIS
@@ -205,86 +297,176 @@ def generate2(func, args_gen, kw_gen=None, ntasks=None, ordered=True,
         try:
             ntasks = len(args_gen)
         except TypeError:
-            # Cast to a list
-            args_gen = list(args_gen)
-            ntasks = len(args_gen)
-    if ntasks == 1 or ntasks < __MIN_PARALLEL_TASKS__:
+            if not stream:
+                # Cast to a list
+                args_gen = list(args_gen)
+                ntasks = len(args_gen)
+    # A warm pool has no startup overhead to amortize
+    min_tasks = 2 if use_shared_pool else __MIN_PARALLEL_TASKS__
+    # In stream mode ntasks may stay None (unknown length)
+    if ntasks is not None and (ntasks == 1 or ntasks < min_tasks):
         force_serial = True
     if __FORCE_SERIAL__:
         force_serial = __FORCE_SERIAL__
     if ntasks == 0:
         if verbose:
             print('[ut.generate2] submitted 0 tasks')
-        raise StopIteration
+        return
     if nprocs is None:
-        nprocs = min(ntasks, get_default_numprocs())
+        nprocs = get_default_numprocs()
+        if ntasks is not None and not use_shared_pool:
+            # (the shared pool keeps its size to avoid resizing churn)
+            nprocs = min(ntasks, nprocs)
     if nprocs == 1:
         force_serial = True
 
+    if stream:
+        # Never materialize keyword arguments either
+        if kw_gen is None:
+            kw_gen = it.repeat({})
+        elif isinstance(kw_gen, dict):
+            kw_gen = it.repeat(kw_gen)
     if kw_gen is None:
         kw_gen = [{}] * ntasks
     if isinstance(kw_gen, dict):
         # kw_gen can be a single dict applied to everything
         kw_gen = [kw_gen] * ntasks
 
-    if force_serial:
+    if adaptive and not force_serial:
+        for result in _generate_adaptive2(func, args_gen, kw_gen, ntasks,
+                                          ordered=ordered, nprocs=nprocs,
+                                          use_shared_pool=use_shared_pool,
+                                          use_shared_memory=use_shared_memory,
+                                          progkw=progkw, verbose=verbose):
+            yield result
+    elif force_serial:
         for result in _generate_serial2(func, args_gen, kw_gen,
                                         ntasks=ntasks, progkw=progkw,
                                         verbose=verbose):
             yield result
     else:
+        if stream:
+            use_pool = False
         if verbose:
             gentype = 'mp' if use_pool else 'futures'
+            if stream:
+                gentype += ' stream'
+            if use_shared_pool:
+                gentype += ' shared'
             fmtstr = '[generate2] executing {} {} tasks using {} {} procs'
-            print(fmtstr.format(ntasks, get_funcname(func), nprocs, gentype))
+            print(fmtstr.format('?' if ntasks is None else ntasks,
+                                get_funcname(func), nprocs, gentype))
 
+        progpart = None
         if verbose > 1:
             lbl = '(pargen) %s: ' % (get_funcname(func),)
             progkw_ = dict(freq=None, bs=True, adjust=False, freq_est='absolute')
             progkw_.update(progkw)
             # print('progkw_.update = {!r}'.format(progkw_.update))
-            progpart = util_progress.ProgPartial(length=ntasks, lbl=lbl, **progkw_)
-
-        if use_pool:
-            # Use multiprocessing
-            if chunksize is None:
-                chunksize = max(min(4, ntasks), min(8, ntasks // (nprocs ** 2)))
-
-            try:
-                pool = multiprocessing.Pool(nprocs)
-                if ordered:
-                    pmap_func = pool.imap
-                else:
-                    pmap_func = pool.imap_unordered
-
-                wrapped_arg_gen = zip([func] * len(args_gen), args_gen, kw_gen)
-                res_gen = pmap_func(_kw_wrap_worker, wrapped_arg_gen,
-                                    chunksize)
-                if verbose > 1:
-                    res_gen = progpart(res_gen)
-                for res in res_gen:
-                    yield res
-            finally:
+            progpart = util_progress.ProgPartial(length=ntasks or 0, lbl=lbl,
+                                                 **progkw_)
+
+        shm_manager = None
+        if use_shared_memory and not use_futures_thread:
+            shm_manager = _SharedArrayManager()
+            func, args_gen, kw_gen = shm_manager.wrap_tasks(func, args_gen,
+                                                            kw_gen)
+        try:
+            res_gen = _generate_parallel2(
+                func, args_gen, kw_gen, ntasks=ntasks, ordered=ordered,
+                use_pool=use_pool, chunksize=chunksize, nprocs=nprocs,
+                use_futures_thread=use_futures_thread, stream=stream,
+                window=window, use_shared_pool=use_shared_pool,
+                progpart=progpart)
+            for res in res_gen:
+                if shm_manager is not None:
+                    res = shm_manager.unpack(res)
+                yield res
+        finally:
+            if shm_manager is not None:
+                shm_manager.close()
+
+
+def _generate_parallel2(func, args_gen, kw_gen, ntasks=None, ordered=True,
+                        use_pool=False, chunksize=None, nprocs=None,
+                        use_futures_thread=False, stream=False, window=None,
+                        use_shared_pool=False, progpart=None):
+    """ internal parallel generator. Dispatches to a pool or executor """
+    if stream:
+        if chunksize is None:
+            if ntasks is None:
+                chunksize = 8
+            else:
+                chunksize = max(1, min(64, ntasks // (nprocs * 4)))
+        if window is None:
+            window = 2 * nprocs
+        executor = None
+        if use_shared_pool:
+            kind = 'thread' if use_futures_thread else 'process'
+            executor = get_shared_pool(kind, nprocs)
+        res_gen = _generate_stream2(func, args_gen, kw_gen,
+                                    ordered=ordered, chunksize=chunksize,
+                                    window=window, nprocs=nprocs,
+                                    use_futures_thread=use_futures_thread,
+                                    executor=executor)
+        if progpart is not None:
+            res_gen = progpart(res_gen)
+        for res in res_gen:
+            yield res
+    elif use_pool:
+        # Use multiprocessing
+        if chunksize is None:
+            chunksize = max(min(4, ntasks), min(8, ntasks // (nprocs ** 2)))
+
+        if use_shared_pool:
+            pool = get_shared_pool('pool', nprocs)
+        else:
+            pool = multiprocessing.Pool(nprocs)
+        try:
+            if ordered:
+                pmap_func = pool.imap
+            else:
+                pmap_func = pool.imap_unordered
+
+            wrapped_arg_gen = zip(it.repeat(func), args_gen, kw_gen)
+            res_gen = pmap_func(_kw_wrap_worker, wrapped_arg_gen,
+                                chunksize)
+            if progpart is not None:
+                res_gen = progpart(res_gen)
+            for res in res_gen:
+                yield res
+        finally:
+            if not use_shared_pool:
                 pool.close()
                 pool.join()
+    else:
+        # Use futures
+        if use_shared_pool:
+            kind = 'thread' if use_futures_thread else 'process'
+            executor = get_shared_pool(kind, nprocs)
         else:
             if use_futures_thread:
                 executor_cls = futures.ThreadPoolExecutor
             else:
                 executor_cls = futures.ProcessPoolExecutor
-            # Use futures
             executor = executor_cls(nprocs)
-            try:
-                fs_list = [executor.submit(func, *a, **k)
-                           for a, k in zip(args_gen, kw_gen)]
-                fs_gen = fs_list
-                if not ordered:
-                    fs_gen = futures.as_completed(fs_gen)
-                if verbose > 1:
-                    fs_gen = progpart(fs_gen)
-                for fs in fs_gen:
-                    yield fs.result()
-            finally:
+        fs_list = []
+        try:
+            fs_list = [executor.submit(func, *a, **k)
+                       for a, k in zip(args_gen, kw_gen)]
+            fs_gen = fs_list
+            if not ordered:
+                fs_gen = futures.as_completed(fs_gen)
+            if progpart is not None:
+                fs_gen = progpart(fs_gen)
+            for fs in fs_gen:
+                yield fs.result()
+        finally:
+            if use_shared_pool:
+                # Keep the workers warm, but drop our queued tasks
+                for fs in fs_list:
+                    fs.cancel()
+            else:
                 executor.shutdown(wait=True)
 
 
@@ -293,6 +475,353 @@ def _kw_wrap_worker(func_args_kw):
     return func(*args, **kw)
 
 
+def _chunk_worker(func, chunk):
+    """ executes a chunk of (args, kw) tasks in a single worker round trip """
+    return [func(*args, **kw) for args, kw in chunk]
+
+
+def _generate_stream2(func, args_gen, kw_gen, ordered=True, chunksize=1,
+                      window=2, nprocs=None, use_futures_thread=False,
+                      executor=None):
+    """
+    internal streaming parallel generator
+
+    Tasks are pulled lazily from ``args_gen`` and grouped into chunks of
+    ``chunksize``. At most ``window`` chunks are submitted at once, so the
+    number of live arguments, futures, and results is bounded by
+    ``window * chunksize`` no matter how long the input is.
+
+    If ``executor`` is given it is used as is and left running afterwards.
+    """
+    owns_executor = executor is None
+    if owns_executor:
+        if use_futures_thread:
+            executor_cls = futures.ThreadPoolExecutor
+        else:
+            executor_cls = futures.ProcessPoolExecutor
+        executor = executor_cls(nprocs)
+    window = max(1, window)
+    chunk_gen = util_iter.ichunks(zip(args_gen, kw_gen), chunksize)
+    inflight = collections.deque() if ordered else set()
+    try:
+        if ordered:
+            for chunk in chunk_gen:
+                inflight.append(executor.submit(_chunk_worker, func, chunk))
+                if len(inflight) >= window:
+                    for res in inflight.popleft().result():
+                        yield res
+            while inflight:
+                for res in inflight.popleft().result():
+                    yield res
+        else:
+            for chunk in chunk_gen:
+                inflight.add(executor.submit(_chunk_worker, func, chunk))
+                if len(inflight) >= window:
+                    done, inflight = futures.wait(
+                        inflight, return_when=futures.FIRST_COMPLETED)
+                    for fs in done:
+                        for res in fs.result():
+                            yield res
+            for fs in futures.as_completed(inflight):
+                for res in fs.result():
+                    yield res
+    finally:
+        # Dont run queued chunks if the consumer stopped early
+        for fs in inflight:
+            fs.cancel()
+        if owns_executor:
+            executor.shutdown(wait=True)
+
+
+# ndarrays smaller than this are cheaper to pickle than to share
+__SHM_MIN_NBYTES__ = 2 ** 16
+
+
+class _SharedArrayRef(object):
+    """ picklable handle to an ndarray stored in a memory-mapped file """
+    def __init__(self, fpath, shape, dtype):
+        self.fpath = fpath
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return (self.fpath, self.shape, self.dtype)
+
+    def __setstate__(self, state):
+        self.fpath, self.shape, self.dtype = state
+
+
+def _get_shared_memory_dpath():
+    """ prefer ram-backed storage when the platform has it """
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return None
+
+
+def _map_arrays(data, func, leaf_type):
+    """ applies func to every leaf_type item in nested tuples, lists, dicts """
+    if isinstance(data, leaf_type):
+        return func(data)
+    elif type(data) is tuple:
+        return tuple(_map_arrays(item, func, leaf_type) for item in data)
+    elif type(data) is list:
+        return [_map_arrays(item, func, leaf_type) for item in data]
+    elif type(data) is dict:
+        return {key: _map_arrays(val, func, leaf_type)
+                for key, val in data.items()}
+    return data
+
+
+def _write_shared_array(arr, dpath):
+    """ copies an ndarray into a new file in dpath and returns its handle """
+    import numpy as np
+    fd, fpath = tempfile.mkstemp(prefix='arr_', suffix='.dat', dir=dpath)
+    os.close(fd)
+    mmap = np.memmap(fpath, dtype=arr.dtype, mode='w+', shape=arr.shape)
+    mmap[...] = arr
+    del mmap
+    return _SharedArrayRef(fpath, arr.shape, arr.dtype)
+
+
+def _read_shared_array(ref, mode='c'):
+    import numpy as np
+    mmap = np.memmap(ref.fpath, dtype=ref.dtype, mode=mode, shape=ref.shape)
+    return mmap.view(np.ndarray)
+
+
+def _is_shareable(arr, min_nbytes):
+    return arr.nbytes >= min_nbytes and not arr.dtype.hasobject
+
+
+def _shm_worker(func, dpath, min_nbytes, args, kw):
+    """
+    worker side of use_shared_memory. Maps the argument arrays (copy on write)
+    and writes large result arrays to new files in dpath.
+
+    Returns:
+        tuple: (used_fpaths, result)
+    """
+    import numpy as np
+    used = []
+
+    def _attach(ref):
+        used.append(ref.fpath)
+        return _read_shared_array(ref, mode='c')
+
+    def _share(arr):
+        if _is_shareable(arr, min_nbytes):
+            return _write_shared_array(arr, dpath)
+        return arr
+
+    args = _map_arrays(args, _attach, _SharedArrayRef)
+    kw = _map_arrays(kw, _attach, _SharedArrayRef)
+    result = func(*args, **kw)
+    result = _map_arrays(result, _share, np.ndarray)
+    return used, result
+
+
+class _SharedArrayManager(object):
+    """
+    Owns the files that carry ndarrays between generate2 and its workers.
+
+    Argument files are reference counted by task and deleted once every task
+    using them has returned. Result files written by workers are mapped into
+    the caller (and immediately unlinked on posix, so their lifetime is that
+    of the returned array). Everything left over is removed by close.
+    """
+    def __init__(self, min_nbytes=None):
+        if min_nbytes is None:
+            min_nbytes = __SHM_MIN_NBYTES__
+        self.min_nbytes = min_nbytes
+        self.dpath = tempfile.mkdtemp(prefix='utool_shm_',
+                                      dir=_get_shared_memory_dpath())
+        # fpath -> [refcount, array]. Keeping the array alive keeps its id
+        # stable so the same object is only written once.
+        self._refs = {}
+        self._id_to_fpath = {}
+
+    def wrap_tasks(self, func, args_gen, kw_gen):
+        """ returns a worker func and lazily packed (args, kw) generators """
+        worker = functools.partial(_shm_worker, func, self.dpath,
+                                   self.min_nbytes)
+        packed_gen = (self._pack(args, kw) for args, kw in zip(args_gen, kw_gen))
+        return worker, packed_gen, it.repeat({})
+
+    def _pack(self, args, kw):
+        import numpy as np
+
+        def _share(arr):
+            if not _is_shareable(arr, self.min_nbytes):
+                return arr
+            fpath = self._id_to_fpath.get(id(arr), None)
+            if fpath is None:
+                ref = _write_shared_array(arr, self.dpath)
+                fpath = ref.fpath
+                self._id_to_fpath[id(arr)] = fpath
+                self._refs[fpath] = [0, arr, ref]
+            entry = self._refs[fpath]
+            entry[0] += 1
+            return entry[2]
+        args = _map_arrays(tuple(args), _share, np.ndarray)
+        kw = _map_arrays(kw, _share, np.ndarray)
+        return (args, kw)
+
+    def unpack(self, packed_result):
+        used, result = packed_result
+        for fpath in used:
+            entry = self._refs[fpath]
+            entry[0] -= 1
+            if entry[0] == 0:
+                del self._id_to_fpath[id(entry[1])]
+                del self._refs[fpath]
+                _remove_shared_file(fpath)
+        return _map_arrays(result, self._attach_result, _SharedArrayRef)
+
+    def _attach_result(self, ref):
+        if util_cplat.WIN32:
+            # Open files cannot be removed on windows
+            arr = _read_shared_array(ref, mode='r').copy()
+        else:
+            arr = _read_shared_array(ref, mode='r+')
+        _remove_shared_file(ref.fpath)
+        return arr
+
+    def close(self):
+        self._refs.clear()
+        self._id_to_fpath.clear()
+        shutil.rmtree(self.dpath, ignore_errors=True)
+
+
+def _remove_shared_file(fpath):
+    try:
+        os.remove(fpath)
+    except OSError:
+        pass
+
+
+def _generate_adaptive2(func, args_gen, kw_gen, ntasks=None, ordered=True,
+                        nprocs=None, use_shared_pool=False,
+                        use_shared_memory=False, progkw={}, verbose=None,
+                        max_samples=3, sample_seconds=0.05):
+    """
+    internal generator that measures before choosing how to execute
+
+    A few tasks are timed in-process, then (if it could pay off) a few more
+    are run concurrently on threads to see if ``func`` releases the GIL. The
+    remaining tasks are dispatched to the mode with the lowest estimated
+    total time.
+    """
+    funcname = get_funcname(func)
+    args_iter = iter(args_gen)
+    kw_iter = iter(kw_gen)
+    task_times = []
+    pickle_times = []
+    picklable = True
+    try:
+        pickle.dumps(func, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        picklable = False
+    # Time the first few tasks in this process
+    while len(task_times) < max_samples and sum(task_times) < sample_seconds:
+        try:
+            args = next(args_iter)
+        except StopIteration:
+            return
+        kw = next(kw_iter)
+        tstart = util_time.default_timer()
+        result = func(*args, **kw)
+        task_times.append(util_time.default_timer() - tstart)
+        if picklable:
+            tstart = util_time.default_timer()
+            try:
+                pickle.dumps((args, kw, result),
+                             protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                picklable = False
+            pickle_times.append(util_time.default_timer() - tstart)
+        yield result
+    nsampled = len(task_times)
+    t_task = sum(task_times) / nsampled
+    t_pickle = sum(pickle_times) / max(len(pickle_times), 1)
+    if ntasks is None:
+        # Unknown length: assume the input is long
+        nleft = None
+        nleft_est = 64 * nprocs
+    else:
+        nleft = nleft_est = ntasks - nsampled
+        if nleft <= 0:
+            return
+
+    # Aim for chunks that are long compared to the pool round trip, while
+    # still giving every worker several chunks.
+    chunksize = int(math.ceil(10 * __POOL_ROUNDTRIP_SECONDS__ /
+                              max(t_task + t_pickle, 1E-9)))
+    chunksize = max(1, min(chunksize, nleft_est // (4 * nprocs)))
+    startup = 0 if use_shared_pool else __POOL_STARTUP_SECONDS__
+    est_serial = nleft_est * t_task
+    est_process = float('inf')
+    if picklable and nprocs > 1:
+        nchunks = math.ceil(nleft_est / chunksize)
+        est_process = startup + (
+            nleft_est * (t_task + 2 * t_pickle) +
+            nchunks * __POOL_ROUNDTRIP_SECONDS__) / nprocs
+    est_thread = float('inf')
+    thread_speedup = None
+    if nprocs > 1 and nleft_est >= 2 * nprocs and est_serial > startup:
+        # Only probe threads when parallelism could pay off at all
+        nprobe = nprocs
+        probe_args = list(it.islice(args_iter, nprobe))
+        probe_kws = list(it.islice(kw_iter, len(probe_args)))
+        with futures.ThreadPoolExecutor(len(probe_args)) as executor:
+            tstart = util_time.default_timer()
+            probe_fs = [executor.submit(func, *a, **k)
+                        for a, k in zip(probe_args, probe_kws)]
+            probe_results = [fs.result() for fs in probe_fs]
+            probe_time = util_time.default_timer() - tstart
+        for result in probe_results:
+            yield result
+        nprobe = len(probe_results)
+        if nprobe < len(probe_fs) or nprobe == 0:
+            return
+        if nleft is not None:
+            nleft -= nprobe
+            nleft_est = nleft
+            est_serial = nleft_est * t_task
+        if nleft == 0:
+            return
+        thread_speedup = (nprobe * t_task) / max(probe_time, 1E-9)
+        thread_speedup = max(min(thread_speedup, nprocs), 1E-3)
+        est_thread = nleft_est * t_task / thread_speedup
+
+    estimates = {'serial': est_serial, 'thread': est_thread,
+                 'process': est_process}
+    mode = min(['serial', 'thread', 'process'], key=estimates.get)
+    if verbose:
+        print('[generate2] adaptive: using %s for %s remaining %s tasks '
+              '(chunksize=%d)' % (mode, '?' if nleft is None else nleft,
+                                  funcname, chunksize))
+        print('[generate2] adaptive: task=%.2es pickle=%.2es '
+              'thread_speedup=%s picklable=%r nprocs=%d' % (
+                  t_task, t_pickle,
+                  'n/a' if thread_speedup is None else
+                  '%.2f' % (thread_speedup,), picklable, nprocs))
+        print('[generate2] adaptive: estimated seconds serial=%.3g '
+              'thread=%.3g process=%.3g' % (est_serial, est_thread,
+                                            est_process))
+    if mode == 'serial':
+        res_gen = _generate_serial2(func, args_iter, kw_iter, ntasks=nleft,
+                                    progkw=progkw, verbose=verbose)
+    else:
+        res_gen = generate2(func, args_iter, kw_iter, ntasks=nleft,
+                            ordered=ordered, chunksize=chunksize,
+                            nprocs=nprocs, progkw=progkw, verbose=verbose,
+                            use_futures_thread=(mode == 'thread'),
+                            stream=True, use_shared_pool=use_shared_pool,
+                            use_shared_memory=use_shared_memory)
+    for result in res_gen:
+        yield result
+
+
 def _generate_serial2(func, args_gen, kw_gen=None, ntasks=None, progkw={},
                       verbose=None, nTasks=None):
     """ internal serial generator  """
@@ -301,16 +830,20 @@ def _generate_serial2(func, args_gen, kw_gen=None, ntasks=None, progkw={},
     if ntasks is None:
         ntasks = nTasks
     if ntasks is None:
-        ntasks = len(args_gen)
+        try:
+            ntasks = len(args_gen)
+        except TypeError:
+            # streamed input of unknown length
+            ntasks = 0
     if verbose > 0:
-        print('[ut._generate_serial2] executing %d %s tasks in serial' %
-                (ntasks, get_funcname(func)))
+        print('[ut._generate_serial2] executing %s %s tasks in serial' %
+                (ntasks or '?', get_funcname(func)))
 
     # kw_gen can be a single dict applied to everything
     if kw_gen is None:
-        kw_gen = [{}] * ntasks
+        kw_gen = it.repeat({})
     if isinstance(kw_gen, dict):
-        kw_gen = [kw_gen] * ntasks
+        kw_gen = it.repeat(kw_gen)
 
     # Get iterator with or without progress
     if verbose > 1:
@@ -360,6 +893,119 @@ def init_worker():
     signal.signal(signal.SIGINT, signal.SIG_IGN)
 
 
+# Maximum number of concurrent buffered_generator producers on the shared pool
+__MAX_SHARED_PRODUCERS__ = 32
+
+# Process-global warm worker pools. Maps a key to (owner_pid, nprocs, pool)
+__SHARED_POOLS__ = {}
+__SHARED_POOL_LOCK__ = threading.RLock()
+
+
+def get_shared_pool(kind='process', nprocs=None, key=None):
+    r"""
+    Returns a warm worker pool that is reused across calls.
+
+    The pool is created lazily on first use. It is recreated if the requested
+    number of workers changes (by default it follows
+    :func:`get_default_numprocs`), if a crashed worker broke it, or if the
+    current process was forked from the one that created it. All shared pools
+    are shut down at exit.
+
+    Args:
+        kind (str): 'process' or 'thread' for a concurrent.futures executor,
+            or 'pool' for a multiprocessing.Pool (default = 'process')
+        nprocs (int): number of workers (default = get_default_numprocs())
+        key (str): name of the pool in the registry (default = kind)
+
+    Returns:
+        concurrent.futures.Executor or multiprocessing.pool.Pool
+
+    CommandLine:
+        python -m utool.util_parallel get_shared_pool
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_parallel import *  # NOQA
+        >>> pool1 = get_shared_pool('thread', nprocs=2)
+        >>> pool2 = get_shared_pool('thread', nprocs=2)
+        >>> pool3 = get_shared_pool('thread', nprocs=3)
+        >>> assert pool1 is pool2
+        >>> assert pool3 is not pool1
+        >>> assert pool3.submit(sum, [1, 2]).result() == 3
+        >>> shutdown_shared_pools()
+    """
+    if nprocs is None:
+        nprocs = get_default_numprocs()
+    if key is None:
+        key = kind
+    pid = os.getpid()
+    with __SHARED_POOL_LOCK__:
+        entry = __SHARED_POOLS__.get(key, None)
+        if entry is not None:
+            owner_pid, size, pool = entry
+            if owner_pid != pid:
+                # Inherited through fork. The workers belong to the parent.
+                entry = None
+            elif size != nprocs or _is_pool_broken(pool):
+                _shutdown_pool(pool)
+                entry = None
+        if entry is None:
+            if kind == 'process':
+                pool = futures.ProcessPoolExecutor(nprocs)
+            elif kind == 'thread':
+                pool = futures.ThreadPoolExecutor(nprocs)
+            elif kind == 'pool':
+                pool = multiprocessing.Pool(nprocs)
+            else:
+                raise ValueError('Unknown kind=%r' % (kind,))
+            __SHARED_POOLS__[key] = (pid, nprocs, pool)
+        return pool
+
+
+def shutdown_shared_pools(wait=True):
+    """
+    Shuts down all pools created by :func:`get_shared_pool`. They will be
+    recreated on next use. Registered to run at exit.
+    """
+    pid = os.getpid()
+    with __SHARED_POOL_LOCK__:
+        entries = list(__SHARED_POOLS__.values())
+        __SHARED_POOLS__.clear()
+    for owner_pid, size, pool in entries:
+        if owner_pid == pid:
+            _shutdown_pool(pool, wait=wait)
+
+
+def _is_pool_broken(pool):
+    if isinstance(pool, multiprocessing.pool.Pool):
+        return pool._state != multiprocessing.pool.RUN
+    return bool(getattr(pool, '_broken', False) or
+                getattr(pool, '_shutdown_thread', False) or
+                getattr(pool, '_shutdown', False))
+
+
+def _shutdown_pool(pool, wait=True):
+    if isinstance(pool, multiprocessing.pool.Pool):
+        if pool._state == multiprocessing.pool.RUN:
+            pool.close()
+        if wait:
+            pool.join()
+    else:
+        pool.shutdown(wait=wait)
+
+
+def _forget_shared_pools():
+    """ fork handler: a child must never touch its parents workers """
+    global __SHARED_POOL_LOCK__
+    __SHARED_POOL_LOCK__ = threading.RLock()
+    __SHARED_POOLS__.clear()
+
+
+atexit.register(shutdown_shared_pools)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_shared_pools)
+
+
 def __testwarp(tup):
     # THIS DOES NOT CAUSE A PROBLEM FOR SOME FREAKING REASON
     import cv2
@@ -682,7 +1328,8 @@ def _test_buffered_generator_img():
     #_test_buffered_generator_general2(bgfunc, args, sleepfunc_bufwin, target_looptime, serial_cheat, buffer_size=4, show_serial=True)
 
 
-def buffered_generator(source_gen, buffer_size=2, use_multiprocessing=False):
+def buffered_generator(source_gen, buffer_size=2, use_multiprocessing=False,
+                       use_shared_pool=False):
     r"""
     Generator that runs a slow source generator in a separate process.
 
@@ -695,10 +1342,14 @@ def buffered_generator(source_gen, buffer_size=2, use_multiprocessing=False):
             (length of the buffer) (default = 2)
         use_multiprocessing (bool): if False uses GIL-hindered threading
             instead of multiprocessing (defualt = False).
+        use_shared_pool (bool): if True (and threading is used) the producer
+            runs on a reused thread from the process-global pool instead of
+            a newly spawned thread (default = False).
 
     Note:
         use_multiprocessing = True seems to freeze if passed in a generator
-        built by six.moves.map.
+        built by six.moves.map. Use :func:`buffered_map` to prefetch in
+        background processes instead.
 
     References:
         Taken from Sander Dieleman's data augmentation pipeline
@@ -732,6 +1383,18 @@ def buffered_generator(source_gen, buffer_size=2, use_multiprocessing=False):
         >>> assert result3 == result2, 'inconsistent results'
         >>> assert result1 == result2, 'inconsistent results'
 
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_parallel import *  # NOQA
+        >>> import utool as ut
+        >>> data = list(range(100))
+        >>> gen = buffered_generator(map(ut.is_prime, data), use_shared_pool=True)
+        >>> assert list(gen) == list(map(ut.is_prime, data))
+        >>> # closing early releases the shared worker
+        >>> gen = buffered_generator(map(ut.is_prime, data), use_shared_pool=True)
+        >>> first = next(gen)
+        >>> gen.close()
+
     Example1:
         >>> # DISABLE_DOCTEST
         >>> # VERYSLLOOWWW_DOCTEST
@@ -742,7 +1405,8 @@ def buffered_generator(source_gen, buffer_size=2, use_multiprocessing=False):
         raise RuntimeError("Minimal buffer_ size is 2!")
 
     if use_multiprocessing:
-        print('WARNING seems to freeze if passed in a generator')
+        print('WARNING seems to freeze if passed in a generator. '
+              'Use ut.buffered_map instead')
         #assert False, 'dont use this buffered multiprocessing'
         if False:
             pool = multiprocessing.Pool(processes=get_default_numprocs(),
@@ -768,21 +1432,35 @@ def buffered_generator(source_gen, buffer_size=2, use_multiprocessing=False):
     # process. A reasonable hack is to use the StopIteration exception instead
     sentinal = StopIteration
 
-    process = Process(
-        target=target,
-        args=(iter(source_gen), buffer_, sentinal)
-    )
-    #if not use_multiprocessing:
-    process.daemon = True
+    stop_event = None
+    if use_shared_pool and not use_multiprocessing:
+        # Each live producer occupies one worker, so this pool is not tied to
+        # the number of cpus. Threads are only spawned as needed.
+        stop_event = threading.Event()
+        executor = get_shared_pool('thread', __MAX_SHARED_PRODUCERS__,
+                                   key='buffered_generator')
+        executor.submit(target, iter(source_gen), buffer_, sentinal,
+                        stop_event)
+    else:
+        process = Process(
+            target=target,
+            args=(iter(source_gen), buffer_, sentinal)
+        )
+        #if not use_multiprocessing:
+        process.daemon = True
 
-    process.start()
+        process.start()
 
-    while True:
-        #output = buffer_.get(timeout=1.0)
-        output = buffer_.get()
-        if output is sentinal:
-            raise StopIteration
-        yield output
+    try:
+        while True:
+            #output = buffer_.get(timeout=1.0)
+            output = buffer_.get()
+            if output is sentinal:
+                return
+            yield output
+    finally:
+        if stop_event is not None:
+            stop_event.set()
 
     #_iter = iter(buffer_.get, sentinal)
     #for data in _iter:
@@ -791,12 +1469,25 @@ def buffered_generator(source_gen, buffer_size=2, use_multiprocessing=False):
     #    yield data
 
 
-def _buffered_generation_thread(source_gen, buffer_, sentinal):
+def _buffered_generation_thread(source_gen, buffer_, sentinal,
+                                stop_event=None):
     """ helper for buffered_generator """
-    for data in source_gen:
-        buffer_.put(data, block=True)
-    # sentinel: signal the end of the iterator
-    buffer_.put(sentinal)
+    if stop_event is None:
+        for data in source_gen:
+            buffer_.put(data, block=True)
+        # sentinel: signal the end of the iterator
+        buffer_.put(sentinal)
+    else:
+        # Poll so a pooled worker is released when the consumer stops early
+        for data in it.chain(source_gen, [sentinal]):
+            while True:
+                if stop_event.is_set():
+                    return
+                try:
+                    buffer_.put(data, block=True, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
 
 
 def _buffered_generation_process(source_gen, buffer_, sentinal):
@@ -810,6 +1501,200 @@ def _buffered_generation_process(source_gen, buffer_, sentinal):
     buffer_.close()
 
 
+def buffered_map(func, args_list, kw=None, nprocs=None, buffer_size=None,
+                 ordered=True, flatten=False):
+    r"""
+    Prefetches ``func(*args, **kw)`` for every ``args`` in ``args_list`` in
+    ``nprocs`` background producer processes while the consumer works.
+
+    Unlike ``buffered_generator(use_multiprocessing=True)`` the source is a
+    picklable spec (a function and a list of argument tuples) instead of a
+    live generator, so it works with every multiprocessing start method.
+
+    Args:
+        func (function): picklable function producing one item (or a chunk
+            of items if ``flatten`` is True)
+        args_list (list): tuples of positional args, one per call
+        kw (dict): keyword arguments passed to every call (default = None)
+        nprocs (int): number of producer processes
+            (default = get_default_numprocs())
+        buffer_size (int): maximum number of calls that are running or
+            waiting to be consumed (default = 2 * nprocs)
+        ordered (bool): if False items are yielded as soon as they are
+            ready (default = True)
+        flatten (bool): if True each call returns an iterable whose items are
+            yielded individually (default = False)
+
+    Yields:
+        object: the results of ``func``
+
+    Raises:
+        Exception: the first exception raised by ``func`` is re-raised in the
+            consumer, with the producer's traceback attached as the cause.
+
+    CommandLine:
+        python -m utool.util_parallel buffered_map
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_parallel import *  # NOQA
+        >>> import utool as ut
+        >>> args_list = [(x,) for x in range(100)]
+        >>> result1 = list(buffered_map(ut.is_prime, args_list, nprocs=2))
+        >>> result2 = list(buffered_map(ut.is_prime, args_list, nprocs=2,
+        >>>                             ordered=False, buffer_size=3))
+        >>> assert result1 == [ut.is_prime(x) for x in range(100)]
+        >>> assert sorted(result1) == sorted(result2)
+        >>> # chunks of items
+        >>> chunks = list(buffered_map(range, [(0, 3), (3, 5)], flatten=True))
+        >>> assert chunks == [0, 1, 2, 3, 4]
+        >>> # early exit shuts the producers down
+        >>> gen = buffered_map(ut.is_prime, args_list, nprocs=2)
+        >>> first = next(gen)
+        >>> gen.close()
+        >>> # producer exceptions propagate
+        >>> args_list = [('1',), ('x',), ('3',)]
+        >>> ut.assert_raises(ValueError, list, buffered_map(int, args_list))
+    """
+    ntasks = len(args_list)
+    if ntasks == 0:
+        return
+    if kw is None:
+        kw = {}
+    if nprocs is None:
+        nprocs = get_default_numprocs()
+    nprocs = max(1, min(nprocs, ntasks))
+    if buffer_size is None:
+        buffer_size = 2 * nprocs
+    if buffer_size < 1:
+        raise ValueError('buffer_size must be at least 1')
+
+    task_queue = multiprocessing.Queue()
+    result_queue = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    procs = [
+        multiprocessing.Process(
+            target=_buffered_map_producer,
+            args=(func, kw, flatten, task_queue, result_queue, stop_event))
+        for _ in range(nprocs)
+    ]
+    for proc in procs:
+        proc.daemon = True
+        proc.start()
+
+    # Only hand out buffer_size tasks beyond what has been consumed. This
+    # bounds both the result queue and the reordering buffer.
+    nsubmitted = 0
+    nconsumed = 0
+    pending = {}
+    try:
+        while nconsumed < ntasks:
+            while nsubmitted < ntasks and nsubmitted - nconsumed < buffer_size:
+                task_queue.put((nsubmitted, args_list[nsubmitted]))
+                nsubmitted += 1
+            if ordered and nconsumed in pending:
+                index, ok, payload = pending.pop(nconsumed)
+            else:
+                index, ok, payload = _get_producer_result(result_queue, procs)
+                if ordered and index != nconsumed:
+                    pending[index] = (index, ok, payload)
+                    continue
+            if not ok:
+                ex, tb_text = payload
+                if ex is None:
+                    raise RuntimeError('buffered_map producer failed\n' +
+                                       tb_text)
+                six.raise_from(ex, _RemoteTraceback(tb_text))
+            nconsumed += 1
+            if flatten:
+                for item in payload:
+                    yield item
+            else:
+                yield payload
+    finally:
+        _shutdown_producers(procs, task_queue, result_queue, stop_event)
+
+
+class _RemoteTraceback(Exception):
+    def __init__(self, tb_text):
+        self.tb_text = tb_text
+
+    def __str__(self):
+        return self.tb_text
+
+
+def _buffered_map_producer(func, kw, flatten, task_queue, result_queue,
+                           stop_event):
+    """ helper for buffered_map. Runs in a producer process """
+    init_worker()
+    while not stop_event.is_set():
+        task = task_queue.get()
+        if task is None:
+            break
+        index, args = task
+        try:
+            result = func(*args, **kw)
+            if flatten:
+                result = list(result)
+            msg = (index, True, result)
+        except Exception as ex:
+            msg = (index, False, (ex, traceback.format_exc()))
+        # Pickle here so failures are reported instead of being lost in the
+        # queue feeder thread.
+        try:
+            data = pickle.dumps(msg, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            tb_text = traceback.format_exc()
+            if msg[1]:
+                tb_text = 'Cannot pickle result of task %d\n%s' % (index,
+                                                                   tb_text)
+            else:
+                tb_text = msg[2][1]
+            data = pickle.dumps((index, False, (None, tb_text)),
+                                protocol=pickle.HIGHEST_PROTOCOL)
+        result_queue.put(data)
+
+
+def _get_producer_result(result_queue, procs, poll=0.5):
+    """ waits for the next result, failing if a producer died silently """
+    while True:
+        try:
+            data = result_queue.get(timeout=poll)
+        except queue.Empty:
+            for proc in procs:
+                if not proc.is_alive() and proc.exitcode != 0:
+                    raise RuntimeError(
+                        'buffered_map producer pid=%r died with exitcode=%r' % (
+                            proc.pid, proc.exitcode))
+        else:
+            return pickle.loads(data)
+
+
+def _shutdown_producers(procs, task_queue, result_queue, stop_event,
+                        timeout=5.0):
+    """ stops producers even if the consumer exits early """
+    stop_event.set()
+    for _ in procs:
+        task_queue.put(None)
+    deadline = time.time() + timeout
+    while any(proc.is_alive() for proc in procs) and time.time() < deadline:
+        # Drain results so producers are not blocked flushing them on exit
+        try:
+            while True:
+                result_queue.get_nowait()
+        except queue.Empty:
+            pass
+        for proc in procs:
+            proc.join(0.01)
+    for proc in procs:
+        if proc.is_alive():
+            proc.terminate()
+            proc.join()
+    for queue_ in (task_queue, result_queue):
+        queue_.close()
+        queue_.cancel_join_thread()
+
+
 def spawn_background_process(func, *args, **kwargs):
     """
     Run a function in the background
@@ -18,6 +18,7 @@ import shutil
 import fnmatch
 import warnings
 import itertools
+import collections
 from utool.util_regex import extend_regex
 from utool import util_dbg
 from utool import util_progress
@@ -707,21 +708,244 @@ ensurefile = touch
 
 # ---File Copy---
 
-def _copy_worker(src, dst):
+# Per file result of copy_files_to / bulk_copy. status is 'copied',
+# 'skipped', or 'failed' (in which case error holds the exception).
+CopyResult = collections.namedtuple(
+    'CopyResult', ('src', 'dst', 'status', 'nbytes', 'seconds', 'error'))
+
+
+def _copy_file_data(src, dst):
+    """
+    Copies the contents of src to dst without passing them through Python
+    when the OS allows it. Uses copy_file_range (which can share blocks on
+    filesystems with reflinks), then sendfile, then a buffered copy.
+
+    Returns:
+        int: number of bytes copied
+    """
+    import errno
+    fallback_errnos = set([errno.EXDEV, errno.ENOSYS, errno.EINVAL,
+                           getattr(errno, 'EOPNOTSUPP', errno.EINVAL),
+                           getattr(errno, 'ENOTSUP', errno.EINVAL),
+                           errno.EBADF, errno.EPERM])
+    blocksize = 2 ** 23
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        nbytes = 0
+        for zerocopy in [getattr(os, 'copy_file_range', None),
+                         getattr(os, 'sendfile', None)]:
+            if zerocopy is None or not sys.platform.startswith('linux'):
+                continue
+            try:
+                while True:
+                    if zerocopy is os.sendfile:
+                        num = os.sendfile(outfd, infd, None, blocksize)
+                    else:
+                        num = zerocopy(infd, outfd, blocksize)
+                    if num == 0:
+                        return nbytes
+                    nbytes += num
+            except OSError as ex:
+                # Only fall back if nothing was written yet
+                if nbytes > 0 or ex.errno not in fallback_errnos:
+                    raise
+        shutil.copyfileobj(fsrc, fdst, blocksize)
+        return fdst.tell()
+
+
+def _is_identical_file(src, dst, skip_identical, hasher='sha1', src_stat=None):
+    """
+    Checks if dst already holds the same data as src.
+
+    Args:
+        skip_identical (str): 'size' compares sizes, 'mtime' compares sizes
+            and whole second modification times (like rsync), and 'hash'
+            compares sizes and file hashes.
+    """
     try:
-        shutil.copy2(src, dst)
+        dst_stat = os.stat(dst)
     except OSError:
         return False
-    except shutil.Error:
-        pass
-    return True
+    if src_stat is None:
+        src_stat = os.stat(src)
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if skip_identical == 'size':
+        return True
+    elif skip_identical == 'mtime':
+        return int(src_stat.st_mtime) == int(dst_stat.st_mtime)
+    elif skip_identical == 'hash':
+        return _file_hash(src, hasher) == _file_hash(dst, hasher)
+    else:
+        raise ValueError('unknown skip_identical=%r' % (skip_identical,))
+
+
+def _file_hash(fpath, hasher='sha1'):
+    from utool import util_hash
+    return util_hash.get_file_hash(fpath, blocksize=2 ** 20,
+                                   hasher=util_hash._rectify_hasher(hasher))
+
+
+def _bulk_copy_worker(src, dst, overwrite=False, skip_identical=None,
+                      verify=False, hasher='sha1'):
+    """ copies one file and returns its CopyResult """
+    import time
+    from utool import util_io
+    start = time.time()
+    try:
+        if isdir(dst):
+            dst = join(dst, basename(src))
+        src_stat = os.stat(src)
+        if exists(dst):
+            if os.path.samefile(src, dst):
+                # like shutil.copy2, refuse instead of truncating src
+                raise getattr(shutil, 'SameFileError', shutil.Error)(
+                    '%r and %r are the same file' % (src, dst))
+            skip = not overwrite
+            if overwrite and skip_identical is not None:
+                skip = _is_identical_file(src, dst, skip_identical, hasher,
+                                          src_stat)
+            if skip:
+                return CopyResult(src, dst, 'skipped', 0,
+                                  time.time() - start, None)
+        # Copy into a sibling temp file so a failed copy never leaves dst
+        # truncated
+        tmp_dst = util_io._temp_fpath(dst)
+        try:
+            nbytes = _copy_file_data(src, tmp_dst)
+            shutil.copystat(src, tmp_dst)
+            if verify and _file_hash(src, hasher) != _file_hash(tmp_dst, hasher):
+                raise IOError('checksum mismatch after copying %r to %r' % (
+                    src, dst))
+            util_io._atomic_rename(tmp_dst, dst)
+        except Exception:
+            if exists(tmp_dst):
+                os.remove(tmp_dst)
+            raise
+    except (IOError, OSError, shutil.Error) as ex:
+        return CopyResult(src, dst, 'failed', 0, time.time() - start, ex)
+    return CopyResult(src, dst, 'copied', nbytes, time.time() - start, None)
+
+
+def bulk_copy(src_fpath_list, dst_fpath_list, overwrite=False,
+              skip_identical=None, verify=False, hasher='sha1', nthreads=None,
+              use_shared_pool=False, verbose=True, lbl='copying'):
+    r"""
+    Copies files on a thread pool (copying is I/O bound) and reports the
+    aggregate throughput with a ProgIter.
+
+    Args:
+        src_fpath_list (list): files to copy
+        dst_fpath_list (list): destination file (or directory) paths
+        overwrite (bool): if False existing destinations are skipped
+        skip_identical (str): if overwrite is True, skip destinations that
+            are already identical by 'size', 'mtime', or 'hash'
+            (default = None)
+        verify (bool): hash the source and the copy after copying
+            (default = False)
+        hasher (str): hash algorithm used by skip_identical='hash' and verify
+        nthreads (int): number of copy threads (default = min(32, cpus + 4))
+        use_shared_pool (bool): use the warm process-global thread pool
+        verbose (bool): show progress and throughput
+
+    Returns:
+        list: a CopyResult for each file in input order
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_path import *  # NOQA
+        >>> import utool as ut
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_bulk_copy')
+        >>> ut.delete(dpath, verbose=False)
+        >>> src_dpath = ut.ensuredir(join(dpath, 'src'))
+        >>> dst_dpath = ut.ensuredir(join(dpath, 'dst'))
+        >>> src_fpath_list = [join(src_dpath, 'f%d.txt' % x) for x in range(5)]
+        >>> for x, fpath in enumerate(src_fpath_list):
+        >>>     ut.write_to(fpath, 'data' * x, verbose=False)
+        >>> dst_fpath_list = [join(dst_dpath, basename(f)) for f in src_fpath_list]
+        >>> results = bulk_copy(src_fpath_list, dst_fpath_list, verify=True,
+        >>>                     verbose=False)
+        >>> print([(r.status, r.nbytes) for r in results])
+        [('copied', 0), ('copied', 4), ('copied', 8), ('copied', 12), ('copied', 16)]
+        >>> results = bulk_copy(src_fpath_list, dst_fpath_list, overwrite=True,
+        >>>                     skip_identical='hash', verbose=False)
+        >>> print(set(r.status for r in results))
+        {'skipped'}
+        >>> results = bulk_copy([join(src_dpath, 'missing')], [dst_dpath], verbose=False)
+        >>> print(results[0].status)
+        failed
+        >>> results = bulk_copy(src_fpath_list[1:2], src_fpath_list[1:2],
+        >>>                     overwrite=True, verbose=False)
+        >>> print((results[0].status, ut.readfrom(src_fpath_list[1], verbose=False)))
+        ('failed', 'data')
+    """
+    from utool import util_parallel
+    assert len(dst_fpath_list) == len(src_fpath_list), 'bad correspondence'
+    if skip_identical not in [None, 'size', 'mtime', 'hash']:
+        raise ValueError('unknown skip_identical=%r' % (skip_identical,))
+    ntasks = len(src_fpath_list)
+    if nthreads is None:
+        nthreads = min(32, util_parallel.get_default_numprocs() + 4)
+    nthreads = max(1, min(nthreads, ntasks))
+
+    def _worker(src_dst):
+        return _bulk_copy_worker(src_dst[0], src_dst[1], overwrite=overwrite,
+                                 skip_identical=skip_identical, verify=verify,
+                                 hasher=hasher)
+    task_iter = zip(src_fpath_list, dst_fpath_list)
+    if ntasks == 0:
+        return []
+    if use_shared_pool:
+        executor = util_parallel.get_shared_pool('thread', nprocs=nthreads,
+                                                 key='bulk_copy')
+        result_iter = executor.map(_worker, task_iter)
+    else:
+        from concurrent import futures
+        executor = futures.ThreadPoolExecutor(nthreads)
+        result_iter = executor.map(_worker, task_iter)
+        # executor.map has already submitted everything
+        executor.shutdown(wait=False)
+    import time
+    start = time.time()
+    total_nbytes = 0
+    results = []
+    prog = util_progress.ProgIter(result_iter, length=ntasks, lbl=lbl,
+                                  adjust=True, enabled=verbose)
+    for result in prog:
+        results.append(result)
+        total_nbytes += result.nbytes
+        if verbose:
+            elapsed = max(time.time() - start, 1E-9)
+            prog.set_extra('%s/s' % (
+                util_str.byte_str2(total_nbytes / elapsed),))
+    if verbose:
+        elapsed = max(time.time() - start, 1E-9)
+        status_hist = collections.Counter([r.status for r in results])
+        print('[util_path] %s in %.2fs (%s/s) %s' % (
+            util_str.byte_str2(total_nbytes), elapsed,
+            util_str.byte_str2(total_nbytes / elapsed),
+            ', '.join(['%s=%d' % item for item in sorted(status_hist.items())])))
+    return results
 
 
 def copy_files_to(src_fpath_list, dst_dpath=None, dst_fpath_list=None,
-                  overwrite=False, verbose=True, veryverbose=False):
+                  overwrite=False, verbose=True, veryverbose=False,
+                  use_shared_pool=False, skip_identical=None, verify=False,
+                  nthreads=None):
     """
     parallel copier
 
+    Args:
+        use_shared_pool (bool): if True copies run on the warm process-global
+            thread pool (see ut.get_shared_pool) (default = False)
+        skip_identical (str): if overwrite is True, skip existing files that
+            are identical by 'size', 'mtime', or 'hash' (default = None)
+        verify (bool): checksum each copy against its source
+        nthreads (int): number of copy threads
+
+    Returns:
+        list: a CopyResult for each source file (see bulk_copy)
+
     Example:
         >>> # DISABLE_DOCTEST
         >>> from utool.util_path import *
@@ -735,9 +959,6 @@ def copy_files_to(src_fpath_list, dst_dpath=None, dst_fpath_list=None,
         >>> copy_files_to(src_fpath_list, dst_dpath, overwrite=overwrite,
         >>>               verbose=verbose)
     """
-    from utool import util_list
-    from utool import util_parallel
-
     if verbose:
         print('[util_path] +--- COPYING FILES ---')
         print('[util_path]  * len(src_fpath_list) = %r' % (len(src_fpath_list)))
@@ -751,28 +972,24 @@ def copy_files_to(src_fpath_list, dst_dpath=None, dst_fpath_list=None,
         assert dst_dpath is None, 'dst_dpath was specified but overrided'
         assert len(dst_fpath_list) == len(src_fpath_list), 'bad correspondence'
 
-    exists_list = list(map(exists, dst_fpath_list))
+    # Existence checks happen in the copy threads
+    results = bulk_copy(src_fpath_list, dst_fpath_list, overwrite=overwrite,
+                        skip_identical=skip_identical, verify=verify,
+                        nthreads=nthreads, use_shared_pool=use_shared_pool,
+                        verbose=verbose)
     if verbose:
-        print('[util_path]  * %d files already exist dst_dpath' % (
-            sum(exists_list),))
-    if not overwrite:
-        notexists_list = util_list.not_list(exists_list)
-        dst_fpath_list_ = util_list.compress(dst_fpath_list, notexists_list)
-        src_fpath_list_ = util_list.compress(src_fpath_list, notexists_list)
-    else:
-        dst_fpath_list_ = dst_fpath_list
-        src_fpath_list_ = src_fpath_list
-
-    args_list = zip(src_fpath_list_, dst_fpath_list_)
-    _gen = util_parallel.generate2(_copy_worker, args_list,
-                                   ntasks=len(src_fpath_list_))
-    success_list = list(_gen)
-
-    #success_list = copy_list(src_fpath_list_, dst_fpath_list_)
-    if verbose:
-        print('[util_path]  * Copied %d / %d' % (sum(success_list),
+        num_copied = sum([r.status == 'copied' for r in results])
+        num_skipped = sum([r.status == 'skipped' for r in results])
+        print('[util_path]  * skipped %d files that already exist' % (
+            num_skipped,))
+        print('[util_path]  * Copied %d / %d' % (num_copied,
                                                  len(src_fpath_list)))
+        for result in results:
+            if result.status == 'failed':
+                print('[util_path]  ! Failed %r: %s' % (result.src,
+                                                       result.error))
         print('[util_path] L___ DONE COPYING FILES ___')
+    return results
 
 
 def copy(src, dst, overwrite=True, deeplink=True, verbose=True, dryrun=False):
@@ -1028,10 +1245,8 @@ def glob(dpath, pattern=None, recursive=False, with_files=True, with_dirs=True,
 def iglob(dpath, pattern=None, recursive=False, with_files=True, with_dirs=True,
           maxdepth=None, exclude_dirs=[], fullpath=True, **kwargs):
     r"""
-    Iteratively globs directory for pattern
-
-    FIXME:
-        This function has a speed issue
+    Iteratively globs directory for pattern. Uses scandir_walk, so excluded
+    directories and directories deeper than maxdepth are never read.
 
     Args:
         dpath (str):  directory path
@@ -1079,68 +1294,70 @@ def iglob(dpath, pattern=None, recursive=False, with_files=True, with_dirs=True,
         )
         for item in util_iter.iflatten(subiters):
             yield item
-        raise StopIteration
+        return
     if kwargs.get('verbose', False):
         print('[iglob] pattern = %r' % (pattern,))
         print('[iglob] dpath = %r' % (dpath,))
     n_files = 0
     n_dirs  = 0
-    current_depth = 0
     dpath_ = truepath(dpath)
-    posx1 = len(dpath_) + len(os.path.sep)
     #exclude_dirs_rel = [relpath(dpath_, dir_) for dir_ in exclude_dirs]
     #exclude_dirs_rel = [relpath(dpath_, dir_) for dir_ in exclude_dirs]
     #print('\n\n\n')
     #import utool as ut
     #print('exclude_dirs = %s' % (ut.repr4(exclude_dirs),))
-    for root, dirs, files in os.walk(dpath_, topdown=True):
-        # Modifying dirs in-place will prune the subsequent files and
-        # directories visitied by os.walk
-        # References:
-        #     http://stackoverflow.com/questions/19859840/excluding-directories-in-os-walk
-        rel_root = relpath(root, dpath_)
-        rel_root2 = relpath(root, dirname(dpath_))
-        #print('rel_root = %r' % (rel_root,))
-        #if len(dirs) > 0:
-        #    print('dirs = %s' % (ut.repr4([join(rel_root, d) for d in dirs]),))
-        if len(exclude_dirs) > 0:
-            dirs[:] = [d for d in dirs if normpath(join(rel_root, d)) not in exclude_dirs]
-            # hack
-            dirs[:] = [d for d in dirs if normpath(join(rel_root2, d)) not in exclude_dirs]
-            # check abs path as well
-            dirs[:] = [d for d in dirs if normpath(join(root, d)) not in exclude_dirs]
-
+    pattern_re = _compile_fnmatch([pattern])
+    prune = None
+    if len(exclude_dirs) > 0:
+        exclude_dirs_ = set(exclude_dirs)
+        rel_roots = {}
+
+        def prune(root, entry):
+            # Pruning happens before the directory is read
+            # References:
+            #     http://stackoverflow.com/questions/19859840/excluding-directories-in-os-walk
+            if root not in rel_roots:
+                rel_roots.clear()
+                rel_roots[root] = (relpath(root, dpath_),
+                                   relpath(root, dirname(dpath_)))
+            rel_root, rel_root2 = rel_roots[root]
+            d = entry.name
+            return (normpath(join(rel_root, d)) in exclude_dirs_ or
+                    # hack
+                    normpath(join(rel_root2, d)) in exclude_dirs_ or
+                    # check abs path as well
+                    normpath(join(root, d)) in exclude_dirs_)
+    walk = scandir_walk(dpath_, prune=prune,
+                        maxdepth=maxdepth if recursive else 0)
+    for root, depth, dir_entries, file_entries in walk:
         # yeild data
         # print it only if you want
         if maxdepth is not None:
-            current_depth = root[posx1:].count(os.path.sep)
+            # the root and its children both count as depth 0
+            current_depth = max(depth - 1, 0)
             if maxdepth <= current_depth:
                 continue
-        #print('-----------')
-        #print(current_depth)
-        #print(root)
-        #print('==')
-        #print(dirs)
-        #print('-----------')
         if with_files:
-            for fname in fnmatch.filter(files, pattern):
+            for entry in file_entries:
+                if pattern_re.match(entry.name) is None:
+                    continue
                 n_files += 1
-                fpath = join(root, fname)
+                fpath = entry.path
                 if fullpath:
                     yield fpath
                 else:
                     yield relpath(fpath, dpath_)
 
         if with_dirs:
-            for dname in fnmatch.filter(dirs, pattern):
-                dpath = join(root, dname)
+            for entry in dir_entries:
+                if pattern_re.match(entry.name) is None:
+                    continue
+                dpath = entry.path
                 n_dirs += 1
                 if fullpath:
                     yield dpath
                 else:
                     yield relpath(dpath, dpath_)
-        if not recursive:
-            break
     if kwargs.get('verbose', False):  # log what i've done
         n_total = n_dirs + n_files
         print('[util_path] iglob Found: %d' % (n_total))
@@ -1547,28 +1764,30 @@ def list_images(img_dpath_, ignore_list=[], recursive=False, fullpath=False,
     assertpath(img_dpath)
     # Get all the files in a directory recursively
     true_imgpath = truepath(img_dpath)
-    for root, dlist, flist in os.walk(true_imgpath):
+    imgext_re = _compile_fnmatch(['*' + ext for ext in __LOWER_EXTS])
+    # Ignored directories are pruned before they are read
+    walk = scandir_walk(true_imgpath, exclude_dirs=ignore_set,
+                        maxdepth=None if recursive else 0)
+    for root, depth, dir_entries, file_entries in walk:
         root = util_str.ensure_unicode(root)
         rel_dpath = relpath(root, img_dpath)
-        # Ignore directories
-        if any([dname in ignore_set for dname in dirsplit(rel_dpath)]):
+        if depth == 0 and any([dname in ignore_set for dname in dirsplit(rel_dpath)]):
             continue
-        for fname in iter(flist):
-            fname = util_str.ensure_unicode(fname)
+        for entry in file_entries:
+            fname = util_str.ensure_unicode(entry.name)
+            if imgext_re.match(fname.lower()) is None:
+                continue
             gname = join(rel_dpath, fname).replace('\\', '/')
             if gname.startswith('./'):
                 gname = gname[2:]
-            if fpath_has_imgext(gname):
-                # Ignore Files
-                if gname in ignore_set:
-                    continue
-                if fullpath:
-                    gpath = join(img_dpath, gname)
-                    gname_list_.append(gpath)
-                else:
-                    gname_list_.append(gname)
-        if not recursive:
-            break
+            # Ignore Files
+            if gname in ignore_set:
+                continue
+            if fullpath:
+                gpath = join(img_dpath, gname)
+                gname_list_.append(gpath)
+            else:
+                gname_list_.append(gname)
     if sort:
         gname_list = sorted(gname_list_)
     return gname_list
@@ -1606,6 +1825,271 @@ def get_standard_include_patterns():
     return ['*.py', '*.pyx', '*.pxi', '*.cxx', '*.cpp', '*.hxx', '*.hpp', '*.c', '*.h', '*.vim', '*.cmake']
 
 
+def _compile_fnmatch(pattern_list):
+    """
+    Compiles a list of fnmatch patterns into one regex that matches a name if
+    any of the patterns does (with the same case rules as fnmatch).
+    Returns None if the list is empty.
+    """
+    if isinstance(pattern_list, six.string_types):
+        pattern_list = [pattern_list]
+    if len(pattern_list) == 0:
+        return None
+    flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+    alternation = '|'.join([fnmatch.translate(pat) for pat in pattern_list])
+    return re.compile(alternation, flags=flags)
+
+
+def _entry_is_dir(entry, followlinks=False):
+    """ returns (is_dir, should_descend) for a DirEntry like os.walk does """
+    try:
+        is_dir = entry.is_dir()
+    except OSError:
+        return False, False
+    if not is_dir:
+        return False, False
+    if followlinks:
+        return True, True
+    try:
+        is_symlink = entry.is_symlink()
+    except OSError:
+        is_symlink = False
+    return True, not is_symlink
+
+
+def scandir_walk(dpath, exclude_dirs=[], prune=None, maxdepth=None,
+                 followlinks=False):
+    r"""
+    Walks a directory tree in the same (top down) order as os.walk, but with
+    os.scandir and without building path strings for every entry.
+
+    Excluded directories are pruned before they are read, so nothing below
+    them is ever listed.
+
+    Args:
+        dpath (str): root directory
+        exclude_dirs (list): directory names that are not descended into
+        prune (func): if specified, ``prune(root, entry)`` is called for each
+            subdirectory and it is not descended into if the result is True
+        maxdepth (int): directories deeper than this are not read (the root
+            has depth 0)
+        followlinks (bool): descend into symlinked directories
+
+    Yields:
+        tuple: (root, depth, dir_entries, file_entries) where the entries are
+            os.DirEntry objects (and dir_entries excludes pruned dirs)
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_path import *  # NOQA
+        >>> import utool as ut
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_scandir_walk')
+        >>> ut.delete(dpath, verbose=False)
+        >>> for sub in ['a/b/c', 'a/skip/d', 'e']:
+        >>>     ut.ensuredir(join(dpath, sub))
+        >>>     ut.touch(join(dpath, sub, 'f.txt'), verbose=False)
+        >>> walk = scandir_walk(dpath, exclude_dirs=['skip'], maxdepth=2)
+        >>> for root, depth, dir_entries, file_entries in sorted(walk):
+        >>>     print((relpath(root, dpath), depth, sorted(e.name for e in dir_entries)))
+        ('.', 0, ['a', 'e'])
+        ('a', 1, ['b'])
+        ('a/b', 2, ['c'])
+        ('e', 1, [])
+    """
+    exclude_set = set(exclude_dirs)
+    stack = [(dpath, 0)]
+    while stack:
+        root, depth = stack.pop()
+        try:
+            entry_iter = os.scandir(root)
+        except OSError:
+            # os.walk silently skips unreadable directories
+            continue
+        dir_entries = []
+        file_entries = []
+        descend_entries = []
+        try:
+            for entry in entry_iter:
+                is_dir, descend = _entry_is_dir(entry, followlinks)
+                if not is_dir:
+                    file_entries.append(entry)
+                    continue
+                if entry.name in exclude_set:
+                    continue
+                if prune is not None and prune(root, entry):
+                    continue
+                dir_entries.append(entry)
+                if descend:
+                    descend_entries.append(entry)
+        except OSError:
+            continue
+        finally:
+            if hasattr(entry_iter, 'close'):
+                entry_iter.close()
+        yield root, depth, dir_entries, file_entries
+        if maxdepth is None or depth < maxdepth:
+            # reversed so the stack pops them in listing order
+            for entry in descend_entries[::-1]:
+                stack.append((entry.path, depth + 1))
+
+
+def _walk_fpaths_single(dpath, include_re, exclude_re, exclude_dirs,
+                        greater_exclude_dirs, recursive, maxdepth, with_stat):
+    maxdepth_ = maxdepth if recursive else 0
+    walk = scandir_walk(dpath, exclude_dirs=greater_exclude_dirs,
+                        maxdepth=maxdepth_)
+    exclude_dirs = set(exclude_dirs)
+    for root, depth, dir_entries, file_entries in walk:
+        if basename(root) in exclude_dirs:
+            continue
+        for entry in file_entries:
+            name = entry.name
+            if include_re is not None and include_re.match(name) is None:
+                continue
+            if exclude_re is not None and exclude_re.match(name) is not None:
+                continue
+            if with_stat:
+                try:
+                    yield entry.path, entry.stat()
+                except OSError:
+                    yield entry.path, None
+            else:
+                yield entry.path
+
+
+def walk_fpaths(dpath_list, include_patterns=None, exclude_patterns=[],
+                exclude_dirs=[], greater_exclude_dirs=[], recursive=True,
+                maxdepth=None, with_stat=False, nthreads=None):
+    r"""
+    Yields the files under each directory in ``dpath_list`` whose names match
+    one of ``include_patterns`` and none of ``exclude_patterns``.
+
+    The patterns are combined into a single regex, directories named in
+    ``greater_exclude_dirs`` are pruned before descent, and files directly in
+    a directory named in ``exclude_dirs`` are skipped. Multiple roots are
+    walked in parallel threads but results are yielded in the order of
+    ``dpath_list``.
+
+    Args:
+        dpath_list (list or str): root directories
+        include_patterns (list): fnmatch patterns (default = all files)
+        exclude_patterns (list): fnmatch patterns
+        exclude_dirs (list): names of directories whose files are skipped
+        greater_exclude_dirs (list): names of directories that are not walked
+        recursive (bool): (default = True)
+        maxdepth (int): (default = None)
+        with_stat (bool): if True yields (fpath, stat) using the stat cached
+            in the directory entry when the platform provides one
+        nthreads (int): threads used for multiple roots (default = one per
+            root up to 8)
+
+    Yields:
+        str or tuple: fpath or (fpath, stat)
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_path import *  # NOQA
+        >>> import utool as ut
+        >>> dpath = dirname(ut.__file__)
+        >>> fpaths = list(walk_fpaths([dpath], ['*.py'], ['__*'],
+        >>>                           greater_exclude_dirs=['_internal']))
+        >>> fnames = set(map(basename, fpaths))
+        >>> assert 'util_path.py' in fnames and '__init__.py' not in fnames
+        >>> assert 'meta_util_arg.py' not in fnames
+        >>> fpath, stat = next(walk_fpaths(dpath, ['util_path.py'], with_stat=True))
+        >>> assert stat.st_size == os.stat(fpath).st_size
+    """
+    if isinstance(dpath_list, six.string_types):
+        dpath_list = [dpath_list]
+    if include_patterns is None:
+        include_patterns = ['*']
+    elif len(include_patterns) == 0:
+        return
+    if '*' in include_patterns:
+        include_re = None
+    else:
+        include_re = _compile_fnmatch(include_patterns)
+    exclude_re = _compile_fnmatch(exclude_patterns)
+    walkkw = dict(include_re=include_re, exclude_re=exclude_re,
+                  exclude_dirs=exclude_dirs,
+                  greater_exclude_dirs=greater_exclude_dirs,
+                  recursive=recursive, maxdepth=maxdepth, with_stat=with_stat)
+    if nthreads is None:
+        nthreads = min(8, len(dpath_list))
+    if nthreads <= 1 or len(dpath_list) <= 1:
+        for dpath in dpath_list:
+            for item in _walk_fpaths_single(dpath, **walkkw):
+                yield item
+    else:
+        from concurrent import futures
+
+        def _walk_root(dpath):
+            return list(_walk_fpaths_single(dpath, **walkkw))
+        with futures.ThreadPoolExecutor(nthreads) as executor:
+            for items in executor.map(_walk_root, dpath_list):
+                for item in items:
+                    yield item
+
+
+def time_walkers(num_files=1000000, files_per_dir=250, num=1, dpath=None):
+    """
+    Benchmarks walk_fpaths against the os.walk + fnmatch loop it replaced on a
+    generated tree with ``num_files`` empty files. One in ten leaf directories
+    is named ``build`` and excluded. The tree is kept between runs.
+
+    CommandLine:
+        python -m utool.util_path time_walkers
+
+    Example:
+        >>> # DISABLE_DOCTEST
+        >>> from utool.util_path import *  # NOQA
+        >>> time_walkers(num_files=100000)
+    """
+    import utool as ut
+    if dpath is None:
+        dpath = ut.ensure_app_resource_dir('utool', 'time_walkers_%d' % (num_files,))
+    include_patterns = ['*.py', '*.c', '*.h']
+    greater_exclude_dirs = ['build']
+    num_dirs = max(1, num_files // files_per_dir)
+    done_fpath = join(dpath, 'done.flag')
+    if not exists(done_fpath):
+        exts = ['.py', '.c', '.h', '.txt', '.png']
+        for dx in range(num_dirs):
+            leaf = 'build' if dx % 10 == 9 else 'src%d' % (dx % 10,)
+            sub = join(dpath, 'pkg%d' % (dx // 100,), 'mod%d' % (dx // 10,), leaf)
+            ensuredir(sub)
+            for fx in range(files_per_dir):
+                open(join(sub, 'f%d%s' % (fx, exts[fx % len(exts)])), 'w').close()
+        open(done_fpath, 'w').close()
+
+    def oswalk_fpaths():
+        # the implementation matching_fpaths used before walk_fpaths
+        for root, dname_list, fname_list in os.walk(dpath):
+            subdirs = pathsplit_full(relpath(root, dpath))
+            if any([dir_ in greater_exclude_dirs for dir_ in subdirs]):
+                continue
+            for name in fname_list:
+                if any(fnmatch.fnmatch(name, pat) for pat in include_patterns):
+                    yield join(root, name)
+
+    results = {}
+    for label, func in [
+        ('os.walk+fnmatch', oswalk_fpaths),
+        ('walk_fpaths', lambda: walk_fpaths(
+            [dpath], include_patterns,
+            greater_exclude_dirs=greater_exclude_dirs)),
+        ('walk_fpaths(stat)', lambda: walk_fpaths(
+            [dpath], include_patterns,
+            greater_exclude_dirs=greater_exclude_dirs, with_stat=True)),
+    ]:
+        for timer in ut.Timerit(num, verbose=0):
+            with timer:
+                n = sum(1 for _ in func())
+        results[label] = timer.parent.min()
+        print('%-18s %8.3fs  (%d files)' % (label, results[label], n))
+    return results
+
+
 def matching_fpaths(dpath_list, include_patterns, exclude_dirs=[],
                     greater_exclude_dirs=[], exclude_patterns=[],
                     recursive=True):
@@ -1637,33 +2121,24 @@ def matching_fpaths(dpath_list, include_patterns, exclude_dirs=[],
         >>> result = list(fpath_gen)
         >>> print('\n'.join(result))
     """
-    if isinstance(dpath_list, six.string_types):
-        dpath_list = [dpath_list]
-    for dpath in dpath_list:
-        for root, dname_list, fname_list in os.walk(dpath):
-            # Look at all subdirs
-            subdirs = pathsplit_full(relpath(root, dpath))
-            # HACK:
-            if any([dir_ in greater_exclude_dirs for dir_ in subdirs]):
-                continue
-            # Look at one subdir
-            if basename(root) in exclude_dirs:
-                continue
-            _match = fnmatch.fnmatch
-            for name in fname_list:
-                # yeild filepaths that are included
-                if any(_match(name, pat) for pat in include_patterns):
-                    # ... and not excluded
-                    if not any(_match(name, pat) for pat in exclude_patterns):
-                        fpath = join(root, name)
-                        yield fpath
-            if not recursive:
-                break
+    return walk_fpaths(dpath_list, include_patterns,
+                       exclude_patterns=exclude_patterns,
+                       exclude_dirs=exclude_dirs,
+                       greater_exclude_dirs=greater_exclude_dirs,
+                       recursive=recursive)
+
+
+def _sed_candidate_worker(fpath, regexpr):
+    """ True if sedfile could change a line of the file """
+    from utool import util_io
+    re_ = re.compile(regexpr)
+    file_lines = util_io.read_from(fpath, aslines=True, verbose=False)
+    return any(re_.search(line) is not None for line in file_lines)
 
 
 def sed(regexpr, repl, force=False, recursive=False, dpath_list=None,
         fpath_list=None, verbose=None, include_patterns=None,
-        exclude_patterns=[]):
+        exclude_patterns=[], nprocs=None):
     """
     Python implementation of sed. NOT FINISHED
 
@@ -1675,6 +2150,9 @@ def sed(regexpr, repl, force=False, recursive=False, dpath_list=None,
         force (bool):
         recursive (bool):
         dpath_list (list): directories to search (defaults to cwd)
+        nprocs (int): if there are at least __GREP_MIN_PARALLEL_FILES__ files
+            (or nprocs is given), files without a match are skipped by
+            scanning them in a process pool first.
     """
     #_grep(r, [repl], dpath_list=dpath_list, recursive=recursive)
     if include_patterns is None:
@@ -1712,8 +2190,22 @@ def sed(regexpr, repl, force=False, recursive=False, dpath_list=None,
     num_changed = 0
     num_files_checked = 0
     fpaths_changed = []
-    for fpath in fpath_generator:
+    fpath_list_ = list(fpath_generator)
+    if nprocs is None and len(fpath_list_) < __GREP_MIN_PARALLEL_FILES__:
+        nprocs = 1
+    if nprocs == 1:
+        # reading each file twice in one process does not pay off
+        candidate_flags = [True] * len(fpath_list_)
+    else:
+        from utool import util_parallel
+        candidate_flags = util_parallel.generate2(
+            _sed_candidate_worker, ((fpath, regexpr) for fpath in fpath_list_),
+            ntasks=len(fpath_list_), ordered=True, stream=True, nprocs=nprocs,
+            verbose=False)
+    for fpath, flag in zip(fpath_list_, candidate_flags):
         num_files_checked += 1
+        if not flag:
+            continue
         changed_lines = sedfile(fpath, regexpr, repl, force, verbose=verbose)
         if changed_lines is not None:
             fpaths_changed.append(fpath)
@@ -1724,7 +2216,63 @@ def sed(regexpr, repl, force=False, recursive=False, dpath_list=None,
     print('total lines changed = %r' % (num_changed,))
 
 
-def sedfile(fpath, regexpr, repl, force=False, verbose=True, veryverbose=False):
+def _sedfile_stream(fpath, regexpr, repl, force=False, verbose=True):
+    """
+    sedfile for files of any size. Lines are substituted one at a time and
+    written to a temporary file that replaces fpath if anything changed.
+    Only the changed lines are kept and printed.
+    """
+    from utool import util_io
+    re_ = re.compile(regexpr)
+    changed_lines = []
+    tmp_fpath = None
+    file_ = None
+    if force:
+        # unique per process, so concurrent runs do not share a temp file
+        tmp_fpath = util_io._temp_fpath(fpath)
+        file_ = open(tmp_fpath, 'w')
+    try:
+        for line in util_io.iter_lines(fpath):
+            newline = re_.sub(repl, line)
+            if newline != line:
+                changed_lines.append((newline, line))
+            if file_ is not None:
+                file_.write(newline)
+    except Exception:
+        if file_ is not None:
+            file_.close()
+            os.remove(tmp_fpath)
+        raise
+    if file_ is not None:
+        file_.close()
+    n_changed = len(changed_lines)
+    if n_changed == 0:
+        if tmp_fpath is not None:
+            os.remove(tmp_fpath)
+        return None
+    try:
+        rel_fpath = relpath(fpath, os.getcwd())
+    except ValueError:
+        # Can happen on windows
+        rel_fpath = fpath
+    print(' * %s changed %d lines in %r ' %
+          (['(dry-run)', '(real-run)'][force], n_changed, rel_fpath))
+    print(' * --------------------')
+    if verbose:
+        for newline, line in changed_lines:
+            print(' - ' + line.rstrip('\n'))
+            print(' + ' + newline.rstrip('\n'))
+    if force:
+        print(' ! WRITING CHANGES')
+        shutil.copymode(fpath, tmp_fpath)
+        util_io._atomic_rename(tmp_fpath, fpath)
+    else:
+        print(' dry run')
+    return changed_lines
+
+
+def sedfile(fpath, regexpr, repl, force=False, verbose=True, veryverbose=False,
+            stream=None):
     """
     Executes sed on a specific file
 
@@ -1735,6 +2283,9 @@ def sedfile(fpath, regexpr, repl, force=False, verbose=True, veryverbose=False):
         force (bool): (default = False)
         verbose (bool):  verbosity flag(default = True)
         veryverbose (bool): (default = False)
+        stream (bool): if True the file is processed in constant memory and
+            only changed lines are printed. Defaults to True for files of at
+            least __GREP_STREAM_MIN_NBYTES__.
 
     Returns:
         list: changed_lines
@@ -1757,6 +2308,11 @@ def sedfile(fpath, regexpr, repl, force=False, verbose=True, veryverbose=False):
         >>> print(result)
     """
     # TODO: move to util_edit
+    if stream is None:
+        stream = os.path.getsize(fpath) >= __GREP_STREAM_MIN_NBYTES__
+    if stream:
+        return _sedfile_stream(fpath, regexpr, repl, force=force,
+                               verbose=verbose)
     path, name = split(fpath)
     new_file_lines = []
 
@@ -1822,14 +2378,284 @@ def sedfile(fpath, regexpr, repl, force=False, verbose=True, veryverbose=False):
     return None
 
 
-#@profile
-def grepfile(fpath, regexpr_list, reflags=0, cache=None):
+# Do not bother starting a process pool for fewer files than this
+__GREP_MIN_PARALLEL_FILES__ = 64
+
+# Content cache shared by calls to grep / grepfile with cache=True
+# Size bound of the module level grep cache in bytes of cached text
+__GREP_CACHE_MAX_NBYTES__ = 2 ** 28
+# Created on first use (see _get_grep_cache)
+__GREP_CACHE__ = None
+
+# Files at least this big are grepped / sed-ed in constant memory
+__GREP_STREAM_MIN_NBYTES__ = 2 ** 26
+
+# Patterns that refer to groups by number or name cannot be or-ed together
+_GROUP_REFERENCE_RE = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
+
+def _compile_grep_patterns(regexpr_list, reflags=0):
+    """
+    Returns the compiled patterns and, when there are several patterns that
+    can share one regex, their alternation. The alternation matches somewhere
+    in a text if and only if one of the patterns does, so it is used to skip
+    files without any match in a single pass.
     """
+    islist = isinstance(regexpr_list, (list, tuple))
+    islist2 = isinstance(reflags, (list, tuple))
+    regexpr_list_ = regexpr_list if islist else [regexpr_list]
+    reflags_list = reflags if islist2 else [reflags] * len(regexpr_list_)
+    re_list = [re.compile(pat, flags=_flags)
+               for pat, _flags in  zip(regexpr_list_, reflags_list)]
+    combined_re = None
+    if len(re_list) > 1 and len(set(reflags_list)) == 1:
+        if not any(_GROUP_REFERENCE_RE.search(pat) for pat in regexpr_list_):
+            alternation = '|'.join(['(?:%s)' % (pat,) for pat in regexpr_list_])
+            try:
+                combined_re = re.compile(alternation, flags=reflags_list[0])
+            except re.error:
+                # e.g. global inline flags that are not at the start
+                combined_re = None
+    return re_list, combined_re
+
+
+def _grep_stat_signature(fpath):
+    """ cache key that changes whenever the file is modified """
+    stat = os.stat(fpath)
+    return (getattr(stat, 'st_mtime_ns', stat.st_mtime), stat.st_size)
+
+
+def _read_grep_entry(fpath):
+    """
+    Returns:
+        tuple: (signature, cumsum, text) where cumsum[lx] is the offset of
+            the end of line lx in text
+    """
+    import numpy as np
+    from utool import util_io
+    # stat before reading so a concurrent write invalidates the entry
+    signature = _grep_stat_signature(fpath)
+    lines = util_io.read_from(fpath, aslines=True, verbose=False)
+    cumsum = np.cumsum(list(map(len, lines)))
+    text = ''.join(lines)
+    return (signature, cumsum, text)
+
+
+def _grep_entry_nbytes(entry):
+    signature, cumsum, text = entry
+    return sys.getsizeof(text) + cumsum.nbytes
+
+
+def _get_grep_cache():
+    """
+    The module level cache used by grepfile and grep with cache=True. It is
+    an LRU dict bounded by __GREP_CACHE_MAX_NBYTES__, so long running
+    processes do not keep every grepped file in memory.
+    """
+    global __GREP_CACHE__
+    if __GREP_CACHE__ is None:
+        from utool import util_cache
+        __GREP_CACHE__ = util_cache.SizedLRUDict(
+            max_nbytes=__GREP_CACHE_MAX_NBYTES__, sizeof=_grep_entry_nbytes)
+    return __GREP_CACHE__
+
+
+def _lookup_grep_entry(cache, fpath):
+    """ Returns the cached entry of fpath if the file did not change """
+    try:
+        entry = cache[fpath]
+    except KeyError:
+        return None
+    if entry[0] != _grep_stat_signature(fpath):
+        return None
+    return entry
+
+
+def _grep_text(text, cumsum, re_list, combined_re=None):
+    """
+    Finds the lines containing each match of each pattern. Matches are mapped
+    to line numbers with a binary search over the line end offsets.
+    """
+    import numpy as np
+    found_lines = []
+    found_lxs = []
+    if combined_re is not None and combined_re.search(text) is None:
+        return found_lines, found_lxs
+    num_lines = len(cumsum)
+    for re_ in re_list:
+        # FIXME: multiline mode doesnt work
+        starts = [match_object.start() for match_object in re_.finditer(text)]
+        if len(starts) == 0:
+            continue
+        lxs = np.searchsorted(cumsum, starts, side='right').tolist()
+        for lx in lxs:
+            if lx < num_lines:
+                line_start = int(cumsum[lx - 1]) if lx > 0 else 0
+                line_end = int(cumsum[lx])
+                found_lines.append(text[line_start:line_end])
+                found_lxs.append(lx)
+    return found_lines, found_lxs
+
+
+def _bytes_safe_regex(pattern, flags=0):
+    """
+    Returns a bytes regex that finds exactly the same matches on the utf8
+    encoding of a text as ``pattern`` finds on the text, or None if that
+    cannot be guaranteed.
+
+    This holds when the pattern is ascii and can only match ascii literals:
+    no ``.``, character classes, class escapes (``\\w``, ``\\s``, ...),
+    inline flags or flags other than MULTILINE. Ascii bytes never occur
+    inside multibyte utf8 characters and survive decoding with
+    errors='replace'.
+    """
+    if flags & ~(re.MULTILINE | re.UNICODE):
+        return None
+    try:
+        pattern.encode('ascii')
+    except UnicodeError:
+        return None
+    allowed_escapes = set('AZnt')
+    allowed_groups = ('(?:', '(?=', '(?!', '(?<=', '(?<!')
+    x = 0
+    while x < len(pattern):
+        char = pattern[x]
+        if char == '\\':
+            escaped = pattern[x + 1:x + 2]
+            if escaped.isalnum() and escaped not in allowed_escapes:
+                return None
+            x += 2
+            continue
+        if char in '.[':
+            return None
+        if char == '(' and pattern[x + 1:x + 2] == '?':
+            if not pattern.startswith(allowed_groups, x):
+                return None
+        x += 1
+    try:
+        return re.compile(pattern.encode('ascii'), flags=flags & re.MULTILINE)
+    except re.error:
+        return None
+
+
+def _line_cumsum(text):
+    """ end offset of each newline separated line in text """
+    import numpy as np
+    cumsum = np.fromiter((match.end() for match in re.finditer('\n', text)),
+                         dtype=np.int64)
+    if len(text) > 0 and (len(cumsum) == 0 or cumsum[-1] != len(text)):
+        # last line without a newline
+        cumsum = np.append(cumsum, len(text))
+    return cumsum
+
+
+def _grep_chunks(chunk_iter, re_list):
+    """
+    Greps consecutive chunks of text in constant memory.
+
+    Args:
+        chunk_iter: yields (line_offset, text, cumsum) for consecutive runs of
+            whole lines, where cumsum are the line end offsets in text
+        re_list (list): compiled patterns
+
+    Each chunk is searched starting after the last line of the previous chunk
+    and followed by the first line of the next chunk. Thus anchors and
+    lookarounds see the real neighboring text and matches may cross one line
+    boundary between chunks. Matches are grouped by pattern, as in
+    _grep_text.
+    """
+    import numpy as np
+    per_pattern = [([], []) for _ in re_list]
+    chunk_iter = iter(chunk_iter)
+    prefix = ''
+    current = next(chunk_iter, None)
+    while current is not None:
+        next_ = next(chunk_iter, None)
+        line_offset, text, cumsum = current
+        suffix = ''
+        if next_ is not None and len(next_[2]) > 0:
+            suffix = next_[1][:int(next_[2][0])]
+        search_text = prefix + text + suffix
+        pos = len(prefix)
+        endx = pos + len(text)
+        num_lines = len(cumsum)
+        for (found_lines, found_lxs), re_ in zip(per_pattern, re_list):
+            starts = []
+            for match_object in re_.finditer(search_text, pos):
+                start = match_object.start()
+                if start >= endx:
+                    break
+                starts.append(start - pos)
+            if len(starts) == 0:
+                continue
+            lxs = np.searchsorted(cumsum, starts, side='right').tolist()
+            for lx in lxs:
+                if lx < num_lines:
+                    line_start = int(cumsum[lx - 1]) if lx > 0 else 0
+                    found_lines.append(text[line_start:int(cumsum[lx])])
+                    found_lxs.append(line_offset + lx)
+        if num_lines > 0:
+            prefix = text[int(cumsum[-2]) if num_lines > 1 else 0:]
+        current = next_
+    found_lines = [line for lines, _ in per_pattern for line in lines]
+    found_lxs = [lx for _, lxs in per_pattern for lx in lxs]
+    return found_lines, found_lxs
+
+
+def _grepfile_stream(fpath, regexpr_list, reflags=0, chunksize=2 ** 22):
+    """
+    Greps a file of any size in constant memory. If every pattern can be
+    matched on raw bytes the file is memory mapped and never decoded
+    (except for the matching lines), otherwise it is decoded in chunks.
+    """
+    from utool import util_io
+    re_list, combined_re = _compile_grep_patterns(regexpr_list, reflags)
+    bytes_re_list = [_bytes_safe_regex(re_.pattern, re_.flags)
+                     for re_ in re_list]
+    if all(bytes_re is not None for bytes_re in bytes_re_list):
+        found_lines = []
+        found_lxs = []
+        with util_io.MappedText(fpath) as mapped:
+            for bytes_re in bytes_re_list:
+                for lx, line in mapped.finditer_lines(bytes_re):
+                    found_lines.append(line)
+                    found_lxs.append(lx)
+        return found_lines, found_lxs
+    chunk_iter = (
+        (line_offset, text, _line_cumsum(text))
+        for byte_offset, line_offset, text in
+        util_io.iter_line_chunks(fpath, chunksize=chunksize))
+    return _grep_chunks(chunk_iter, re_list)
+
+
+def _grepfile_worker(fpath, regexpr_list, reflags_list, return_entry=False):
+    """ process pool worker for grep """
+    if not return_entry:
+        found_lines, found_lxs = grepfile(fpath, regexpr_list, reflags_list)
+        return found_lines, found_lxs, None
+    re_list, combined_re = _compile_grep_patterns(regexpr_list, reflags_list)
+    entry = _read_grep_entry(fpath)
+    signature, cumsum, text = entry
+    found_lines, found_lxs = _grep_text(text, cumsum, re_list, combined_re)
+    return found_lines, found_lxs, (entry if return_entry else None)
+
+
+#@profile
+def grepfile(fpath, regexpr_list, reflags=0, cache=None, stream=None):
+    r"""
     grepfile - greps a specific file
 
     Args:
         fpath (str):
         regexpr_list (list or str): pattern or list of patterns
+        cache (dict or bool): if specified, the contents of the file are
+            stored here and reused by later calls until the mtime or size of
+            the file changes. If True a module level LRU cache that holds at
+            most __GREP_CACHE_MAX_NBYTES__ bytes of text is used.
+        stream (bool): if True the file is scanned in constant memory (see
+            _grepfile_stream) and the cache is not used. By default files of
+            at least __GREP_STREAM_MIN_NBYTES__ are streamed unless a cache
+            is given.
 
     Returns:
         tuple (list, list): list of lines and list of line numbers
@@ -1851,105 +2677,114 @@ def grepfile(fpath, regexpr_list, reflags=0, cache=None):
         >>> assert 7 in found_lxs
         >>> others = ut.take_complement(found_lxs, [found_lxs.index(7)])
         >>> assert others[0] == others[1]
-    """
-    found_lines = []
-    found_lxs = []
-    # Ensure a list
-    islist = isinstance(regexpr_list, (list, tuple))
-    islist2 = isinstance(reflags, (list, tuple))
-    regexpr_list_ = regexpr_list if islist else [regexpr_list]
-    reflags_list = reflags if islist2 else [reflags] * len(regexpr_list_)
-    re_list = [re.compile(pat, flags=_flags)
-               for pat, _flags in  zip(regexpr_list_, reflags_list)]
-    #print('regexpr_list_ = %r' % (regexpr_list_,))
-    #print('re_list = %r' % (re_list,))
 
-    import numpy as np
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_path import *  # NOQA
+        >>> import utool as ut
+        >>> dpath = ut.ensure_app_resource_dir('utool', 'test_grepfile')
+        >>> fpath = join(dpath, 'lines.txt')
+        >>> ut.write_to(fpath, 'foo\nbar\nfoo bar\n', verbose=False)
+        >>> cache = {}
+        >>> print(grepfile(fpath, ['foo', 'bar'], cache=cache))
+        (['foo\n', 'foo bar\n', 'bar\n', 'foo bar\n'], [0, 2, 1, 2])
+        >>> ut.write_to(fpath, 'bar\n', verbose=False)
+        >>> os.utime(fpath, (0, 0))  # ensure the mtime changes
+        >>> print(grepfile(fpath, ['foo', 'bar'], cache=cache))
+        (['bar\n'], [0])
+    """
+    if stream is None:
+        stream = (cache is None and
+                  os.path.getsize(fpath) >= __GREP_STREAM_MIN_NBYTES__)
+    if stream:
+        return _grepfile_stream(fpath, regexpr_list, reflags)
+    re_list, combined_re = _compile_grep_patterns(regexpr_list, reflags)
+    if cache is True:
+        cache = _get_grep_cache()
     # Open file and search lines or use cache
-    if cache is None or fpath not in cache:
-        #with open(fpath, 'r') as file_:
-        #    lines = list(file_.readlines())
-        from utool import util_io
-        lines = util_io.read_from(fpath, aslines=True, verbose=False)
-        #import utool as ut
-        #cumsum = ut.cumsum(map(len, lines))
-        cumsum = np.cumsum(list(map(len, lines)))
-        text = ''.join(lines)
-        if cache is not None:
-            cache[fpath] = (cumsum, text, lines)
+    if cache is None:
+        entry = _read_grep_entry(fpath)
     else:
-        (cumsum, text, lines) = cache[fpath]
-
-    # Search each line for each pattern
-    old_method = False
-    if old_method:
-        for lx, line in enumerate(lines):
-            #for regexpr_ in regexpr_list_:
-            match_objects = [re_.search(line) for re_ in re_list]
-            for match in match_objects:
-                if match is not None:
-                    found_lines.append(line)
-                    found_lxs.append(lx)
-    else:
-        for re_ in re_list:
-            # FIXME: multiline mode doesnt work
-            for match_object in re_.finditer(text):
-                #print('match_object = %r' % (match_object,))
-                lxs = np.where(match_object.start() < cumsum)[0][0:1]
-                if len(lxs) == 1:
-                    lx = lxs[0]
-                    if lx > 0:
-                        line_start = cumsum[lx - 1]
-                    else:
-                        line_start = 0
-                    line_end = cumsum[lx]
-                    line = text[line_start:line_end]
-                    found_lines.append(line)
-                    found_lxs.append(lx)
-                #[match_object.start > x for x in cumsum]
-    return found_lines, found_lxs
+        entry = _lookup_grep_entry(cache, fpath)
+        if entry is None:
+            entry = _read_grep_entry(fpath)
+            cache[fpath] = entry
+    signature, cumsum, text = entry
+    return _grep_text(text, cumsum, re_list, combined_re)
 
 
-def greplines(lines, regexpr_list, reflags=0):
+def greplines(lines, regexpr_list, reflags=0, chunksize=2 ** 22):
     """
     grepfile - greps a specific file
 
+    If lines is an iterator (e.g. ut.iter_lines) it is consumed in chunks of
+    about chunksize characters, so it can be arbitrarily long.
+
     TODO: move to util_str, rework to be core of grepfile
     """
-    found_lines = []
-    found_lxs = []
-    # Ensure a list
-    islist = isinstance(regexpr_list, (list, tuple))
-    islist2 = isinstance(reflags, (list, tuple))
-    regexpr_list_ = regexpr_list if islist else [regexpr_list]
-    reflags_list = reflags if islist2 else [reflags] * len(regexpr_list_)
-    re_list = [re.compile(pat, flags=_flags)
-               for pat, _flags in  zip(regexpr_list_, reflags_list)]
-    #print('regexpr_list_ = %r' % (regexpr_list_,))
-    #print('re_list = %r' % (re_list,))
-
     import numpy as np
-    #import utool as ut
-    #cumsum = ut.cumsum(map(len, lines))
-    cumsum = np.cumsum(list(map(len, lines)))
-    text = ''.join(lines)
-
-    # Search each line for each pattern
-    for re_ in re_list:
-        # FIXME: multiline mode doesnt work
-        for match_object in re_.finditer(text):
-            lxs = np.where(match_object.start() < cumsum)[0][0:1]
-            if len(lxs) == 1:
-                lx = lxs[0]
-                if lx > 0:
-                    line_start = cumsum[lx - 1]
-                else:
-                    line_start = 0
-                line_end = cumsum[lx]
-                line = text[line_start:line_end]
-                found_lines.append(line)
-                found_lxs.append(lx)
-    return found_lines, found_lxs
+    re_list, combined_re = _compile_grep_patterns(regexpr_list, reflags)
+    if isinstance(lines, (list, tuple)):
+        cumsum = np.cumsum(list(map(len, lines)))
+        text = ''.join(lines)
+        return _grep_text(text, cumsum, re_list, combined_re)
+
+    def _chunk_gen():
+        line_offset = 0
+        for chunk in _chunks_by_size(lines, chunksize):
+            yield line_offset, ''.join(chunk), np.cumsum(list(map(len, chunk)))
+            line_offset += len(chunk)
+    return _grep_chunks(_chunk_gen(), re_list)
+
+
+def _chunks_by_size(lines, chunksize):
+    """ groups strings into lists whose total length is about chunksize """
+    chunk = []
+    size = 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= chunksize:
+            yield chunk
+            chunk = []
+            size = 0
+    if chunk:
+        yield chunk
+
+
+def _grep_fpaths(fpath_list, regexpr_list, reflags_list, cache=None,
+                 nprocs=None):
+    """
+    Greps each file and yields (found_lines, found_lxs) in the order of
+    fpath_list. Files are read and scanned in a process pool, while files
+    whose content is fresh in the cache are scanned in this process.
+    """
+    from utool import util_parallel
+    if cache is True:
+        cache = _get_grep_cache()
+    if cache is None:
+        hit_flags = [False] * len(fpath_list)
+    else:
+        hit_flags = [_lookup_grep_entry(cache, fpath) is not None
+                     for fpath in fpath_list]
+    miss_fpaths = [fpath for fpath, flag in zip(fpath_list, hit_flags)
+                   if not flag]
+    if nprocs is None and len(miss_fpaths) < __GREP_MIN_PARALLEL_FILES__:
+        nprocs = 1
+    return_entry = cache is not None
+    args_gen = ((fpath, regexpr_list, reflags_list, return_entry)
+                for fpath in miss_fpaths)
+    miss_results = util_parallel.generate2(
+        _grepfile_worker, args_gen, ntasks=len(miss_fpaths), ordered=True,
+        stream=True, nprocs=nprocs, force_serial=nprocs == 1, verbose=False)
+    for fpath, flag in zip(fpath_list, hit_flags):
+        if flag:
+            yield grepfile(fpath, regexpr_list, reflags_list, cache=cache)
+        else:
+            found_lines, found_lxs, entry = next(miss_results)
+            if entry is not None:
+                cache[fpath] = entry
+            yield found_lines, found_lxs
 
 
 def testgrep():
@@ -1980,7 +2815,7 @@ def testgrep():
 def grep(regex_list, recursive=True, dpath_list=None, include_patterns=None,
          exclude_dirs=[], greater_exclude_dirs=None, inverse=False,
          exclude_patterns=[], verbose=VERBOSE, fpath_list=None, reflags=0,
-         cache=None):
+         cache=None, nprocs=None):
     r"""
     greps for patterns
     Python implementation of grep. NOT FINISHED
@@ -1990,6 +2825,12 @@ def grep(regex_list, recursive=True, dpath_list=None, include_patterns=None,
         recursive (bool):
         dpath_list (list): directories to search (defaults to cwd)
         include_patterns (list) : defaults to standard file extensions
+        cache (dict or bool): file contents keyed by path that are reused
+            until the mtime or size of a file changes. If True a module level
+            cache is used (see grepfile).
+        nprocs (int): number of processes used to scan the files. By default
+            a pool is only used for at least __GREP_MIN_PARALLEL_FILES__
+            files. Results are always in walk order.
 
     Returns:
         (list, list, list): (found_fpaths, found_lines_list, found_lxs_list)
@@ -2061,10 +2902,10 @@ def grep(regex_list, recursive=True, dpath_list=None, include_patterns=None,
     reflags = reflags_list[0]
 
     # For each matching filepath
-    for fpath in fpath_generator:
-        # For each search pattern
-        found_lines, found_lxs = grepfile(fpath, extended_regex_list,
-                                          reflags_list, cache=cache)
+    fpath_list_ = list(fpath_generator)
+    grep_gen = _grep_fpaths(fpath_list_, extended_regex_list, reflags_list,
+                            cache=cache, nprocs=nprocs)
+    for fpath, (found_lines, found_lxs) in zip(fpath_list_, grep_gen):
         if inverse:
             if len(found_lines) == 0:
                 # Append files that the pattern was not found in
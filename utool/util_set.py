@@ -2,40 +2,135 @@
 from __future__ import absolute_import, division, print_function
 from six.moves import zip, map, range  # NOQA
 try:
-    from collections.abc import MutableSet
+    from collections.abc import MutableSet, Set
 except Exception:
-    from collections import MutableSet
+    from collections import MutableSet, Set
+import bisect
+import sys
 import weakref
 from utool import util_inject
 print, rrr, profile = util_inject.inject2(__name__)
 
 
-class _Link(object):
-    __slots__ = ('prev', 'next', 'key', '__weakref__')
+# dict.fromkeys keeps insertion order from python 3.7 on
+_ORDERED_DICTS = sys.version_info >= (3, 7)
+
+
+class _Deleted(object):
+    """ Marks the slot of a discarded key until the next compaction """
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<deleted>'
+
+_DELETED = _Deleted()
+
+
+class _IterPos(object):
+    """ Slot of the next key a running iterator looks at """
+    __slots__ = ('pos', 'step', '__weakref__')
+
+    def __init__(self, pos, step):
+        self.pos = pos
+        self.step = step
+
+
+class _hybridmethod(object):
+    """
+    Binds to the instance when called on one and to the class otherwise, so
+    ``OrderedSet.union(a, b)`` and ``a.union(b)`` both work.
+    """
+    def __init__(self, func):
+        self.func = func
+
+    def __get__(self, obj, cls):
+        context = cls if obj is None else obj
+
+        def bound(*args, **kwargs):
+            return self.func(context, *args, **kwargs)
+        bound.__doc__ = self.func.__doc__
+        return bound
 
 
 class OrderedSet(MutableSet):
     """ Set the remembers the order elements were added
-     Big-O running times for all methods are the same as for regular sets.
-     The internal self._map dictionary maps keys to links in a doubly linked list.
-     The circular doubly linked list starts and ends with a sentinel element.
-     The sentinel element never gets deleted (this simplifies the algorithm).
-     The prev/next links are weakref proxies (to prevent circular references).
-     Individual links are kept alive by the hard reference in self._map.
-     Those hard references disappear when a key is deleted from an OrderedSet.
+
+    Keys are stored in a list in insertion order and ``self._map`` maps each
+    key to its slot in that list, so membership, ``add``, ``index`` and
+    positional ``__getitem__`` are O(1) while there are no deletions.
+    ``discard`` leaves a hole in the list and records its position. Positional
+    lookups account for the holes with a binary search over their positions,
+    and the list is compacted once the holes outnumber the keys.
+
+    Set operations return new OrderedSets in the order of the left operand,
+    followed by new keys of the right operand for unions. Note that
+    ``a & b`` and ``a.intersection(b)`` follow the order of ``a`` (the
+    inherited ``Set.__and__`` followed ``b``), and that ``a.union(b)``
+    includes ``a`` (union used to be a classmethod that ignored ``a``).
+
+    Iterators survive modifications: compaction moves the position of every
+    running iterator along with the keys, so keys discarded while iterating
+    are skipped and added keys are visited, like in a linked list.
 
     References:
-        http://code.activestate.com/recipes/576696/
         http://code.activestate.com/recipes/576694/
         http://stackoverflow.com/questions/1653970/does-python-have-an-ordered-set
+
+    SeeAlso:
+        ut.time_ordered_sets
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_set import *  # NOQA
+        >>> import random
+        >>> rng = random.Random(0)
+        >>> self = OrderedSet()
+        >>> ref = []
+        >>> for _ in range(2000):
+        >>>     key = rng.randint(0, 200)
+        >>>     if rng.random() < 0.5:
+        >>>         self.add(key)
+        >>>         if key not in ref:
+        >>>             ref.append(key)
+        >>>     else:
+        >>>         self.discard(key)
+        >>>         if key in ref:
+        >>>             ref.remove(key)
+        >>>     assert len(self) == len(ref)
+        >>> assert list(self) == ref
+        >>> assert list(reversed(self)) == ref[::-1]
+        >>> assert [self[i] for i in range(-len(ref), len(ref))] == ref + ref
+        >>> assert [self.index(key) for key in ref] == list(range(len(ref)))
+        >>> assert list(self[2:9]) == ref[2:9]
     """
 
     def __init__(self, iterable=None):
-        self._root = root = _Link()  # sentinel node for doubly linked list
-        root.prev = root.next = root
-        self._map = {}  # key --> link
+        self._items = []  # keys in insertion order, holes are _DELETED
+        self._map = {}  # key --> slot in self._items
+        self._holes = []  # sorted slots of discarded keys
+        self._iter_positions = None  # WeakSet of running _IterPos
         if iterable is not None:
-            self |= iterable
+            self.update(iterable)
+
+    @classmethod
+    def _from_unique(cls, keys):
+        """ Builds a set from a list of keys that are known to be unique """
+        self = cls()
+        self._items = keys
+        self._map = dict(zip(keys, range(len(keys))))
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (self._keys(),))
+
+    def copy(self):
+        return self._from_unique(self._keys())
+
+    def _keys(self):
+        """ Snapshot of the keys in order """
+        if not self._holes:
+            return self._items[:]
+        return [key for key in self._items if key is not _DELETED]
 
     def __len__(self):
         return len(self._map)
@@ -44,72 +139,293 @@ class OrderedSet(MutableSet):
         return key in self._map
 
     def add(self, key):
-        """ Store new key in a new link at the end of the linked list """
+        """ Store new key at the end of the set """
         if key not in self._map:
-            self._map[key] = link = _Link()
-            root = self._root
-            last = root.prev
-            link.prev, link.next, link.key = last, root, key
-            last.next = root.prev = weakref.proxy(link)
+            self._map[key] = len(self._items)
+            self._items.append(key)
 
     def append(self, key):
         """ Alias for add """
         return self.add(key)
 
     def discard(self, key):
-        # Remove an existing item using self._map to find the link which is
-        # then removed by updating the links in the predecessor and successors.
-        if key in self._map:
-            link = self._map.pop(key)
-            link.prev.next = link.next
-            link.next.prev = link.prev
+        pos = self._map.pop(key, None)
+        if pos is None:
+            return
+        items = self._items
+        if pos == len(items) - 1:
+            items.pop()
+            holes = self._holes
+            # drop trailing holes so appends and pops stay hole free
+            while holes and holes[-1] == len(items) - 1:
+                holes.pop()
+                items.pop()
+            if self._iter_positions:
+                # keys appended later belong after the removed slots
+                num = len(items)
+                for state in list(self._iter_positions):
+                    if state.step > 0 and state.pos > num:
+                        state.pos = num
+        else:
+            items[pos] = _DELETED
+            bisect.insort(self._holes, pos)
+            if len(self._holes) > max(len(self._map), 16):
+                self._compact()
+
+    def _compact(self):
+        """ Removes the holes left by discard """
+        holes = self._holes
+        if holes:
+            if self._iter_positions:
+                for state in list(self._iter_positions):
+                    # skip the holes before the next slot of the iterator
+                    if state.step > 0:
+                        state.pos -= bisect.bisect_left(holes, state.pos)
+                    else:
+                        state.pos -= bisect.bisect_right(holes, state.pos)
+            # in place, so running iterators keep their list
+            items = self._items
+            items[:] = [key for key in items if key is not _DELETED]
+            self._map = dict(zip(items, range(len(items))))
+            self._holes = []
+
+    def _remove_keys(self, keys):
+        """ Discards many keys with a single compaction """
+        items = self._items
+        map_ = self._map
+        slots = [map_.pop(key) for key in keys]
+        for pos in slots:
+            items[pos] = _DELETED
+        self._holes = sorted(self._holes + slots)
+        self._compact()
 
     def __iter__(self):
-        # Traverse the linked list in order.
-        root = self._root
-        curr = root.next
-        while curr is not root:
-            yield curr.key
-            curr = curr.next
+        """
+        Keys discarded or added while iterating are skipped or visited like
+        in a linked list.
+
+        Example:
+            >>> # ENABLE_DOCTEST
+            >>> from utool.util_set import *  # NOQA
+            >>> self = OrderedSet(range(40))
+            >>> seen = []
+            >>> for key in self:
+            >>>     seen.append(key)
+            >>>     if key == 0:
+            >>>         self.discard(2)
+            >>>         self.add(40)
+            >>>     if key == 3:
+            >>>         for other in range(4, 36):
+            >>>             self.discard(other)
+            >>> print(seen)
+            [0, 1, 3, 36, 37, 38, 39, 40]
+            >>> print(list(reversed(self)))
+            [40, 39, 38, 37, 36, 3, 1, 0]
+        """
+        return self._iter_items(1)
 
     def __reversed__(self):
-        # Traverse the linked list in reverse order.
-        root = self._root
-        curr = root.prev
-        while curr is not root:
-            yield curr.key
-            curr = curr.prev
+        return self._iter_items(-1)
+
+    def _iter_items(self, step):
+        # Holes may appear while iterating, so they are always filtered.
+        # The list is only modified in place and compaction updates state.pos
+        # while the generator is suspended.
+        items = self._items
+        state = _IterPos(0 if step > 0 else len(items) - 1, step)
+        if self._iter_positions is None:
+            self._iter_positions = weakref.WeakSet()
+        self._iter_positions.add(state)
+        try:
+            pos = state.pos
+            if step > 0:
+                while pos < len(items):
+                    key = items[pos]
+                    pos += 1
+                    if key is not _DELETED:
+                        state.pos = pos
+                        yield key
+                        pos = state.pos
+            else:
+                while pos >= 0:
+                    if pos >= len(items):
+                        pos = len(items) - 1
+                        continue
+                    key = items[pos]
+                    pos -= 1
+                    if key is not _DELETED:
+                        state.pos = pos
+                        yield key
+                        pos = state.pos
+        finally:
+            self._iter_positions.discard(state)
 
     def pop(self, last=True):
         if not self:
             raise KeyError('set is empty')
-        key = next(reversed(self)) if last else next(iter(self))
+        key = self[-1] if last else self[0]
         self.discard(key)
         return key
 
+    def clear(self):
+        if self._iter_positions:
+            # running iterators only visit keys added from now on
+            for state in list(self._iter_positions):
+                state.pos = 0 if state.step > 0 else -1
+        del self._items[:]
+        self._map = {}
+        self._holes = []
+
     def __repr__(self):
         if not self:
             return '%s()' % (self.__class__.__name__,)
-        return '%s(%r)' % (self.__class__.__name__, list(self))
+        return '%s(%r)' % (self.__class__.__name__, self._keys())
 
     def __eq__(self, other):
         if isinstance(other, OrderedSet):
-            return len(self) == len(other) and list(self) == list(other)
+            return len(self) == len(other) and self._keys() == other._keys()
         return not self.isdisjoint(other)
 
-    @classmethod
-    def union(cls, *sets):
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    @_hybridmethod
+    def union(self, *sets):
         """
-        >>> from utool.util_set import *  # NOQA
+        Called on the class, returns the union of ``sets``. Called on an
+        instance, returns the union of the instance and ``sets``.
+
+        Example:
+            >>> # ENABLE_DOCTEST
+            >>> from utool.util_set import *  # NOQA
+            >>> print(OrderedSet.union([3, 1], OrderedSet([2, 1]), [4]))
+            >>> print(OrderedSet([3, 1]).union([2, 1], [4]))
+            >>> print(OrderedSet([3, 1]) | OrderedSet([2, 1]))
+            OrderedSet([3, 1, 2, 4])
+            OrderedSet([3, 1, 2, 4])
+            OrderedSet([3, 1, 2])
         """
-        import utool as ut
-        lists_ = ut.flatten([list(s) for s in sets])
-        return cls(lists_)
+        if isinstance(self, type):
+            new = self()
+        else:
+            new = self.copy()
+        new.update(*sets)
+        return new
 
-    def update(self, other):
+    def update(self, *others):
         """ union update """
-        for item in other:
-            self.add(item)
+        map_ = self._map
+        items = self._items
+        for other in others:
+            if _ORDERED_DICTS and not isinstance(other, (Set, dict)):
+                # drop duplicates within other at C speed
+                other = dict.fromkeys(other)
+            if not isinstance(other, (Set, dict)):
+                for key in other:
+                    self.add(key)
+                continue
+            new_keys = [key for key in other if key not in map_]
+            map_.update(zip(new_keys, range(len(items),
+                                            len(items) + len(new_keys))))
+            items.extend(new_keys)
+
+    def _as_lookups(self, others):
+        return [other if isinstance(other, (Set, dict)) else set(other)
+                for other in others]
+
+    def intersection(self, *others):
+        """
+        Items of self that are in all of ``others``, in the order of self
+
+        Example:
+            >>> # ENABLE_DOCTEST
+            >>> from utool.util_set import *  # NOQA
+            >>> self = OrderedSet([5, 3, 1, 4, 2])
+            >>> print(self.intersection([1, 2, 3], {2, 3, 5}))
+            >>> print(self.difference([1, 2, 3], [4]))
+            >>> print(self & [2, 4], self - [2, 4], self ^ [6, 5])
+            OrderedSet([3, 2])
+            OrderedSet([5])
+            OrderedSet([4, 2]) OrderedSet([5, 3, 1]) OrderedSet([3, 1, 4, 2, 6])
+        """
+        lookups = self._as_lookups(others)
+        if len(lookups) == 1:
+            lookup = lookups[0]
+            keys = [key for key in self._keys() if key in lookup]
+        else:
+            keys = [key for key in self._keys()
+                    if all(key in lookup for lookup in lookups)]
+        return self._from_unique(keys)
+
+    def difference(self, *others):
+        """ Items of self that are in none of ``others``, in the order of self """
+        lookups = self._as_lookups(others)
+        if len(lookups) == 1:
+            lookup = lookups[0]
+            keys = [key for key in self._keys() if key not in lookup]
+        else:
+            keys = [key for key in self._keys()
+                    if not any(key in lookup for lookup in lookups)]
+        return self._from_unique(keys)
+
+    def symmetric_difference(self, other):
+        other = other if isinstance(other, OrderedSet) else OrderedSet(other)
+        return self.difference(other).union(other.difference(self))
+
+    def intersection_update(self, *others):
+        lookups = self._as_lookups(others)
+        self._remove_keys([key for key in self._keys()
+                           if not all(key in lookup for lookup in lookups)])
+
+    def difference_update(self, *others):
+        lookups = self._as_lookups(others)
+        self._remove_keys([key for key in self._keys()
+                           if any(key in lookup for lookup in lookups)])
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def __xor__(self, other):
+        return self.symmetric_difference(other)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def _slot(self, index):
+        """ Slot in self._items of the key at position index """
+        num = len(self._map)
+        index_ = index + num if index < 0 else index
+        if index_ < 0 or index_ >= num:
+            raise IndexError('index %r out of range %r' % (index, num))
+        holes = self._holes
+        if not holes:
+            return index_
+        # first hole j with holes[j] - j > index_, the key is after j holes
+        lo, hi = 0, len(holes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if holes[mid] - mid > index_:
+                hi = mid
+            else:
+                lo = mid + 1
+        return index_ + lo
 
     def __getitem__(self, index):
         """
@@ -126,17 +442,9 @@ class OrderedSet(MutableSet):
             >>> assert self[-3] == 1
             >>> ut.assert_raises(IndexError, self.__getitem__, -4)
         """
-        if index < 0:
-            iter_ = self.__reversed__
-            index_ = -1 - index
-        else:
-            index_ = index
-            iter_ = self.__iter__
-        if index_ >= len(self):
-            raise IndexError('index %r out of range %r' % (index, len(self)))
-        for count, item in zip(range(index_ + 1), iter_()):
-            pass
-        return item
+        if isinstance(index, slice):
+            return self._from_unique(self._keys()[index])
+        return self._items[self._slot(index)]
 
     def index(self, item):
         """
@@ -151,11 +459,128 @@ class OrderedSet(MutableSet):
             >>> assert self.index(3) == 2
             >>> ut.assert_raises(ValueError, self.index, 4)
         """
+        try:
+            pos = self._map[item]
+        except (KeyError, TypeError):
+            raise ValueError('%r is not in OrderedSet' % (item,))
+        if self._holes:
+            pos -= bisect.bisect_left(self._holes, pos)
+        return pos
+
+
+# alias
+oset = OrderedSet
+
+
+class _Link(object):
+    __slots__ = ('prev', 'next', 'key', '__weakref__')
+
+
+class _LinkedOrderedSet(MutableSet):
+    """
+    The previous OrderedSet, a doubly linked list of weakref proxies. Kept as
+    the baseline for time_ordered_sets.
+    """
+
+    def __init__(self, iterable=None):
+        self._root = root = _Link()  # sentinel node for doubly linked list
+        root.prev = root.next = root
+        self._map = {}  # key --> link
+        if iterable is not None:
+            self |= iterable
+
+    def __len__(self):
+        return len(self._map)
+
+    def __contains__(self, key):
+        return key in self._map
+
+    def add(self, key):
+        if key not in self._map:
+            self._map[key] = link = _Link()
+            root = self._root
+            last = root.prev
+            link.prev, link.next, link.key = last, root, key
+            last.next = root.prev = weakref.proxy(link)
+
+    def discard(self, key):
+        if key in self._map:
+            link = self._map.pop(key)
+            link.prev.next = link.next
+            link.next.prev = link.prev
+
+    def __iter__(self):
+        root = self._root
+        curr = root.next
+        while curr is not root:
+            yield curr.key
+            curr = curr.next
+
+    def __getitem__(self, index):
+        if index >= len(self):
+            raise IndexError('index %r out of range %r' % (index, len(self)))
+        for count, item in zip(range(index + 1), iter(self)):
+            pass
+        return item
+
+    def index(self, item):
         for count, other in enumerate(self):
             if item == other:
                 return count
         raise ValueError('%r is not in OrderedSet' % (item,))
 
 
-# alias
-oset = OrderedSet
+def time_ordered_sets(num_items=1000000, num_lookups=100, num=1):
+    """
+    Benchmarks OrderedSet against the previous linked list implementation on
+    peak memory and on the throughput of building, membership, iteration,
+    positional lookups, discarding and bulk set operations. Positional
+    lookups of the linked list are O(N) each, so only ``num_lookups`` are
+    timed.
+
+    CommandLine:
+        python -m utool.util_set time_ordered_sets
+
+    Example:
+        >>> # DISABLE_DOCTEST
+        >>> from utool.util_set import *  # NOQA
+        >>> results = time_ordered_sets(num_items=1000000)
+    """
+    import tracemalloc
+    import random
+    import utool as ut
+    rng = random.Random(0)
+    keys = list(range(num_items))
+    rng.shuffle(keys)
+    other = keys[num_items // 2:] + list(range(num_items, num_items + num_items // 2))
+    probe = rng.sample(keys, num_lookups)
+    halves = keys[0::2]
+    results = {}
+    for label, cls in [('linked list', _LinkedOrderedSet),
+                       ('OrderedSet', OrderedSet)]:
+        tracemalloc.start()
+        self = cls(keys)
+        nbytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del self
+        print('%s: %s for %d keys' % (label, ut.byte_str2(nbytes), num_items))
+        results[(label, 'nbytes')] = nbytes
+        self = cls(keys)
+        for test, func in [
+            ('build', lambda: cls(keys)),
+            ('contains', lambda: sum(key in self for key in keys)),
+            ('iterate', lambda: sum(1 for _ in self)),
+            ('index', lambda: [self.index(key) for key in probe]),
+            ('getitem', lambda: [self[x] for x in range(0, num_items, num_items // num_lookups)]),
+            ('union', lambda: self | cls(other)),
+            ('intersection', lambda: self & cls(other)),
+            ('difference', lambda: self - cls(other)),
+            ('build+discard', lambda: [
+                new.discard(key) for new in [cls(keys)] for key in halves]),
+        ]:
+            for timer in ut.Timerit(num, verbose=0):
+                with timer:
+                    func()
+            results[(label, test)] = timer.parent.min()
+            print('    %-14s %8.3fs' % (test, results[(label, test)]))
+    return results
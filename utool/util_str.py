@@ -25,8 +25,6 @@ ENABLE_COLORS = (not util_cplat.WIN32 and
 
 if util_type.HAVE_NUMPY:
     import numpy as np
-if util_type.HAVE_PANDAS:
-    import pandas as pd
 
 TAU = (2 * math.pi)  # References: tauday.com
 
@@ -1708,7 +1706,7 @@ def _make_valstr(**kwargs):
             return dict_str(val, indent_=new_indent, **kwargs)
         if isinstance(val, (list, tuple, set, frozenset, ut.oset)):
             return list_str(val, indent_=new_indent, **kwargs)
-        if util_type.HAVE_PANDAS and isinstance(val, pd.Index):
+        if util_type._is_pandas_index(val):
             return list_str(val.tolist(), indent_=new_indent, **kwargs)
         if util_type.HAVE_NUMPY and isinstance(val, np.ndarray):
             if kwargs.get('use_numpy', True):
@@ -2581,7 +2579,27 @@ def bubbletext(text, font='cybermedium'):
         return bubble_text
 
 
-def closet_words(query, options, num=1, subset=False):
+def closet_words(query, options, num=1, subset=False, max_dist=None):
+    r"""
+    Ranks ``options`` by edit distance to ``query``.
+
+    Args:
+        query (str):
+        options (list): candidate strings
+        num (int): number of results
+        subset (bool): rank options that contain the query first
+        max_dist (int): ignore options further than this from the query.
+            Options whose length differs by more are never compared.
+
+    Example:
+        >>> # ENABLE_DOCTEST
+        >>> from utool.util_str import *  # NOQA
+        >>> options = ['grepfile', 'greplines', 'grep', 'sed', 'sedfile']
+        >>> print(closet_words('grpe', options, num=2))
+        >>> print(closet_words('sedfiel', options, num=3, max_dist=2))
+        ['grep', 'grepfile']
+        ['sedfile']
+    """
     import utool as ut
     ranked_list = []
     if subset:
@@ -2589,7 +2607,12 @@ def closet_words(query, options, num=1, subset=False):
         superset = [opt for opt in options if query_ in opt.lower()]
         ranked_list = superset[0:num]
         num -= len(ranked_list)
-    dist_list = ut.edit_distance(query, options)
+    dist_list = ut.edit_distance_matrix([query], options, max_dist=max_dist,
+                                        nprocs=1)[0].tolist()
+    if max_dist is not None:
+        options = [opt for opt, dist in zip(options, dist_list)
+                   if dist <= max_dist]
+        dist_list = [dist for dist in dist_list if dist <= max_dist]
     ranked_list = ranked_list + ut.sortedby(options, dist_list)[0:num]
     ranked_list = ut.unique(ranked_list)
     return ranked_list
@@ -66,10 +66,12 @@ try:
     NUMPY_TYPE_TUPLE = (
         tuple([np.ndarray] + list(set(sctypeDict.values()))))
 
+    # Importing pandas is slow, so only check that it is installed. Pandas
+    # objects can only exist once pandas has been imported by someone else.
     try:
-        import pandas as pd  # NOQA
-        HAVE_PANDAS = True
-    except ImportError:
+        import importlib.util
+        HAVE_PANDAS = importlib.util.find_spec('pandas') is not None
+    except (ImportError, ValueError):
         HAVE_PANDAS = False
 
 except (ImportError, AttributeError):
@@ -381,6 +383,12 @@ def assert_int(var, lbl='var'):
 _WIN32 = (sys.platform == 'win32')
 
 
+def _is_pandas_index(var):
+    """ checks for a pandas Index without importing pandas """
+    pd = sys.modules.get('pandas', None)
+    return pd is not None and isinstance(var, pd.Index)
+
+
 def get_type(var):
     """
     Gets types accounting for numpy
@@ -400,7 +408,7 @@ def get_type(var):
             type_ = var.dtype
         else:
             type_ = var.dtype.type
-    elif HAVE_PANDAS and isinstance(var, pd.Index):
+    elif _is_pandas_index(var):
         if _WIN32:
             type_ = var.dtype
         else: